@@ -0,0 +1,506 @@
+# -------
+# - Geração de números aleatórios - VERSÃO AVANÇADA
+# - Variáveis aleatórias tiradas em blocos vetorizados
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+Semente = Union[None, int, np.random.SeedSequence]
+
+# Tamanho máximo de cada bloco de variáveis (os blocos começam pequenos e
+# duplicam até este valor, para não penalizar simulações curtas)
+TAMANHO_BLOCO = 65536
+TAMANHO_BLOCO_INICIAL = 1024
+
+# Limites acumulados da distribuição de prioridades (5%, 10%, 20%, 35%, 30%)
+LIMITES_PRIORIDADE = np.array([0.05, 0.15, 0.35, 0.70])
+
+# Valor esperado da variável padronizada de consulta de cada distribuição
+# (exponencial padrão, normal padrão, uniforme em [0, 1)); usado como
+# média conhecida nas variáveis de controlo
+MEDIA_VARIAVEL_CONSULTA = {'exponential': 1.0, 'normal': 0.0, 'uniform': 0.5}
+
+# Perfil diário por omissão (fatores horários sobre taxa_chegada):
+# picos 9h-11h e 14h-17h (+50%), vales 12h-14h e 20h-24h (-50%)
+PERFIL_PADRAO = [1.0] * 9 + [1.5] * 2 + [1.0] + [0.5] * 2 + [1.5] * 3 + [1.0] * 3 + [0.5] * 4
+
+
+def criar_semente(seed: Semente = None, rng: Optional[np.random.Generator] = None) -> np.random.SeedSequence:
+    """
+    Normaliza a semente de uma simulação numa SeedSequence
+
+    Args:
+        seed: Inteiro, SeedSequence ou None (entropia do sistema)
+        rng: Generator já existente; se dado, a semente é uma filha nova
+            da SeedSequence dele (seed_seq.spawn). Não se tira nenhum
+            número do rng, pelo que o fluxo de quem chama não avança; cada
+            chamada com o mesmo rng dá uma filha diferente.
+    """
+    if rng is not None:
+        return rng.bit_generator.seed_seq.spawn(1)[0]
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def sementes_filhas(semente: np.random.SeedSequence, n: int, inicio: int = 0) -> List[np.random.SeedSequence]:
+    """
+    As sementes filhas inicio, ..., inicio + n - 1 de uma SeedSequence, sem a alterar
+
+    São as mesmas que spawn() daria a uma SeedSequence nova, mas chamadas
+    repetidas devolvem sempre as mesmas filhas, pelo que a mesma semente
+    reproduz os mesmos fluxos.
+    """
+    return [np.random.SeedSequence(semente.entropy, spawn_key=semente.spawn_key + (i,),
+                                   pool_size=semente.pool_size) for i in range(inicio, inicio + n)]
+
+
+def sementes_independentes(seed: Semente, n: int, inicio: int = 0) -> List[np.random.SeedSequence]:
+    """
+    Gera n sementes estatisticamente independentes (filhas de seed)
+
+    Para réplicas e varrimentos em paralelo: cada réplica recebe a sua
+    semente filha, e o conjunto é reprodutível a partir de seed (também
+    quando seed é uma SeedSequence, que não é alterada). inicio salta as
+    primeiras filhas, para continuar um conjunto já usado.
+    """
+    return sementes_filhas(criar_semente(seed), n, inicio)
+
+
+def configs_com_sementes(config: Dict, n: int, seed: Semente = None, inicio: int = 0) -> List[Dict]:
+    """Cria n cópias da configuração, cada uma com a sua semente independente (filhas inicio, ...)"""
+    configs = []
+    for semente in sementes_independentes(seed, n, inicio):
+        config_replica = config.copy()
+        config_replica.pop('rng', None)
+        config_replica['seed'] = semente
+        configs.append(config_replica)
+    return configs
+
+
+class PerfilChegadas:
+    """Intensidade de chegadas constante por troços, repetida em cada período (24h)"""
+
+    def __init__(self, taxas: Sequence[float], periodo: float = 1440):
+        """
+        Inicializa o perfil
+
+        Args:
+            taxas: Taxa de chegada (doentes/min) em cada troço; os troços
+                   dividem o período em partes iguais (24 valores = horário)
+            periodo: Duração do período em minutos
+        """
+        self.taxas = np.asarray(taxas, dtype=float)
+        if self.taxas.ndim != 1 or len(self.taxas) == 0 or np.any(self.taxas < 0):
+            raise ValueError('perfil de chegadas inválido: taxas devem ser >= 0')
+        self.periodo = periodo
+        self.duracao_troco = periodo / len(self.taxas)
+        # Intensidade acumulada no início de cada troço
+        self._acumulada = np.concatenate(([0.0], np.cumsum(self.taxas * self.duracao_troco)))
+        self.total_periodo = self._acumulada[-1]
+        if self.total_periodo <= 0:
+            raise ValueError('perfil de chegadas inválido: intensidade nula')
+
+    @classmethod
+    def de_fatores(cls, taxa_base: float, fatores: Sequence[float], periodo: float = 1440) -> 'PerfilChegadas':
+        """Perfil a partir de fatores multiplicativos sobre uma taxa base"""
+        return cls(taxa_base * np.asarray(fatores, dtype=float), periodo)
+
+    def intensidade_acumulada(self, tempos) -> np.ndarray:
+        """Lambda(t): número esperado de chegadas em [0, t]"""
+        tempos = np.asarray(tempos, dtype=float)
+        periodos, resto = np.divmod(tempos, self.periodo)
+        troco = np.minimum((resto / self.duracao_troco).astype(int), len(self.taxas) - 1)
+        dentro = resto - troco * self.duracao_troco
+        return periodos * self.total_periodo + self._acumulada[troco] + self.taxas[troco] * dentro
+
+    def inverter(self, acumulados) -> np.ndarray:
+        """
+        Lambda^-1(s): converte tempos de um processo de Poisson de taxa 1
+        nos tempos do processo não homogéneo (inversão exata)
+        """
+        acumulados = np.asarray(acumulados, dtype=float)
+        periodos, resto = np.divmod(acumulados, self.total_periodo)
+        troco = np.searchsorted(self._acumulada, resto, side='right') - 1
+        troco = np.clip(troco, 0, len(self.taxas) - 1)
+        taxas = self.taxas[troco]
+        excesso = resto - self._acumulada[troco]
+        dentro = np.divide(excesso, taxas, out=np.zeros_like(excesso), where=taxas > 0)
+        return periodos * self.periodo + troco * self.duracao_troco + dentro
+
+
+class _BlocoVariaveis:
+    """Buffer de variáveis tiradas num bloco vetorizado e entregues uma a uma"""
+
+    def __init__(self, gerar: Callable[[int], np.ndarray], tamanho_maximo: int = TAMANHO_BLOCO):
+        """
+        Args:
+            gerar: Função que devolve um array com n variáveis
+            tamanho_maximo: Tamanho máximo de cada bloco
+        """
+        self._gerar = gerar
+        self._tamanho = min(TAMANHO_BLOCO_INICIAL, tamanho_maximo)
+        self._tamanho_maximo = tamanho_maximo
+        self._valores = iter(())
+
+    def proximo(self):
+        """Devolve a próxima variável do buffer (gera novo bloco se esgotou)"""
+        valor = next(self._valores, None)
+        if valor is None:
+            self._valores = iter(self._gerar(self._tamanho).tolist())
+            self._tamanho = min(self._tamanho * 2, self._tamanho_maximo)
+            valor = next(self._valores)
+        return valor
+
+    def _restantes(self) -> np.ndarray:
+        """Esvazia o buffer atual e devolve o que restava"""
+        restantes = np.array(list(self._valores))
+        self._valores = iter(())
+        return restantes
+
+    def tomar(self, n: int) -> np.ndarray:
+        """Devolve as próximas n variáveis como array (sequência igual a n chamadas de proximo)"""
+        restantes = self._restantes()
+        if len(restantes) >= n:
+            self._valores = iter(restantes[n:].tolist())
+            return restantes[:n]
+        return np.concatenate((restantes, self._gerar(n - len(restantes))))
+
+    def tomar_ate(self, limite: float, tamanho_estimado: Optional[int] = None) -> np.ndarray:
+        """
+        Para sequências crescentes: devolve as variáveis menores que o
+        limite e consome também a primeira que o ultrapassa
+
+        tamanho_estimado é o tamanho do primeiro bloco a gerar (os seguintes
+        duplicam); por omissão usa blocos de tamanho máximo.
+        """
+        partes = [self._restantes()]
+        tamanho = tamanho_estimado or self._tamanho_maximo
+        while len(partes[-1]) == 0 or partes[-1][-1] < limite:
+            partes.append(self._gerar(tamanho))
+            tamanho = min(tamanho * 2, self._tamanho_maximo)
+        valores = np.concatenate(partes)
+        k = np.searchsorted(valores, limite)
+        self._valores = iter(valores[k + 1:].tolist())
+        return valores[:k]
+
+
+class FonteAleatoria:
+    """Fonte de variáveis aleatórias de uma simulação (um Generator numpy por instância)"""
+
+    def __init__(self, distribuicao: str = 'exponential', seed: Semente = None,
+                 rng: Optional[np.random.Generator] = None, taxa_chegada: float = 10 / 60.0,
+                 perfil: Optional[PerfilChegadas] = None, tamanho_bloco: int = TAMANHO_BLOCO,
+                 antitetica: Optional[bool] = None):
+        """
+        Inicializa os geradores e os buffers
+
+        Chegadas, prioridades e consultas usam sub-fluxos independentes,
+        para que cada tipo de variável consuma sempre o seu próprio fluxo
+        pela ordem de chegada dos doentes.
+
+        Args:
+            distribuicao: Distribuição dos tempos de consulta
+            seed: Semente (inteiro, SeedSequence ou None)
+            rng: Generator numpy a usar como origem da semente
+            taxa_chegada: Taxa de chegada (doentes/min) se não houver perfil
+            perfil: Perfil de chegadas não homogéneas (None = homogéneas)
+            tamanho_bloco: Tamanho máximo dos blocos vetorizados
+            antitetica: None usa os geradores diretos do numpy; False e True
+                geram todas as variáveis por inversão de uniformes U (False)
+                ou 1 - U (True), e as normais como Z ou -Z. Duas fontes com
+                a mesma semente, uma False e outra True, formam um par de
+                variáveis antitéticas.
+        """
+        self.distribuicao = distribuicao
+        self.antitetica = antitetica
+        self.taxa_chegada = taxa_chegada
+        self.perfil = perfil
+        self.tamanho_bloco = tamanho_bloco
+        self.semente = criar_semente(seed, rng)
+        sementes = sementes_filhas(self.semente, 3)
+        self.gerador_chegadas, self.gerador_prioridades, self.gerador_consultas = \
+            [np.random.default_rng(s) for s in sementes]
+
+        # Tempo "operacional" (processo de Poisson de taxa 1) já consumido
+        self._acumulado_chegadas = 0.0
+        self._chegadas = _BlocoVariaveis(self._gerar_chegadas, tamanho_bloco)
+        self._prioridades = _BlocoVariaveis(self._gerar_prioridades, tamanho_bloco)
+        if distribuicao == 'normal':
+            gerar_consultas = self.gerador_consultas.standard_normal
+        elif distribuicao == 'uniform':
+            gerar_consultas = self.gerador_consultas.random
+        else:
+            gerar_consultas = self.gerador_consultas.standard_exponential
+        if antitetica is not None:
+            gerar_consultas = self._gerar_consultas_inversao
+        self._consultas = _BlocoVariaveis(gerar_consultas, tamanho_bloco)
+        # Variáveis de consulta entregues (para a variável de controlo)
+        self.num_variaveis_consulta = 0
+        self.soma_variaveis_consulta = 0.0
+
+    def _uniformes(self, gerador: np.random.Generator, n: int) -> np.ndarray:
+        """n uniformes em (0, 1]: 1 - U, ou U no membro antitético do par"""
+        uniformes = gerador.random(n)
+        if not self.antitetica:
+            uniformes = 1.0 - uniformes
+        # U = 0 (probabilidade 2^-53) daria uma exponencial infinita
+        return np.maximum(uniformes, np.finfo(float).tiny)
+
+    def _exponenciais(self, gerador: np.random.Generator, n: int) -> np.ndarray:
+        """n exponenciais padrão (por inversão se antitetica não for None)"""
+        if self.antitetica is None:
+            return gerador.standard_exponential(n)
+        return -np.log(self._uniformes(gerador, n))
+
+    def _gerar_consultas_inversao(self, n: int) -> np.ndarray:
+        """Variáveis padronizadas de consulta para pares antitéticos"""
+        if self.distribuicao == 'normal':
+            normais = self.gerador_consultas.standard_normal(n)
+            return -normais if self.antitetica else normais
+        if self.distribuicao == 'uniform':
+            return 1.0 - self._uniformes(self.gerador_consultas, n)
+        return self._exponenciais(self.gerador_consultas, n)
+
+    def replica(self, seed: Semente, antitetica: Optional[bool] = None) -> 'FonteAleatoria':
+        """Fonte nova com os mesmos parâmetros e outra semente (réplicas do motor em lote)"""
+        return FonteAleatoria(self.distribuicao, seed, None, self.taxa_chegada, self.perfil,
+                              self.tamanho_bloco, antitetica)
+
+    def _gerar_chegadas(self, n: int) -> np.ndarray:
+        """
+        Bloco dos n instantes de chegada seguintes
+
+        Os instantes de um processo de Poisson de taxa 1 (soma acumulada de
+        exponenciais padrão) são convertidos pela inversa da intensidade
+        acumulada: t = s / taxa no caso homogéneo, Lambda^-1(s) com perfil.
+        """
+        # O valor anterior entra na soma acumulada, para que o resultado não
+        # dependa da divisão em blocos
+        exponenciais = self._exponenciais(self.gerador_chegadas, n)
+        acumulados = np.cumsum(np.concatenate(([self._acumulado_chegadas], exponenciais)))[1:]
+        self._acumulado_chegadas = acumulados[-1]
+        if self.perfil is None:
+            return acumulados / self.taxa_chegada
+        return self.perfil.inverter(acumulados)
+
+    def _gerar_prioridades(self, n: int) -> np.ndarray:
+        """Bloco de prioridades (1 a 5) com a distribuição realista de urgências"""
+        if self.antitetica is None:
+            uniformes = self.gerador_prioridades.random(n)
+        else:
+            uniformes = 1.0 - self._uniformes(self.gerador_prioridades, n)
+        return np.searchsorted(LIMITES_PRIORIDADE, uniformes, side='right') + 1
+
+    def proxima_chegada(self) -> float:
+        """Instante da próxima chegada"""
+        return self._chegadas.proximo()
+
+    def tempos_chegada(self, horizonte: float) -> np.ndarray:
+        """Todos os instantes de chegada seguintes antes do horizonte (vetorizado)"""
+        # Bloco à medida: chegadas esperadas em falta mais uma margem de 4
+        # desvios padrão (Poisson), para raramente ser preciso um segundo bloco
+        esperadas = max(self.chegadas_esperadas(horizonte) - self._acumulado_chegadas, 0.0)
+        tamanho = int(esperadas + 4 * np.sqrt(esperadas)) + 16
+        return self._chegadas.tomar_ate(horizonte, tamanho)
+
+    def chegadas_esperadas(self, horizonte: float) -> float:
+        """Número esperado de chegadas em [0, horizonte]"""
+        if self.perfil is None:
+            return self.taxa_chegada * horizonte
+        return float(self.perfil.intensidade_acumulada(horizonte))
+
+    def prioridade(self) -> int:
+        """Prioridade de triagem do próximo doente"""
+        return self._prioridades.proximo()
+
+    def variavel_consulta(self) -> float:
+        """
+        Variável padronizada do tempo de consulta
+
+        Exponencial padrão, normal padrão ou uniforme em [0, 1), conforme a
+        distribuição; a escala é aplicada em tempo_consulta().
+        """
+        variavel = self._consultas.proximo()
+        self.num_variaveis_consulta += 1
+        self.soma_variaveis_consulta += variavel
+        return variavel
+
+    def variaveis_consulta(self, n: int) -> np.ndarray:
+        """As próximas n variáveis padronizadas de consulta (vetorizado)"""
+        variaveis = self._consultas.tomar(n)
+        self.num_variaveis_consulta += n
+        # Soma pela mesma ordem que n chamadas de variavel_consulta
+        self.soma_variaveis_consulta = sum(variaveis.tolist(), self.soma_variaveis_consulta)
+        return variaveis
+
+    def media_variaveis_consulta(self) -> float:
+        """Média das variáveis de consulta entregues (0.0 se nenhuma)"""
+        if self.num_variaveis_consulta == 0:
+            return 0.0
+        return self.soma_variaveis_consulta / self.num_variaveis_consulta
+
+    def media_variavel_consulta_esperada(self) -> float:
+        """Valor esperado de cada variável de consulta (conhecido à partida)"""
+        return MEDIA_VARIAVEL_CONSULTA.get(self.distribuicao, 1.0)
+
+    def tempo_consulta(self, tempo_base: float, variavel: float) -> float:
+        """Converte a variável padronizada no tempo de consulta (min)"""
+        if self.distribuicao == "exponential":
+            return tempo_base * variavel
+        elif self.distribuicao == "normal":
+            return max(5, tempo_base + tempo_base * 0.3 * variavel)
+        elif self.distribuicao == "uniform":
+            # Valores mais realistas: min=5min, max=30min
+            minimo = max(5, tempo_base * 0.4)
+            return minimo + (tempo_base * 1.6 - minimo) * variavel
+        else:
+            return tempo_base
+
+    def tempos_consulta(self, tempo_base: float, variaveis: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de tempo_consulta() (mesmas operações por elemento)"""
+        return _tempos_consulta(self.distribuicao, tempo_base, variaveis)
+
+
+def _tempos_consulta(distribuicao: str, tempo_base: float, variaveis: np.ndarray) -> np.ndarray:
+    """tempo_consulta() por elemento, para arrays de qualquer forma"""
+    if distribuicao == "exponential":
+        return tempo_base * variaveis
+    elif distribuicao == "normal":
+        return np.maximum(5, tempo_base + tempo_base * 0.3 * variaveis)
+    elif distribuicao == "uniform":
+        minimo = max(5, tempo_base * 0.4)
+        return minimo + (tempo_base * 1.6 - minimo) * variaveis
+    else:
+        return np.full(np.shape(variaveis), float(tempo_base))
+
+
+def _intercalar(pares: np.ndarray, impares: np.ndarray) -> np.ndarray:
+    """Linhas 2p de pares e 2p + 1 de impares"""
+    linhas = np.empty((2 * len(pares),) + pares.shape[1:])
+    linhas[0::2] = pares
+    linhas[1::2] = impares
+    return linhas
+
+
+class FonteAleatoriaLote:
+    """
+    Variáveis aleatórias de várias réplicas de uma vez, em blocos (R, n)
+
+    Um Generator por fluxo (chegadas e consultas) serve todas as réplicas,
+    pelo que tirar os fluxos de R réplicas custa poucas chamadas numpy e
+    não um ciclo por réplica. Cada linha é uma réplica com as mesmas
+    distribuições que uma FonteAleatoria e o conjunto é reprodutível a
+    partir de (seed, R), mas as amostras não são as das fontes com as
+    sementes filhas (sementes_independentes).
+    """
+
+    def __init__(self, num_replicas: int, distribuicao: str = 'exponential', seed: Semente = None,
+                 taxa_chegada: float = 10 / 60.0, perfil: Optional[PerfilChegadas] = None,
+                 antiteticas: bool = False):
+        """
+        Args:
+            num_replicas: Número de réplicas (linhas de cada bloco)
+            distribuicao: Distribuição dos tempos de consulta
+            seed: Semente (inteiro, SeedSequence ou None)
+            taxa_chegada: Taxa de chegada (doentes/min) se não houver perfil
+            perfil: Perfil de chegadas não homogéneas (None = homogéneas)
+            antiteticas: As linhas 2p e 2p + 1 formam um par antitético
+                (uniformes 1 - U e U, normais Z e -Z, como as fontes com
+                antitetica False e True); num_replicas tem de ser par
+
+        Raises:
+            ValueError: Se antiteticas e num_replicas for ímpar
+        """
+        if antiteticas and num_replicas % 2:
+            raise ValueError("Com variáveis antitéticas o número de réplicas tem de ser par")
+        self.num_replicas = num_replicas
+        self.distribuicao = distribuicao
+        self.taxa_chegada = taxa_chegada
+        self.perfil = perfil
+        self.antiteticas = antiteticas
+        self.semente = criar_semente(seed)
+        # Os sub-fluxos de chegadas e consultas de FonteAleatoria (sem prioridades)
+        sementes = sementes_filhas(self.semente, 3)
+        self.gerador_chegadas = np.random.default_rng(sementes[0])
+        self.gerador_consultas = np.random.default_rng(sementes[2])
+
+    def _uniformes_pares(self, gerador: np.random.Generator, colunas: int) -> np.ndarray:
+        """Uniformes em (0, 1] com as linhas de cada par iguais a 1 - U e U"""
+        metade = gerador.random((self.num_replicas // 2, colunas))
+        # U = 0 (probabilidade 2^-53) daria uma exponencial infinita
+        return np.maximum(_intercalar(1.0 - metade, metade), np.finfo(float).tiny)
+
+    def _exponenciais(self, gerador: np.random.Generator, colunas: int) -> np.ndarray:
+        """Bloco (R, colunas) de exponenciais padrão (por inversão nos pares antitéticos)"""
+        if not self.antiteticas:
+            return gerador.standard_exponential((self.num_replicas, colunas))
+        return -np.log(self._uniformes_pares(gerador, colunas))
+
+    def _converter_chegadas(self, acumulados: np.ndarray) -> np.ndarray:
+        """Instantes de um processo de Poisson de taxa 1 convertidos como em FonteAleatoria"""
+        if self.perfil is None:
+            return acumulados / self.taxa_chegada
+        return self.perfil.inverter(acumulados)
+
+    def tempos_chegada(self, horizonte: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Instantes de chegada de todas as réplicas antes do horizonte
+
+        O bloco tem as chegadas esperadas mais 4 desvios padrão (Poisson)
+        por linha; só se todas as linhas ainda não chegaram ao horizonte se
+        tira outro bloco para todas.
+
+        Returns:
+            Array (R, max. chegadas) com as chegadas de cada réplica por
+            ordem, preenchido com infinito, e o número de chegadas (R,)
+        """
+        esperadas = self.chegadas_esperadas(horizonte)
+        tamanho = int(esperadas + 4 * np.sqrt(esperadas)) + 16
+        partes = []
+        acumulado = np.zeros((self.num_replicas, 1))
+        while True:
+            exponenciais = self._exponenciais(self.gerador_chegadas, tamanho)
+            acumulados = np.cumsum(np.concatenate((acumulado, exponenciais), axis=1), axis=1)[:, 1:]
+            partes.append(acumulados)
+            acumulado = acumulados[:, -1:]
+            if self._converter_chegadas(acumulado).min(initial=np.inf) >= horizonte:
+                break
+        tempos = self._converter_chegadas(np.concatenate(partes, axis=1))
+        num_chegadas = (tempos < horizonte).sum(axis=1)
+        colunas = int(num_chegadas.max(initial=0))
+        chegadas = tempos[:, :colunas]
+        chegadas[np.arange(colunas) >= num_chegadas[:, None]] = np.inf
+        return chegadas, num_chegadas
+
+    def chegadas_esperadas(self, horizonte: float) -> float:
+        """Número esperado de chegadas em [0, horizonte] em cada réplica"""
+        if self.perfil is None:
+            return self.taxa_chegada * horizonte
+        return float(self.perfil.intensidade_acumulada(horizonte))
+
+    def variaveis_consulta(self, colunas: int) -> np.ndarray:
+        """Bloco (R, colunas) de variáveis padronizadas de consulta (ver FonteAleatoria)"""
+        forma = (self.num_replicas, colunas)
+        if self.distribuicao == 'normal':
+            if not self.antiteticas:
+                return self.gerador_consultas.standard_normal(forma)
+            normais = self.gerador_consultas.standard_normal((self.num_replicas // 2, colunas))
+            return _intercalar(normais, -normais)
+        if self.distribuicao == 'uniform':
+            if not self.antiteticas:
+                return self.gerador_consultas.random(forma)
+            return 1.0 - self._uniformes_pares(self.gerador_consultas, colunas)
+        return self._exponenciais(self.gerador_consultas, colunas)
+
+    def media_variavel_consulta_esperada(self) -> float:
+        """Valor esperado de cada variável de consulta (conhecido à partida)"""
+        return MEDIA_VARIAVEL_CONSULTA.get(self.distribuicao, 1.0)
+
+    def tempos_consulta(self, tempo_base: float, variaveis: np.ndarray) -> np.ndarray:
+        """Converte as variáveis padronizadas nos tempos de consulta (min)"""
+        return _tempos_consulta(self.distribuicao, tempo_base, variaveis)
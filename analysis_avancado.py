@@ -9,8 +9,10 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
-from typing import Dict, List
-from sim_module_avancado import Simulacao, NOMES_PRIORIDADE
+from typing import Dict, List, Optional
+from sim_module_avancado import NOMES_PRIORIDADE
+from aleatorio_avancado import configs_com_sementes
+from replicacao_avancado import executar_em_paralelo, simular_metricas
 
 
 class AnalisadorResultados:
@@ -37,6 +39,37 @@ class AnalisadorResultados:
         r += f"  📈 Tamanho máximo da fila: {self.resultados['max_fila']}\n"
         r += f"  👨‍⚕️ Ocupação média dos médicos: {self.resultados['ocupacao_media_medicos']:.2f}%\n"
         
+        # Quantis dos tempos (histogramas logarítmicos, erro relativo ~1%)
+        quantis = self.resultados.get('quantis')
+        if quantis:
+            r += "\n⏳ QUANTIS DOS TEMPOS (min):\n"
+            for chave, nome in (('espera', 'Espera'), ('consulta', 'Consulta'), ('clinica', 'Na clínica')):
+                r += f"  {nome}: " + "  ".join(f"{p} {v:.2f}" for p, v in quantis[chave].items()) + "\n"
+        
+        # Aquecimento: horizonte descartado e o detetado nas séries (MSER-5)
+        aquecimento = self.resultados.get('aquecimento')
+        if aquecimento:
+            r += "\n🌡️ AQUECIMENTO:\n"
+            r += (f"  Descartado: {aquecimento['periodo_aquecimento']:.0f} min "
+                  f"({aquecimento['fracao_descartada'] * 100:.1f}% do horizonte)\n")
+            if aquecimento['detetado'] is not None:
+                estado = "suficiente" if aquecimento['suficiente'] else "insuficiente"
+                fiavel = "" if aquecimento['fiavel'] else " (pouco fiável: horizonte curto)"
+                r += (f"  Detetado (MSER-5): {aquecimento['detetado']:.0f} min "
+                      f"(fila {aquecimento['detetado_fila']:.0f}, ocupação {aquecimento['detetado_ocupacao']:.0f}) "
+                      f"-> {estado}{fiavel}\n")
+        
+        # Médias por lotes de uma só simulação longa (IC 95%)
+        medias_lotes = self.resultados.get('medias_lotes')
+        if medias_lotes:
+            r += "\n📦 MÉDIAS POR LOTES (IC 95%):\n"
+            for chave, nome, unidade in (('espera', 'Espera', ' min'), ('clinica', 'Na clínica', ' min'),
+                                         ('fila', 'Fila', '')):
+                lote = medias_lotes[chave]
+                aviso = "" if lote['independentes'] else " (lotes correlacionados: simular mais tempo)"
+                r += (f"  {nome}: {lote['media']:.2f} ± {lote['semi_amplitude']:.2f}{unidade} "
+                      f"({lote['n']} lotes, autocorrelação {lote['autocorrelacao']:.2f}){aviso}\n")
+        
         # Estatísticas por prioridade
         if 'atendidos_por_prioridade' in self.resultados:
             r += "\n" + "-"*70 + "\n"
@@ -55,6 +88,9 @@ class AnalisadorResultados:
                     r += f"  Atendidos: {atendidos}\n"
                     r += f"  Abandonos: {abandonos}\n"
                     r += f"  Tempo médio espera: {tempo_medio:.2f} min\n"
+                    if quantis and atendidos > 0:
+                        q = quantis['espera_por_prioridade'][prioridade]
+                        r += f"  Espera p50/p90/p99: {q['p50']:.2f} / {q['p90']:.2f} / {q['p99']:.2f} min\n"
         
         # Estatísticas dos médicos
         r += "\n" + "-"*70 + "\n"
@@ -76,12 +112,13 @@ class AnalisadorResultados:
             print("Sem dados de fila")
             return
         
-        tempos = [t for t, _ in self.resultados['historico_fila']]
-        tamanhos = [tam for _, tam in self.resultados['historico_fila']]
+        # Vistas numpy da série em escada (cada valor vale até ao ponto seguinte)
+        tempos = self.resultados['historico_fila'].tempos
+        tamanhos = self.resultados['historico_fila'].valores
         
         plt.figure(figsize=(14, 6))
-        plt.plot(tempos, tamanhos, linewidth=2, color='#2E86AB', alpha=0.8)
-        plt.fill_between(tempos, tamanhos, alpha=0.3, color='#2E86AB')
+        plt.step(tempos, tamanhos, where='post', linewidth=2, color='#2E86AB', alpha=0.8)
+        plt.fill_between(tempos, tamanhos, step='post', alpha=0.3, color='#2E86AB')
         plt.xlabel('Tempo (minutos)', fontsize=13, fontweight='bold')
         plt.ylabel('Tamanho da Fila', fontsize=13, fontweight='bold')
         plt.title('Evolucao do Tamanho da Fila de Espera', fontsize=16, fontweight='bold')
@@ -99,12 +136,12 @@ class AnalisadorResultados:
             print("Sem dados de ocupação")
             return
         
-        tempos = [t for t, _ in self.resultados['historico_ocupacao']]
-        ocupacao = [ocu for _, ocu in self.resultados['historico_ocupacao']]
+        tempos = self.resultados['historico_ocupacao'].tempos
+        ocupacao = self.resultados['historico_ocupacao'].valores
         
         plt.figure(figsize=(14, 6))
-        plt.plot(tempos, ocupacao, linewidth=2, color='#A23B72', alpha=0.8)
-        plt.fill_between(tempos, ocupacao, alpha=0.3, color='#A23B72')
+        plt.step(tempos, ocupacao, where='post', linewidth=2, color='#A23B72', alpha=0.8)
+        plt.fill_between(tempos, ocupacao, step='post', alpha=0.3, color='#A23B72')
         plt.axhline(y=90, color='red', linestyle='--', linewidth=2, alpha=0.7, label='Limite Crítico (90%)')
         plt.xlabel('Tempo (minutos)', fontsize=13, fontweight='bold')
         plt.ylabel('Ocupacao (%)', fontsize=13, fontweight='bold')
@@ -121,21 +158,29 @@ class AnalisadorResultados:
     
     def plot_distribuicao_tempos_espera(self, salvar=False, filename='grafico_espera.png'):
         """Histograma dos tempos de espera"""
-        if not self.resultados['tempos_espera_individuais']:
+        tempos = self.resultados['tempos_espera_individuais']
+        histograma = self.resultados.get('distribuicoes', {}).get('espera')
+        if not tempos and (histograma is None or histograma.n == 0):
             print("Sem dados de tempo de espera")
             return
         
-        tempos = self.resultados['tempos_espera_individuais']
-        
         plt.figure(figsize=(14, 6))
-        plt.hist(tempos, bins=40, color='#F18F01', alpha=0.7, edgecolor='black', linewidth=1.2)
+        if tempos:
+            plt.hist(tempos, bins=40, color='#F18F01', alpha=0.7, edgecolor='black', linewidth=1.2)
+            media = np.mean(tempos)
+            mediana = np.median(tempos)
+        else:
+            # Sem os tempos individuais (guardar_historico=False): usar o histograma logarítmico
+            limites, contagens = histograma.classes()
+            plt.hist(limites.mean(axis=1), bins=40, weights=contagens,
+                     color='#F18F01', alpha=0.7, edgecolor='black', linewidth=1.2)
+            media = histograma.media()
+            mediana = histograma.quantil(0.5)
         plt.xlabel('Tempo de Espera (minutos)', fontsize=13, fontweight='bold')
         plt.ylabel('Frequencia', fontsize=13, fontweight='bold')
         plt.title('Distribuicao dos Tempos de Espera', fontsize=16, fontweight='bold')
         plt.grid(True, alpha=0.3, axis='y', linestyle='--')
         
-        media = np.mean(tempos)
-        mediana = np.median(tempos)
         plt.axvline(media, color='red', linestyle='--', linewidth=2.5, label=f'Média: {media:.2f} min')
         plt.axvline(mediana, color='green', linestyle='--', linewidth=2.5, label=f'Mediana: {mediana:.2f} min')
         plt.legend(fontsize=12)
@@ -374,8 +419,24 @@ class AnalisadorResultados:
         print("Todos os graficos gerados com sucesso!")
 
 
-def analise_comparativa_taxa_chegada(config_base: Dict, taxas: List[float], callback_progresso=None) -> Dict:
-    """Análise comparativa variando taxa de chegada"""
+# Métrica da simulação correspondente a cada série da análise comparativa
+METRICAS_COMPARATIVAS = {
+    'tempo_medio_espera': 'tempo_medio_espera',
+    'tamanho_medio_fila': 'tamanho_medio_fila',
+    'tamanho_max_fila': 'max_fila',
+    'ocupacao_medicos': 'ocupacao_media_medicos',
+    'taxa_abandono': 'taxa_abandono'
+}
+
+
+def analise_comparativa_taxa_chegada(config_base: Dict, taxas: List[float], callback_progresso=None,
+                                     max_workers: Optional[int] = None) -> Dict:
+    """
+    Análise comparativa variando taxa de chegada
+    
+    Os pontos são simulados em paralelo (um processo por núcleo, ou
+    max_workers) e os resultados voltam pela ordem das taxas.
+    """
     resultados_comp = {
         'taxas': [],
         'tempo_medio_espera': [],
@@ -385,58 +446,126 @@ def analise_comparativa_taxa_chegada(config_base: Dict, taxas: List[float], call
         'taxa_abandono': []
     }
     
-    total = len(taxas)
-    
-    for i, taxa in enumerate(taxas):
-        config = config_base.copy()
+    # Cada ponto recebe a sua semente independente (reprodutível se houver 'seed')
+    configs = configs_com_sementes(config_base, len(taxas), config_base.get('seed', None))
+    for config, taxa in zip(configs, taxas):
         config['taxa_chegada'] = taxa / 60.0
-        
-        sim = Simulacao(config)
-        resultados = sim.simular()
-        
+    
+    metricas = list(METRICAS_COMPARATIVAS.values())
+    tarefas = [(config, metricas) for config in configs]
+    pontos = executar_em_paralelo(simular_metricas, tarefas, max_workers, callback_progresso)
+    
+    for taxa, ponto in zip(taxas, pontos):
         resultados_comp['taxas'].append(taxa)
-        resultados_comp['tempo_medio_espera'].append(resultados['tempo_medio_espera'])
-        resultados_comp['tamanho_medio_fila'].append(resultados['tamanho_medio_fila'])
-        resultados_comp['tamanho_max_fila'].append(resultados['max_fila'])
-        resultados_comp['ocupacao_medicos'].append(resultados['ocupacao_media_medicos'])
-        resultados_comp['taxa_abandono'].append(resultados.get('taxa_abandono', 0))
-        
-        if callback_progresso:
-            progresso = int(((i + 1) / total) * 100)
-            callback_progresso(progresso)
+        for chave, metrica in METRICAS_COMPARATIVAS.items():
+            resultados_comp[chave].append(ponto[metrica])
+    resultados_comp['tamanho_max_fila'] = [int(v) for v in resultados_comp['tamanho_max_fila']]
     
     return resultados_comp
 
 
-def plot_analise_comparativa(resultados: Dict, salvar=False, filename='grafico_comparativo.png'):
-    """Gráfico comparativo completo"""
+# Rótulos dos eixos de varrimento nos gráficos comparativos
+ROTULOS_EIXO = {
+    'taxa_chegada': 'Taxa de Chegada (doentes/hora)',
+    'num_medicos': 'Numero de Medicos',
+    'tempo_medio_consulta': 'Tempo Medio de Consulta (min)',
+    'distribuicao': 'Distribuicao',
+    'tempo_max_espera': 'Tempo Maximo de Espera (min)'
+}
+
+
+def fatia_varrimento(varrimento: Dict, eixo: str, fixos: Dict = None) -> Dict:
+    """
+    Extrai uma fatia 1D de um varrimento (varrimento_parametros)
+
+    Args:
+        varrimento: Resultado de varrimento_parametros
+        eixo: Eixo a usar como abcissa
+        fixos: Valor de cada um dos restantes eixos (por omissão o primeiro)
+
+    Returns:
+        Dicionário no formato de analise_comparativa_taxa_chegada ('taxas'
+        guarda a abcissa; a taxa de chegada é convertida para doentes/hora),
+        com as semi-amplitudes dos IC em 'semi_amplitude' e o nome do eixo
+    """
+    fixos = fixos or {}
+    indices = []
+    for nome in varrimento['eixos']:
+        if nome == eixo:
+            indices.append(slice(None))
+        else:
+            valores = varrimento['valores'][nome]
+            indices.append(valores.index(fixos[nome]) if nome in fixos else 0)
+    indices = tuple(indices)
+
+    abcissa = list(varrimento['valores'][eixo])
+    if eixo == 'taxa_chegada':
+        abcissa = [taxa * 60.0 for taxa in abcissa]
+
+    fatia = {'taxas': abcissa, 'eixo': eixo, 'semi_amplitude': {}}
+    for chave, metrica in METRICAS_COMPARATIVAS.items():
+        if metrica in varrimento['media']:
+            fatia[chave] = varrimento['media'][metrica][indices].tolist()
+            fatia['semi_amplitude'][chave] = varrimento['semi_amplitude'][metrica][indices].tolist()
+    return fatia
+
+
+def plot_analise_comparativa(resultados: Dict, salvar=False, filename='grafico_comparativo.png',
+                             eixo: str = None, fixos: Dict = None):
+    """
+    Gráfico comparativo completo
+
+    Aceita o resultado de analise_comparativa_taxa_chegada ou um varrimento
+    (varrimento_parametros), do qual desenha a fatia ao longo de eixo com os
+    restantes eixos fixos, sem voltar a simular. Com réplicas, desenha
+    também a banda do IC.
+    """
+    if 'eixos' in resultados:
+        resultados = fatia_varrimento(resultados, eixo or resultados['eixos'][0], fixos)
+    eixo = resultados.get('eixo', 'taxa_chegada')
+    rotulo = ROTULOS_EIXO.get(eixo, eixo)
+    titulo = rotulo.split(' (')[0]
+    bandas = resultados.get('semi_amplitude', {})
+    
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
     
     taxas = resultados['taxas']
+    numerico = all(isinstance(x, (int, float, np.number)) for x in taxas)
+    if not numerico:
+        taxas = list(range(len(taxas)))
+    
+    def desenhar_banda(ax, chave, cor):
+        semi = np.asarray(bandas.get(chave, []), dtype=float)
+        if len(semi) and np.all(np.isfinite(semi)):
+            media = np.asarray(resultados[chave], dtype=float)
+            ax.fill_between(taxas, media - semi, media + semi, color=cor, alpha=0.2)
     
     # Gráfico 1
     ax1.plot(taxas, resultados['tempo_medio_espera'], marker='o', linewidth=2.5, 
             color='#2E86AB', markersize=8)
-    ax1.set_xlabel('Taxa de Chegada (doentes/hora)', fontsize=11, fontweight='bold')
+    desenhar_banda(ax1, 'tempo_medio_espera', '#2E86AB')
+    ax1.set_xlabel(rotulo, fontsize=11, fontweight='bold')
     ax1.set_ylabel('Tempo Medio de Espera (min)', fontsize=11, fontweight='bold')
-    ax1.set_title('Tempo de Espera vs Taxa de Chegada', fontsize=13, fontweight='bold')
+    ax1.set_title(f'Tempo de Espera vs {titulo}', fontsize=13, fontweight='bold')
     ax1.grid(True, alpha=0.3, linestyle='--')
     
     # Grafico 2
     ax2.plot(taxas, resultados['tamanho_medio_fila'], marker='s', linewidth=2.5, 
             color='#F18F01', markersize=8)
-    ax2.set_xlabel('Taxa de Chegada (doentes/hora)', fontsize=11, fontweight='bold')
+    desenhar_banda(ax2, 'tamanho_medio_fila', '#F18F01')
+    ax2.set_xlabel(rotulo, fontsize=11, fontweight='bold')
     ax2.set_ylabel('Tamanho Medio da Fila', fontsize=11, fontweight='bold')
-    ax2.set_title('Tamanho Medio da Fila vs Taxa de Chegada', fontsize=13, fontweight='bold')
+    ax2.set_title(f'Tamanho Medio da Fila vs {titulo}', fontsize=13, fontweight='bold')
     ax2.grid(True, alpha=0.3, linestyle='--')
     
     # Grafico 3
     ax3.plot(taxas, resultados['ocupacao_medicos'], marker='d', linewidth=2.5, 
             color='#A23B72', markersize=8)
+    desenhar_banda(ax3, 'ocupacao_medicos', '#A23B72')
     ax3.axhline(y=90, color='red', linestyle='--', linewidth=2, alpha=0.7, label='Critico')
-    ax3.set_xlabel('Taxa de Chegada (doentes/hora)', fontsize=11, fontweight='bold')
+    ax3.set_xlabel(rotulo, fontsize=11, fontweight='bold')
     ax3.set_ylabel('Ocupacao dos Medicos (%)', fontsize=11, fontweight='bold')
-    ax3.set_title('Ocupacao dos Medicos vs Taxa de Chegada', fontsize=13, fontweight='bold')
+    ax3.set_title(f'Ocupacao dos Medicos vs {titulo}', fontsize=13, fontweight='bold')
     ax3.grid(True, alpha=0.3, linestyle='--')
     ax3.set_ylim(0, 105)
     ax3.legend()
@@ -444,15 +573,63 @@ def plot_analise_comparativa(resultados: Dict, salvar=False, filename='grafico_c
     # Grafico 4 - NOVO: Taxa de abandono
     ax4.plot(taxas, resultados['taxa_abandono'], marker='^', linewidth=2.5, 
             color='#D62828', markersize=8)
-    ax4.set_xlabel('Taxa de Chegada (doentes/hora)', fontsize=11, fontweight='bold')
+    desenhar_banda(ax4, 'taxa_abandono', '#D62828')
+    ax4.set_xlabel(rotulo, fontsize=11, fontweight='bold')
     ax4.set_ylabel('Taxa de Abandono (%)', fontsize=11, fontweight='bold')
-    ax4.set_title('Taxa de Abandono vs Taxa de Chegada', fontsize=13, fontweight='bold')
+    ax4.set_title(f'Taxa de Abandono vs {titulo}', fontsize=13, fontweight='bold')
     ax4.grid(True, alpha=0.3, linestyle='--')
     
+    if not numerico:
+        for ax in (ax1, ax2, ax3, ax4):
+            ax.set_xticks(taxas)
+            ax.set_xticklabels([str(x) for x in resultados['taxas']])
+    
     plt.tight_layout()
     
     if salvar:
         plt.savefig(filename, dpi=300, bbox_inches='tight')
     else:
         plt.show()
-    plt.close()
\ No newline at end of file
+    plt.close()
+
+
+# Rótulos das métricas nos relatórios de comparação de cenários
+ROTULOS_METRICA = {
+    'tempo_medio_espera': 'Tempo medio de espera (min)',
+    'taxa_abandono': 'Taxa de abandono (%)',
+    'ocupacao_media_medicos': 'Ocupacao dos medicos (%)',
+    'max_fila': 'Tamanho maximo da fila',
+    'tamanho_medio_fila': 'Tamanho medio da fila',
+    'tempo_medio_clinica': 'Tempo medio na clinica (min)'
+}
+
+
+def gerar_relatorio_comparacao(comparacao: Dict, metricas: List[str] = None) -> str:
+    """
+    Relatório de texto de comparar_cenarios: base, variante e diferença
+    emparelhada (com IC) de cada métrica, por variante
+
+    A coluna 'Ganho' diz quantas vezes o IC emparelhado é mais estreito do
+    que o de cenários com sementes independentes.
+    """
+    if metricas is None:
+        metricas = [m for m in ROTULOS_METRICA if m in comparacao['base']['resumo']]
+    nivel = int(round(comparacao['nivel'] * 100))
+
+    r = "\n" + "=" * 70 + "\n"
+    r += f"COMPARACAO DE CENARIOS ({comparacao['num_replicacoes']} replicas, numeros aleatorios comuns)\n"
+    r += "=" * 70 + "\n"
+    for nome, variante in comparacao['variantes'].items():
+        r += f"\n{nome}:\n"
+        r += f"  {'Metrica':<30} {'Base':>8} {'Variante':>9} {f'Diferenca (IC {nivel}%)':>22} {'Ganho':>6}\n"
+        for metrica in metricas:
+            base = comparacao['base']['resumo'][metrica]['media']
+            media = variante['resumo'][metrica]['media']
+            diferenca = variante['resumo_diferencas'][metrica]
+            emparelhada = diferenca['semi_amplitude']
+            ganho = variante['semi_amplitude_independente'][metrica] / emparelhada if emparelhada > 0 else float('inf')
+            intervalo = f"{diferenca['media']:+.2f} +- {emparelhada:.2f}"
+            r += (f"  {ROTULOS_METRICA.get(metrica, metrica):<30} {base:>8.2f} {media:>9.2f} "
+                  f"{intervalo:>22} {ganho:>5.1f}x\n")
+    r += "\n" + "=" * 70 + "\n"
+    return r
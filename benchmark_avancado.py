@@ -0,0 +1,320 @@
+# -------
+# - Benchmarks de desempenho - VERSÃO AVANÇADA
+# - Medição da velocidade e da memória do motor de simulação
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from sim_module_avancado import Simulacao
+from estruturas_avancado import Doente
+from aleatorio_avancado import configs_com_sementes
+from replicacao_avancado import _metricas_configs_lote, metricas_lote
+
+
+CONFIG_BENCHMARK = {
+    'num_medicos': 10,
+    'taxa_chegada': 38 / 60.0,
+    'tempo_medio_consulta': 15,
+    'distribuicao': 'exponential',
+    'usar_pessoas_reais': False,
+    'usar_triagem': True,
+    'tempo_max_espera': 120,
+    'usar_turnos': False,
+    'usar_pausas': False,
+    'chegadas_nao_homogeneas': False
+}
+
+
+def benchmark_calendario(horizontes: List[int] = None, config_base: Dict = None) -> List[Dict]:
+    """Mede eventos/segundo do motor à medida que o horizonte cresce"""
+    if horizontes is None:
+        horizontes = [480, 1440, 2880, 5760, 11520]
+    if config_base is None:
+        config_base = CONFIG_BENCHMARK
+
+    medicoes = []
+    print(f"{'Horizonte':>10} | {'Eventos':>9} | {'Tempo (s)':>10} | {'Eventos/s':>11}")
+    print("-" * 50)
+
+    for horizonte in horizontes:
+        config = config_base.copy()
+        config['tempo_simulacao'] = horizonte
+
+        inicio = time.perf_counter()
+        resultados = Simulacao(config).simular()
+        duracao = time.perf_counter() - inicio
+
+        eventos = resultados['eventos_processados']
+        eventos_por_segundo = eventos / duracao if duracao > 0 else 0.0
+        medicoes.append({
+            'horizonte': horizonte,
+            'eventos': eventos,
+            'tempo': duracao,
+            'eventos_por_segundo': eventos_por_segundo
+        })
+        print(f"{horizonte:>10} | {eventos:>9} | {duracao:>10.3f} | {eventos_por_segundo:>11.0f}")
+
+    return medicoes
+
+
+def benchmark_motor_rapido(horizontes: List[int] = None, config_base: Dict = None) -> List[Dict]:
+    """Compara o motor de eventos com o motor rápido FIFO (sem triagem)"""
+    if horizontes is None:
+        horizontes = [1440, 5760, 23040]
+    if config_base is None:
+        config_base = dict(CONFIG_BENCHMARK, usar_triagem=False, seed=1)
+
+    medicoes = []
+    print(f"{'Horizonte':>10} | {'Eventos (s)':>12} | {'Rapido (s)':>11} | {'Ganho':>7}")
+    print("-" * 50)
+
+    for horizonte in horizontes:
+        tempos = {}
+        for motor_rapido in (False, True):
+            config = dict(config_base, tempo_simulacao=horizonte, motor_rapido=motor_rapido)
+            inicio = time.perf_counter()
+            Simulacao(config).simular()
+            tempos[motor_rapido] = time.perf_counter() - inicio
+
+        ganho = tempos[False] / tempos[True] if tempos[True] > 0 else 0.0
+        medicoes.append({
+            'horizonte': horizonte,
+            'tempo_eventos': tempos[False],
+            'tempo_rapido': tempos[True],
+            'ganho': ganho
+        })
+        print(f"{horizonte:>10} | {tempos[False]:>12.3f} | {tempos[True]:>11.3f} | {ganho:>6.1f}x")
+
+    return medicoes
+
+
+def benchmark_motor_lote(num_replicas: List[int] = None, config_base: Dict = None) -> List[Dict]:
+    """
+    Compara R réplicas FIFO simuladas uma a uma com o motor em lote, com
+    uma fonte por réplica (sementes filhas) e com o bloco de todas
+    (metricas_lote)
+    """
+    if num_replicas is None:
+        num_replicas = [10, 100, 1000]
+    if config_base is None:
+        config_base = dict(CONFIG_BENCHMARK, usar_triagem=False, tempo_simulacao=480, guardar_historico=False)
+
+    medicoes = []
+    print(f"{'Replicas':>8} | {'Uma a uma (s)':>13} | {'Sementes (s)':>12} | {'Bloco (s)':>9} | {'Ganho':>7}")
+    print("-" * 62)
+
+    for n in num_replicas:
+        configs = configs_com_sementes(config_base, n, 1)
+        inicio = time.perf_counter()
+        for config in configs:
+            Simulacao(config).simular()
+        tempo_sequencial = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        _metricas_configs_lote(config_base, configs)
+        tempo_sementes = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        metricas_lote(config_base, n, 1)
+        tempo_bloco = time.perf_counter() - inicio
+
+        ganho = tempo_sequencial / tempo_bloco if tempo_bloco > 0 else 0.0
+        medicoes.append({
+            'num_replicas': n,
+            'tempo_sequencial': tempo_sequencial,
+            'tempo_sementes': tempo_sementes,
+            'tempo_bloco': tempo_bloco,
+            'ganho': ganho
+        })
+        print(f"{n:>8} | {tempo_sequencial:>13.3f} | {tempo_sementes:>12.3f} | {tempo_bloco:>9.3f} | {ganho:>6.1f}x")
+
+    return medicoes
+
+
+# Entrada do dataset de pessoas usada se não houver pessoas.json (o
+# registo antigo copiava a entrada inteira para cada doente)
+PESSOA_EXEMPLO = {
+    'id': 'p0',
+    'nome': 'Maria Silva',
+    'idade': 42,
+    'sexo': 'F',
+    'morada': 'Braga',
+    'profissao': 'Enfermeira'
+}
+
+
+def _pessoa_dataset() -> Dict:
+    """Primeira entrada de pessoas.json (a que simular() usaria), ou PESSOA_EXEMPLO"""
+    if os.path.exists('pessoas.json'):
+        with open('pessoas.json', 'r', encoding='utf-8') as ficheiro:
+            conteudo = ficheiro.read()
+        if conteudo:
+            pessoas = json.loads(conteudo)
+            if pessoas:
+                return pessoas[0]
+    return PESSOA_EXEMPLO
+
+
+def _doente_dicionario(i: int, pessoa: Dict = None) -> List[Dict]:
+    """
+    Registos de um doente em espera como os construía o simular() original
+
+    Reproduz, pela mesma ordem, as chaves que o motor baseado em
+    dicionários escrevia em info_doentes (a cópia da pessoa ou {'id': ...},
+    prioridade, tempo_chegada e os tempos da consulta) e a entrada
+    separada que criava para a fila de espera.
+    """
+    if pessoa is not None:
+        doente_id = pessoa['id']
+        info = pessoa.copy()
+    else:
+        doente_id = f'd{i}'
+        info = {'id': doente_id}
+    info['prioridade'] = 4
+    info['tempo_chegada'] = float(i)
+    info['tempo_espera'] = 0.0
+    info['tempo_inicio_consulta'] = 0.0
+    info['tempo_consulta'] = 0.0
+    entrada_fila = {
+        'id': doente_id,
+        'tempo_chegada': float(i),
+        'prioridade': info['prioridade']
+    }
+    return [info, entrada_fila]
+
+
+def _doente_registo(i: int, pessoa: Dict = None) -> Doente:
+    """Registo de um doente em espera no formato atual (__slots__; a pessoa não é copiada)"""
+    doente = Doente(i, 4, float(i), 1.0, pessoa)
+    doente.na_fila = True
+    return doente
+
+
+def _bytes_por_doente(criar: Callable, num_doentes: int, pessoa: Dict = None) -> float:
+    """Memória alocada por doente (tracemalloc) para guardar num_doentes registos"""
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    registos = [criar(i, pessoa) for i in range(num_doentes)]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del registos
+    return total / num_doentes
+
+
+def benchmark_memoria_doentes(num_doentes: int = 100000) -> List[Dict]:
+    """
+    Compara os bytes por doente dos registos do simular() original
+    (dicionários) com os Doente atuais (__slots__)
+
+    Com pessoas, usa a entrada do dataset que o motor copiaria.
+    """
+    medicoes = []
+    print(f"{'Doentes':>14} | {'Dicionarios (B)':>15} | {'Slots (B)':>10} | {'Reducao':>8}")
+    print("-" * 58)
+
+    for nome, pessoa in (('genericos', None), ('com pessoas', _pessoa_dataset())):
+        antes = _bytes_por_doente(_doente_dicionario, num_doentes, pessoa)
+        depois = _bytes_por_doente(_doente_registo, num_doentes, pessoa)
+        reducao = antes / depois if depois > 0 else 0.0
+        medicoes.append({
+            'doentes': nome,
+            'bytes_dicionarios': antes,
+            'bytes_slots': depois,
+            'reducao': reducao
+        })
+        print(f"{nome:>14} | {antes:>15.0f} | {depois:>10.0f} | {reducao:>7.1f}x")
+
+    return medicoes
+
+
+# Corre num processo novo: simula a configuração recebida e escreve o pico
+# de memória alocada durante simular() (tracemalloc, também conta os arrays numpy)
+_CODIGO_MEMORIA = """
+import json, sys, tracemalloc
+from sim_module_avancado import Simulacao
+config = json.loads(sys.argv[1])
+simulacao = Simulacao(config)
+tracemalloc.start()
+resultados = simulacao.simular()
+pico = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+print(json.dumps({'pico': pico, 'doentes': resultados['doentes_atendidos'] + resultados['doentes_abandonaram']}))
+"""
+
+
+def _pico_memoria(config: Dict) -> Dict:
+    """Pico de memória alocada durante uma simulação, num subprocesso próprio"""
+    saida = subprocess.run([sys.executable, '-c', _CODIGO_MEMORIA, json.dumps(config)],
+                           capture_output=True, text=True, check=True,
+                           cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(saida.stdout)
+
+
+def benchmark_memoria_limitada(horizontes: List[int] = None, config_base: Dict = None) -> List[Dict]:
+    """
+    Pico de memória da simulação com e sem memoria_limitada
+
+    Cada modo corre num processo novo e o pico é medido com tracemalloc só
+    durante simular(): fica de fora o custo fixo do interpretador e dos
+    imports, que no pico de RSS escondia o crescimento com o horizonte.
+    """
+    if horizontes is None:
+        horizontes = [1440, 10080, 40320, 161280]  # 1 dia, 1, 4 e 16 semanas
+    if config_base is None:
+        config_base = dict(CONFIG_BENCHMARK, seed=1)
+
+    medicoes = []
+    print(f"{'Horizonte':>10} | {'Doentes':>8} | {'Normal (MiB)':>12} | {'Limitada (MiB)':>14}")
+    print("-" * 55)
+
+    for horizonte in horizontes:
+        picos = {}
+        for memoria_limitada in (False, True):
+            config = dict(config_base, tempo_simulacao=horizonte, memoria_limitada=memoria_limitada)
+            medicao = _pico_memoria(config)
+            picos[memoria_limitada] = medicao['pico']
+        medicoes.append({
+            'horizonte': horizonte,
+            'doentes': medicao['doentes'],
+            'pico_normal': picos[False],
+            'pico_limitada': picos[True]
+        })
+        print(f"{horizonte:>10} | {medicao['doentes']:>8} | {picos[False] / 2**20:>12.2f} | "
+              f"{picos[True] / 2**20:>14.2f}")
+
+    return medicoes
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("BENCHMARK: Calendario de eventos")
+    print("=" * 50)
+    benchmark_calendario()
+    print()
+    print("=" * 50)
+    print("BENCHMARK: Motor rapido FIFO")
+    print("=" * 50)
+    benchmark_motor_rapido()
+    print()
+    print("=" * 62)
+    print("BENCHMARK: Motor em lote (replicas FIFO)")
+    print("=" * 62)
+    benchmark_motor_lote()
+    print()
+    print("=" * 58)
+    print("BENCHMARK: Memoria por doente")
+    print("=" * 58)
+    benchmark_memoria_doentes()
+    print()
+    print("=" * 55)
+    print("BENCHMARK: Memoria da simulacao (memoria_limitada)")
+    print("=" * 55)
+    benchmark_memoria_limitada()
@@ -0,0 +1,140 @@
+# -------
+# - Módulo de Dados - VERSÃO AVANÇADA
+# - Leitura do dataset de pessoas com cache e ficheiro binário
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import os
+import json
+import numpy as np
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+FICHEIRO_PESSOAS = 'pessoas.json'
+
+# Datasets já lidos neste processo: (caminho absoluto, binario) -> (mtime, pessoas)
+_cache: Dict[Tuple[str, bool], Tuple[float, Sequence]] = {}
+
+
+def caminho_binario(caminho: str) -> str:
+    """Ficheiro binário (.npy) associado a um dataset JSON"""
+    return os.path.splitext(caminho)[0] + '.npy'
+
+
+def _ler_json(caminho: str) -> List[Dict]:
+    """Lê o dataset JSON (lista de pessoas); ficheiro vazio dá lista vazia"""
+    with open(caminho, 'r', encoding='utf-8') as ficheiro:
+        conteudo = ficheiro.read()
+    return json.loads(conteudo) if conteudo.strip() else []
+
+
+def _coluna(valores: List) -> np.ndarray:
+    """
+    Converte os valores de um campo numa coluna numpy
+
+    Inteiros, reais e booleanos ficam com tipo numérico; o resto (texto,
+    campos em falta, listas ou dicionários) fica como texto, com os valores
+    compostos em JSON.
+    """
+    if all(isinstance(v, bool) for v in valores):
+        return np.array(valores, dtype=np.bool_)
+    numeros = [v for v in valores if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    if len(numeros) == len(valores):
+        inteiros = all(isinstance(v, int) for v in valores)
+        return np.array(valores, dtype=np.int64 if inteiros else np.float64)
+    textos = ['' if v is None else v if isinstance(v, str) else json.dumps(v, ensure_ascii=False)
+              for v in valores]
+    return np.array(textos, dtype=f'U{max(max(map(len, textos)), 1)}')
+
+
+def converter_pessoas(caminho: str = FICHEIRO_PESSOAS, destino: str = None) -> str:
+    """
+    Converte o dataset JSON num array estruturado numpy (.npy)
+
+    Cada campo das pessoas passa a uma coluna de tamanho fixo, pelo que o
+    ficheiro pode ser aberto com mmap (sem ler o JSON nem criar
+    dicionários). Os registos continuam a aceitar pessoa['campo'].
+
+    Args:
+        caminho: Ficheiro JSON com a lista de pessoas
+        destino: Ficheiro .npy (por omissão ao lado do JSON)
+
+    Returns:
+        Caminho do ficheiro criado (None se o dataset estiver vazio)
+    """
+    if destino is None:
+        destino = caminho_binario(caminho)
+    pessoas = _ler_json(caminho)
+    if not pessoas:
+        return None
+
+    campos = []
+    for pessoa in pessoas:
+        for campo in pessoa:
+            if campo not in campos:
+                campos.append(campo)
+    colunas = [_coluna([pessoa.get(campo) for pessoa in pessoas]) for campo in campos]
+    tabela = np.empty(len(pessoas), dtype=[(campo, coluna.dtype) for campo, coluna in zip(campos, colunas)])
+    for campo, coluna in zip(campos, colunas):
+        tabela[campo] = coluna
+
+    # Escrever num temporário e trocar: outros processos nunca veem o
+    # ficheiro a meio
+    temporario = f'{destino}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as ficheiro:
+        np.save(ficheiro, tabela)
+    os.replace(temporario, destino)
+    return destino
+
+
+def _carregar_binario(caminho: str, mtime: float) -> Sequence:
+    """Abre o .npy com mmap, recriando-o se for mais antigo do que o JSON"""
+    binario = caminho_binario(caminho)
+    if not os.path.exists(binario) or os.path.getmtime(binario) < mtime:
+        if converter_pessoas(caminho, binario) is None:
+            return []
+    return np.load(binario, mmap_mode='r')
+
+
+def carregar_pessoas(caminho: str = FICHEIRO_PESSOAS, binario: bool = False) -> Sequence:
+    """
+    Dataset de pessoas, lido uma só vez por processo
+
+    A cache é indexada pelo caminho e pela data de modificação do ficheiro:
+    se o JSON mudar volta a ser lido. O dataset devolvido é partilhado por
+    todas as simulações do processo e não deve ser alterado.
+
+    Args:
+        caminho: Ficheiro JSON com a lista de pessoas
+        binario: Usar o ficheiro .npy com mmap (criado se não existir); os
+            processos que o abrem partilham as mesmas páginas de memória
+
+    Returns:
+        Lista de dicionários, ou array estruturado (só de leitura) se binario
+    """
+    caminho = os.path.abspath(caminho)
+    mtime = os.path.getmtime(caminho)
+    chave = (caminho, binario)
+    em_cache = _cache.get(chave)
+    if em_cache is not None and em_cache[0] == mtime:
+        return em_cache[1]
+
+    if binario:
+        pessoas = _carregar_binario(caminho, mtime)
+    else:
+        pessoas = _ler_json(caminho)
+    _cache[chave] = (mtime, pessoas)
+    return pessoas
+
+
+def preparar_pessoas(configs: Iterable[Dict]):
+    """
+    Cria antes de lançar os trabalhadores os ficheiros .npy de que as
+    configurações precisam, para que nenhum processo tenha de ler o JSON
+    """
+    caminhos = {config.get('ficheiro_pessoas', FICHEIRO_PESSOAS) for config in configs
+                if config.get('usar_pessoas_reais', False) and config.get('pessoas_binario', False)}
+    for caminho in caminhos:
+        if os.path.exists(caminho):
+            carregar_pessoas(caminho, binario=True)
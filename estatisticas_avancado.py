@@ -0,0 +1,658 @@
+# -------
+# - Módulo de Estatística - VERSÃO AVANÇADA
+# - Intervalos de confiança e estimadores para as réplicas
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import numpy as np
+from bisect import bisect_left
+from itertools import accumulate
+from math import sqrt, pi, cos, sin, exp, log, ceil
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Quantis reportados por omissão (percentagens)
+QUANTIS_PADRAO = (50, 90, 95, 99)
+
+# Médias por lotes: lotes guardados no máximo (ficam entre metade e este
+# valor) e mínimo de lotes ao juntá-los para reduzir a autocorrelação
+MAX_LOTES = 64
+MIN_LOTES = 10
+
+# Limite bilateral a 5% para a autocorrelação das médias dos lotes (x 1/raiz(k))
+_LIMITE_Z = NormalDist().inv_cdf(0.975)
+
+
+def quantil_t(nivel: float, graus_liberdade: int) -> float:
+    """
+    Quantil bilateral da t de Student (algoritmo de Hill, ACM 396)
+
+    Devolve t tal que P(|T| <= t) = nivel, com T ~ t(graus_liberdade).
+    """
+    p = 1.0 - nivel
+    n = graus_liberdade
+    if n < 1:
+        return float('inf')
+    if n == 1:
+        p *= pi / 2
+        return cos(p) / sin(p)
+    if n == 2:
+        return sqrt(2 / (p * (2 - p)) - 2)
+
+    a = 1 / (n - 0.5)
+    b = 48 / (a * a)
+    c = ((20700 * a / b - 98) * a - 16) * a + 96.36
+    d = ((94.5 / (b + c) - 3) / b + 1) * sqrt(a * pi / 2) * n
+    x = d * p
+    y = x ** (2 / n)
+    if y > 0.05 + a:
+        # Aproximação assintótica a partir do quantil normal
+        x = NormalDist().inv_cdf(p * 0.5)
+        y = x * x
+        if n < 5:
+            c += 0.3 * (n - 4.5) * (x + 0.6)
+        c = (((0.05 * d * x - 5) * x - 7) * x - 2) * x + b + c
+        y = (((((0.4 * y + 6.3) * y + 36) * y + 94.5) / c - y - 3) / b + 1) * x
+        y = a * y * y
+        y = exp(y) - 1 if y > 0.002 else 0.5 * y * y + y
+    else:
+        y = ((1 / (((n + 6) / (n * y) - 0.089 * d - 0.822) * (n + 2) * 3)
+              + 0.5 / (n + 4)) * y - 1) * (n + 1) / (n + 2) + 1 / y
+    return sqrt(n * y)
+
+
+def intervalo_confianca(amostras: Sequence[float], nivel: float = 0.95) -> Dict:
+    """
+    Média, desvio padrão e intervalo de confiança (t de Student)
+
+    Args:
+        amostras: Valores independentes (ex.: um por réplica)
+        nivel: Nível de confiança
+
+    Returns:
+        Dicionário com media, desvio_padrao, semi_amplitude, ic e n
+    """
+    amostras = np.asarray(amostras, dtype=float)
+    n = len(amostras)
+    media = float(np.mean(amostras)) if n > 0 else 0.0
+    desvio = float(np.std(amostras, ddof=1)) if n > 1 else 0.0
+    if n > 1:
+        semi_amplitude = quantil_t(nivel, n - 1) * desvio / sqrt(n)
+    else:
+        semi_amplitude = float('inf')
+    return {
+        'media': media,
+        'desvio_padrao': desvio,
+        'semi_amplitude': semi_amplitude,
+        'ic': (media - semi_amplitude, media + semi_amplitude),
+        'n': n
+    }
+
+
+def estimador_antitetico(amostras: Sequence[float], nivel: float = 0.95) -> Dict:
+    """
+    Intervalo de confiança a partir de pares antitéticos
+
+    Args:
+        amostras: Valores em pares consecutivos (original, antitética)
+        nivel: Nível de confiança
+
+    Returns:
+        Como intervalo_confianca sobre as médias dos pares (n = número de
+        pares), com 'variancia_estimador' e 'reducao_variancia' face a
+        2n simulações independentes (variância das amostras / 2n)
+    """
+    amostras = np.asarray(amostras, dtype=float)
+    if len(amostras) % 2:
+        raise ValueError("As amostras antitéticas têm de vir em pares")
+    pares = amostras.reshape(-1, 2).mean(axis=1)
+    resultado = intervalo_confianca(pares, nivel)
+    n = len(pares)
+    resultado['variancia_estimador'] = resultado['desvio_padrao'] ** 2 / n if n > 1 else float('inf')
+    variancia_simples = float(np.var(amostras, ddof=1)) / len(amostras) if n > 0 else float('inf')
+    resultado['reducao_variancia'] = _reducao(variancia_simples, resultado['variancia_estimador'])
+    return resultado
+
+
+def estimador_controlo(amostras: Sequence[float], controlos: np.ndarray, medias_controlos: Sequence[float],
+                       nivel: float = 0.95, variancia_simples: float = None) -> Dict:
+    """
+    Estimador com variáveis de controlo (regressão linear)
+
+    Ajusta Y = b0 + b . (C - E[C]) por mínimos quadrados; b0 é a média
+    corrigida e o seu erro padrão sai dos resíduos da regressão, com
+    n - q - 1 graus de liberdade (q controlos).
+
+    Args:
+        amostras: Valores Y de cada réplica (n,)
+        controlos: Controlos C de cada réplica (n, q)
+        medias_controlos: Valores esperados conhecidos E[C] (q,)
+        nivel: Nível de confiança
+        variancia_simples: Variância de referência para a redução (por
+            omissão a da média simples das amostras)
+
+    Returns:
+        Como intervalo_confianca, com 'coeficientes' (b),
+        'variancia_estimador' e 'reducao_variancia'
+    """
+    amostras = np.asarray(amostras, dtype=float)
+    controlos = np.asarray(controlos, dtype=float).reshape(len(amostras), -1)
+    n, q = controlos.shape
+    if variancia_simples is None:
+        variancia_simples = float(np.var(amostras, ddof=1)) / n if n > 1 else float('inf')
+    graus_liberdade = n - q - 1
+    if graus_liberdade < 1:
+        # Réplicas insuficientes para estimar os coeficientes: média simples
+        resultado = intervalo_confianca(amostras, nivel)
+        resultado['coeficientes'] = np.zeros(q)
+        resultado['variancia_estimador'] = variancia_simples
+        resultado['reducao_variancia'] = 1.0
+        return resultado
+
+    x = np.column_stack((np.ones(n), controlos - np.asarray(medias_controlos, dtype=float)))
+    inversa = np.linalg.pinv(x.T @ x)
+    coeficientes = inversa @ (x.T @ amostras)
+    residuos = amostras - x @ coeficientes
+    variancia_residuos = float(residuos @ residuos) / graus_liberdade
+    variancia_estimador = variancia_residuos * float(inversa[0, 0])
+    media = float(coeficientes[0])
+    semi_amplitude = quantil_t(nivel, graus_liberdade) * sqrt(variancia_estimador)
+    return {
+        'media': media,
+        'desvio_padrao': sqrt(variancia_residuos),
+        'semi_amplitude': semi_amplitude,
+        'ic': (media - semi_amplitude, media + semi_amplitude),
+        'n': n,
+        'coeficientes': coeficientes[1:],
+        'variancia_estimador': variancia_estimador,
+        'reducao_variancia': _reducao(variancia_simples, variancia_estimador)
+    }
+
+
+def _reducao(variancia_simples: float, variancia_estimador: float) -> float:
+    """Fator de redução da variância (quantas vezes menos réplicas para o mesmo IC)"""
+    if variancia_estimador > 0:
+        return variancia_simples / variancia_estimador
+    return float('inf') if variancia_simples > 0 else 1.0
+
+
+class MediaTemporal:
+    """Média ponderada pelo tempo de um valor em escada, atualizada em O(1)"""
+
+    def __init__(self, valor_inicial: float = 0.0, tempo_inicial: float = 0.0):
+        """
+        Args:
+            valor_inicial: Valor em tempo_inicial
+            tempo_inicial: Instante em que começa a acumulação
+        """
+        self.valor = valor_inicial
+        self.tempo = tempo_inicial
+        self.tempo_inicial = tempo_inicial
+        self.area = 0.0
+
+    def atualizar(self, tempo: float, valor: float):
+        """O valor passa a ser 'valor' a partir de 'tempo' (acumula o troço anterior)"""
+        self.area += self.valor * (tempo - self.tempo)
+        self.tempo = tempo
+        self.valor = valor
+
+    def media(self, tempo_final: float = None) -> float:
+        """Média no intervalo [tempo_inicial, tempo_final] (por omissão até à última atualização)"""
+        area = self.area
+        if tempo_final is not None and tempo_final > self.tempo:
+            area += self.valor * (tempo_final - self.tempo)
+        else:
+            tempo_final = self.tempo
+        duracao = tempo_final - self.tempo_inicial
+        return area / duracao if duracao > 0 else 0.0
+
+    def reiniciar(self, tempo: float):
+        """Esquece o acumulado até 'tempo', que passa a ser o início (fim do aquecimento)"""
+        self.area = 0.0
+        self.tempo = tempo
+        self.tempo_inicial = tempo
+
+
+def medias_intervalos(tempos: Sequence[float], valores: Sequence[float], duracao: float,
+                      num_intervalos: int) -> np.ndarray:
+    """
+    Médias ponderadas pelo tempo de uma série em escada em intervalos iguais
+
+    Args:
+        tempos: Instantes das mudanças (crescentes, o primeiro em 0)
+        valores: Valor a partir de cada instante
+        duracao: Fim do último intervalo
+        num_intervalos: Número de intervalos de [0, duracao]
+
+    Returns:
+        Array (num_intervalos,) com a média de cada intervalo
+    """
+    tempos = np.asarray(tempos, dtype=float)
+    valores = np.asarray(valores, dtype=float)
+    grelha = np.linspace(0.0, duracao, num_intervalos + 1)
+    if len(tempos) == 0:
+        return np.zeros(num_intervalos)
+    return np.diff(_area_acumulada(tempos, valores, grelha)) / (duracao / num_intervalos)
+
+
+def _area_acumulada(tempos: np.ndarray, valores: np.ndarray, pontos: np.ndarray) -> np.ndarray:
+    """Integral da série em escada desde tempos[0] até cada ponto"""
+    # Área acumulada em cada mudança e, por interpolação, em cada ponto
+    area = np.concatenate(([0.0], np.cumsum(valores[:-1] * np.diff(tempos))))
+    indices = np.maximum(np.searchsorted(tempos, pontos, side='right') - 1, 0)
+    return area[indices] + valores[indices] * np.maximum(pontos - tempos[indices], 0.0)
+
+
+def mser(valores: Sequence[float], tamanho_lote: int = 5) -> Tuple[int, bool]:
+    """
+    Truncagem MSER-m (White, 1997) de uma série com transiente inicial
+
+    Agrupa a série em médias de tamanho_lote observações (MSER-5 por
+    omissão) e escolhe o número d de lotes a descartar que minimiza
+    S²(d) / (k - d), o quadrado do erro padrão da média do que fica. Só se
+    procura d na primeira metade; se o mínimo ficar no limite (metade da
+    série), a série é curta demais para o transiente e a truncagem não é
+    fiável.
+
+    Returns:
+        Número de observações a descartar e se a truncagem é fiável
+    """
+    valores = np.asarray(valores, dtype=float)
+    k = len(valores) // tamanho_lote
+    if k < 4:
+        return 0, False
+    lotes = valores[:k * tamanho_lote].reshape(k, tamanho_lote).mean(axis=1)
+    # Somas dos lotes d..k-1 para todos os d (somas acumuladas do fim)
+    restantes = np.arange(k, 0, -1, dtype=float)
+    soma = np.cumsum(lotes[::-1])[::-1]
+    soma_quadrados = np.cumsum((lotes ** 2)[::-1])[::-1]
+    desvios = np.maximum(soma_quadrados - soma ** 2 / restantes, 0.0)
+    estatistica = desvios / restantes ** 2
+    melhor = int(np.argmin(estatistica[:k // 2 + 1]))
+    return melhor * tamanho_lote, melhor < k // 2
+
+
+def aquecimento_serie(tempos: Sequence[float], valores: Sequence[float], duracao: float,
+                      num_intervalos: int = 1000, tamanho_lote: int = 5) -> Tuple[float, bool]:
+    """
+    Período de aquecimento de uma série em escada (MSER-5 sobre médias
+    ponderadas pelo tempo em num_intervalos intervalos iguais)
+
+    Returns:
+        Instante a partir do qual a série está em regime estacionário e se
+        a estimativa é fiável (ver mser)
+    """
+    if duracao <= 0:
+        return 0.0, False
+    truncadas, fiavel = mser(medias_intervalos(tempos, valores, duracao, num_intervalos), tamanho_lote)
+    return truncadas * duracao / num_intervalos, fiavel
+
+
+class MediasLotes:
+    """
+    Médias por lotes de uma sequência de observações, em fluxo
+
+    Os lotes começam com uma observação; quando se completam max_lotes,
+    os pares vizinhos juntam-se e o tamanho duplica. Ficam assim sempre
+    entre max_lotes/2 e max_lotes lotes, com memória constante e sem
+    guardar as observações, qualquer que seja a duração da simulação.
+    """
+
+    def __init__(self, max_lotes: int = MAX_LOTES):
+        """
+        Args:
+            max_lotes: Número de lotes que provoca a junção (par)
+        """
+        if max_lotes < 4 or max_lotes % 2:
+            raise ValueError("max_lotes tem de ser par e pelo menos 4")
+        self.max_lotes = max_lotes
+        self.tamanho = 1
+        self.somas = []
+        self.soma_atual = 0.0
+        self.n_atual = 0
+        self.n = 0
+
+    @classmethod
+    def de_valores(cls, valores: Sequence[float], max_lotes: int = MAX_LOTES) -> 'MediasLotes':
+        """Estado depois de adicionar os valores um a um (calculado de uma vez)"""
+        valores = np.asarray(valores, dtype=float)
+        lotes = cls(max_lotes)
+        lotes.n = len(valores)
+        while lotes.n // lotes.tamanho >= max_lotes:
+            lotes.tamanho *= 2
+        completos = (lotes.n // lotes.tamanho) * lotes.tamanho
+        lotes.somas = valores[:completos].reshape(-1, lotes.tamanho).sum(axis=1).tolist()
+        lotes.soma_atual = float(valores[completos:].sum())
+        lotes.n_atual = lotes.n - completos
+        return lotes
+
+    def adicionar(self, valor: float):
+        """Acrescenta uma observação"""
+        self.soma_atual += valor
+        self.n_atual += 1
+        self.n += 1
+        if self.n_atual == self.tamanho:
+            self._fechar_lote()
+
+    def _fechar_lote(self):
+        """Guarda o lote em curso e junta os pares se chegou a max_lotes"""
+        self.somas.append(self.soma_atual)
+        self.soma_atual = 0.0
+        self.n_atual = 0
+        if len(self.somas) == self.max_lotes:
+            self.somas = [self.somas[i] + self.somas[i + 1] for i in range(0, self.max_lotes, 2)]
+            self.tamanho *= 2
+
+    def medias(self) -> np.ndarray:
+        """Médias dos lotes completos (o lote em curso fica de fora)"""
+        return np.array(self.somas) / self.tamanho
+
+    def resultado(self, nivel: float = 0.95) -> Dict:
+        """
+        Média e intervalo de confiança pelas médias dos lotes
+
+        As médias dos lotes só são aproximadamente independentes se os
+        lotes forem longos em relação à correlação da série. Enquanto a
+        autocorrelação de atraso 1 das médias for significativa (fora de
+        +-1.96/raiz(k), teste a 5%) e sobrarem pelo menos 2 * MIN_LOTES
+        lotes, juntam-se os pares.
+
+        Returns:
+            Como intervalo_confianca (n = número de lotes), com
+            'tamanho_lote' (observações, ou minutos nas séries no tempo),
+            'autocorrelacao' (atraso 1) e 'independentes' (se passou o teste)
+        """
+        medias = self.medias()
+        tamanho = self.tamanho
+        autocorrelacao = autocorrelacao_lag1(medias)
+        while len(medias) >= 2 * MIN_LOTES and abs(autocorrelacao) > _LIMITE_Z / sqrt(len(medias)):
+            medias = medias[:len(medias) // 2 * 2].reshape(-1, 2).mean(axis=1)
+            tamanho *= 2
+            autocorrelacao = autocorrelacao_lag1(medias)
+        resultado = intervalo_confianca(medias, nivel)
+        resultado['tamanho_lote'] = tamanho
+        resultado['autocorrelacao'] = autocorrelacao
+        resultado['independentes'] = len(medias) > 2 and abs(autocorrelacao) <= _LIMITE_Z / sqrt(len(medias))
+        return resultado
+
+
+class MediasLotesTempo(MediasLotes):
+    """
+    Médias por lotes no tempo de um valor em escada (ex.: tamanho da fila)
+
+    Cada lote é um intervalo de tempo e a sua média é ponderada pelo tempo;
+    os intervalos começam com largura_inicial minutos e duplicam como os
+    lotes de MediasLotes.
+    """
+
+    def __init__(self, max_lotes: int = MAX_LOTES, largura_inicial: float = 1.0, tempo_inicial: float = 0.0):
+        """
+        Args:
+            max_lotes: Número de lotes que provoca a junção (par)
+            largura_inicial: Duração inicial de cada lote (min)
+            tempo_inicial: Início do primeiro lote (valor 0 até à primeira atualização)
+        """
+        super().__init__(max_lotes)
+        self.largura_inicial = largura_inicial
+        self.valor = 0.0
+        self.reiniciar(tempo_inicial)
+
+    @classmethod
+    def de_serie(cls, tempos: Sequence[float], valores: Sequence[float], tempo_final: float,
+                 tempo_inicial: float = 0.0, max_lotes: int = MAX_LOTES,
+                 largura_inicial: float = 1.0) -> 'MediasLotesTempo':
+        """
+        Estado depois de atualizar com a série em escada (valor 0 antes de
+        tempos[0]) e fechar em tempo_final, calculado de uma vez
+        """
+        tempos = np.concatenate(([min(tempo_inicial, tempos[0] if len(tempos) else tempo_inicial)],
+                                 np.asarray(tempos, dtype=float)))
+        valores = np.concatenate(([0.0], np.asarray(valores, dtype=float)))
+        lotes = cls(max_lotes, largura_inicial, tempo_inicial)
+        duracao = tempo_final - tempo_inicial
+        while duracao // lotes.tamanho >= max_lotes:
+            lotes.tamanho *= 2
+        completos = int(duracao // lotes.tamanho)
+        fronteiras = tempo_inicial + lotes.tamanho * np.arange(completos + 1)
+        areas = _area_acumulada(tempos, valores, np.append(fronteiras, tempo_final))
+        lotes.somas = np.diff(areas[:-1]).tolist()
+        lotes.soma_atual = float(areas[-1] - areas[-2])
+        lotes.tempo = tempo_final
+        lotes.fim_lote = fronteiras[-1] + lotes.tamanho
+        lotes.valor = float(valores[np.searchsorted(tempos, tempo_final, side='right') - 1])
+        return lotes
+
+    def reiniciar(self, tempo: float):
+        """Esquece os lotes e recomeça em 'tempo' (fim do aquecimento), mantendo o valor atual"""
+        self.tamanho = self.largura_inicial
+        self.somas = []
+        self.soma_atual = 0.0
+        self.tempo = tempo
+        self.fim_lote = tempo + self.tamanho
+
+    def atualizar(self, tempo: float, valor: float):
+        """O valor passa a ser 'valor' a partir de 'tempo' (acumula o troço anterior)"""
+        self.fechar(tempo)
+        self.valor = valor
+
+    def fechar(self, tempo: float):
+        """Acumula o valor atual até 'tempo', fechando os lotes que terminam pelo caminho"""
+        while tempo >= self.fim_lote:
+            self.soma_atual += self.valor * (self.fim_lote - self.tempo)
+            self.tempo = self.fim_lote
+            self._fechar_lote()
+            self.fim_lote = self.tempo + self.tamanho
+        self.soma_atual += self.valor * (tempo - self.tempo)
+        self.tempo = tempo
+
+
+def autocorrelacao_lag1(valores: Sequence[float]) -> float:
+    """Autocorrelação de atraso 1 (0.0 com menos de 3 valores ou série constante)"""
+    valores = np.asarray(valores, dtype=float)
+    if len(valores) < 3:
+        return 0.0
+    desvios = valores - valores.mean()
+    denominador = float(desvios @ desvios)
+    if denominador <= 0:
+        return 0.0
+    return float(desvios[:-1] @ desvios[1:]) / denominador
+
+
+class HistogramaLog:
+    """
+    Histograma com classes logarítmicas fixas (esboço de quantis)
+
+    Cada classe i >= 1 cobre (gama^(i-2), gama^(i-1)] * minimo, com gama escolhido
+    para que o representante da classe tenha erro relativo de no máximo
+    erro_relativo. Valores abaixo de minimo (ex.: esperas nulas) ficam numa
+    classe própria com representante 0. As classes são as mesmas para
+    todos os histogramas com os mesmos parâmetros, pelo que se juntam
+    somando contagens (réplicas, prioridades).
+    """
+
+    def __init__(self, erro_relativo: float = 0.01, minimo: float = 1e-3, maximo: float = 1e6):
+        """
+        Args:
+            erro_relativo: Erro relativo máximo dos quantis estimados
+            minimo: Menor valor distinguido de zero
+            maximo: Valores acima ficam na última classe
+        """
+        self.erro_relativo = erro_relativo
+        self.minimo = minimo
+        self.maximo = maximo
+        self._gama = (1 + erro_relativo) / (1 - erro_relativo)
+        self._inverso_log_gama = 1 / log(self._gama)
+        self._num_classes = int(ceil(log(maximo / minimo) * self._inverso_log_gama)) + 2
+        # Lista simples: incrementar uma posição é mais rápido do que num array
+        self._contagens = [0] * self._num_classes
+        self.n = 0
+        self.soma = 0.0
+        self.valor_minimo = float('inf')
+        self.valor_maximo = float('-inf')
+
+    @property
+    def contagens(self) -> np.ndarray:
+        """Contagem de cada classe"""
+        return np.array(self._contagens, dtype=np.int64)
+
+    def _indice(self, valor: float) -> int:
+        """Classe do valor (0 = abaixo de minimo)"""
+        if valor < self.minimo:
+            return 0
+        indice = int(ceil(log(valor / self.minimo) * self._inverso_log_gama)) + 1
+        return min(indice, self._num_classes - 1)
+
+    def indices(self, valores: np.ndarray) -> np.ndarray:
+        """Classe de cada valor de um array de qualquer forma (vetorizado)"""
+        indices = np.zeros(np.shape(valores), dtype=np.int64)
+        positivos = valores >= self.minimo
+        indices[positivos] = np.minimum(
+            np.ceil(np.log(valores[positivos] / self.minimo) * self._inverso_log_gama).astype(np.int64) + 1,
+            self._num_classes - 1)
+        return indices
+
+    @property
+    def num_classes(self) -> int:
+        """Número de classes (incluindo a dos valores abaixo de minimo)"""
+        return self._num_classes
+
+    @classmethod
+    def de_contagens(cls, contagens: np.ndarray, soma: float, valor_minimo: float, valor_maximo: float,
+                     erro_relativo: float = 0.01, minimo: float = 1e-3, maximo: float = 1e6) -> 'HistogramaLog':
+        """
+        Histograma com contagens por classe já calculadas (ex.: uma linha
+        das contagens de várias réplicas, ver indices)
+        """
+        histograma = cls(erro_relativo, minimo, maximo)
+        histograma._contagens = np.asarray(contagens, dtype=np.int64).tolist()
+        histograma.n = sum(histograma._contagens)
+        histograma.soma = soma
+        histograma.valor_minimo = valor_minimo
+        histograma.valor_maximo = valor_maximo
+        return histograma
+
+    def adicionar(self, valor: float):
+        """Regista um valor em O(1)"""
+        self._contagens[self._indice(valor)] += 1
+        self.n += 1
+        self.soma += valor
+        if valor < self.valor_minimo:
+            self.valor_minimo = valor
+        if valor > self.valor_maximo:
+            self.valor_maximo = valor
+
+    def adicionar_varios(self, valores: Sequence[float]):
+        """
+        Regista vários valores de forma vetorizada
+
+        A soma é acumulada pela mesma ordem que adicionar um a um; as
+        classes só podem diferir em valores exatamente numa fronteira.
+        """
+        valores = np.asarray(valores, dtype=float)
+        if len(valores) == 0:
+            return
+        indices = self.indices(valores)
+        self._contagens = (self.contagens + np.bincount(indices, minlength=self._num_classes)).tolist()
+        self.n += len(valores)
+        self.soma = sum(valores.tolist(), self.soma)
+        self.valor_minimo = min(self.valor_minimo, float(valores.min()))
+        self.valor_maximo = max(self.valor_maximo, float(valores.max()))
+
+    def _compativel(self, outro: 'HistogramaLog') -> bool:
+        return (self.erro_relativo, self.minimo, self.maximo) == (outro.erro_relativo, outro.minimo, outro.maximo)
+
+    def juntar(self, outro: 'HistogramaLog'):
+        """Acrescenta as contagens de outro histograma com os mesmos parâmetros"""
+        if not self._compativel(outro):
+            raise ValueError("Só se podem juntar histogramas com os mesmos parâmetros")
+        self._contagens = (self.contagens + outro.contagens).tolist()
+        self.n += outro.n
+        self.soma += outro.soma
+        self.valor_minimo = min(self.valor_minimo, outro.valor_minimo)
+        self.valor_maximo = max(self.valor_maximo, outro.valor_maximo)
+
+    @classmethod
+    def combinar(cls, histogramas: Iterable['HistogramaLog']) -> 'HistogramaLog':
+        """Novo histograma com a soma de vários (ex.: de várias réplicas)"""
+        histogramas = list(histogramas)
+        if not histogramas:
+            return cls()
+        primeiro = histogramas[0]
+        total = cls(primeiro.erro_relativo, primeiro.minimo, primeiro.maximo)
+        for histograma in histogramas:
+            total.juntar(histograma)
+        return total
+
+    def _representante(self, indice: int) -> float:
+        """Valor que representa a classe (erro relativo <= erro_relativo)"""
+        if indice == 0:
+            return 0.0
+        return self.minimo * 2 * self._gama ** (indice - 1) / (self._gama + 1)
+
+    def quantil(self, q: float) -> float:
+        """
+        Estimativa do quantil q (0 a 1); 0.0 se estiver vazio
+
+        Usa a ordem mais próxima: a classe do ceil(q * n)-ésimo valor, pelo
+        que em amostras pequenas os quantis altos ficam no maior valor.
+        """
+        return self._quantis([q])[0]
+
+    def _quantis(self, qs: Sequence[float]) -> List[float]:
+        """quantil() de vários q, com uma só soma acumulada das contagens"""
+        if self.n == 0:
+            return [0.0] * len(qs)
+        acumuladas = list(accumulate(self._contagens))
+        valores = []
+        for q in qs:
+            # Tolerância para q * n inteiro com erro de arredondamento (0.9 * 10)
+            ordem = min(max(int(ceil(q * self.n - 1e-9)), 1), self.n)
+            if ordem == self.n:
+                valores.append(self.valor_maximo)
+                continue
+            valor = self._representante(bisect_left(acumuladas, ordem))
+            valores.append(min(max(valor, self.valor_minimo), self.valor_maximo))
+        return valores
+
+    def quantis(self, percentagens: Sequence[float] = QUANTIS_PADRAO) -> Dict[str, float]:
+        """Quantis por percentagem, com chaves 'p50', 'p90', ..."""
+        return dict(zip((f'p{p:g}' for p in percentagens), self._quantis([p / 100 for p in percentagens])))
+
+    def media(self) -> float:
+        """Média exata dos valores registados"""
+        return self.soma / self.n if self.n > 0 else 0.0
+
+    def classes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Limites das classes não vazias e respetivas contagens (para gráficos)"""
+        ocupadas = np.nonzero(self.contagens)[0]
+        superiores = np.where(ocupadas == 0, self.minimo, self.minimo * self._gama ** (ocupadas - 1.0))
+        inferiores = np.where(ocupadas == 0, 0.0, superiores / self._gama)
+        return np.column_stack((inferiores, superiores)), self.contagens[ocupadas]
+
+
+def criar_distribuicoes() -> Dict:
+    """Histogramas de uma simulação: espera, consulta, tempo na clínica e espera por prioridade"""
+    return {
+        'espera': HistogramaLog(),
+        'consulta': HistogramaLog(),
+        'clinica': HistogramaLog(),
+        'espera_por_prioridade': {prioridade: HistogramaLog() for prioridade in range(1, 6)}
+    }
+
+
+def quantis_resultados(distribuicoes: Dict, percentagens: Sequence[float] = QUANTIS_PADRAO) -> Dict:
+    """Quantis de cada histograma de um dicionário (aninhado) de HistogramaLog"""
+    return {chave: (quantis_resultados(valor, percentagens) if isinstance(valor, dict)
+                    else valor.quantis(percentagens))
+            for chave, valor in distribuicoes.items()}
+
+
+def combinar_distribuicoes(lista_distribuicoes: List[Dict]) -> Dict:
+    """Junta os histogramas de várias réplicas, chave a chave"""
+    primeiro = lista_distribuicoes[0]
+    return {chave: (combinar_distribuicoes([d[chave] for d in lista_distribuicoes])
+                    if isinstance(valor, dict)
+                    else HistogramaLog.combinar(d[chave] for d in lista_distribuicoes))
+            for chave, valor in primeiro.items()}
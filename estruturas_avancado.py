@@ -0,0 +1,376 @@
+# -------
+# - Estruturas de dados da simulação - VERSÃO AVANÇADA
+# - Calendário de eventos e estruturas auxiliares do motor
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import heapq
+import numpy as np
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class CalendarioEventos:
+    """Calendário de eventos baseado num heap binário (ordenado por tempo)"""
+
+    def __init__(self):
+        """
+        Inicializa o calendário vazio
+
+        Cada entrada é (tempo, sequência, tipo, dados). A sequência é um
+        contador crescente que desempata eventos com o mesmo tempo pela
+        ordem de agendamento (o mesmo que uma ordenação estável).
+        """
+        self._heap = []
+        self._sequencia = 0
+
+    def agendar(self, tempo: float, tipo: str, dados: Any = None):
+        """Agenda um evento em O(log n)"""
+        heapq.heappush(self._heap, (tempo, self._sequencia, tipo, dados))
+        self._sequencia += 1
+
+    def proximo(self) -> Tuple[float, str, Any]:
+        """Remove e devolve o próximo evento (tempo, tipo, dados) em O(log n)"""
+        tempo, _, tipo, dados = heapq.heappop(self._heap)
+        return tempo, tipo, dados
+
+    def tempo_proximo(self) -> float:
+        """Tempo do próximo evento (sem o remover)"""
+        return self._heap[0][0]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+
+class SerieTemporal:
+    """Série temporal em escada (tempo, valor) guardada em arrays numpy"""
+
+    def __init__(self, tipo_valor=np.float64, capacidade: int = 1024):
+        """
+        Inicializa a série vazia
+
+        Os arrays são pré-alocados e duplicam de tamanho quando enchem. Só
+        se guardam mudanças de valor: cada ponto vale desde o seu tempo até
+        ao ponto seguinte (degrau 'post').
+
+        Args:
+            tipo_valor: Tipo numpy dos valores (ex.: np.int32 para contagens)
+            capacidade: Capacidade inicial dos arrays
+        """
+        self._tempos = np.empty(capacidade, dtype=np.float64)
+        self._valores = np.empty(capacidade, dtype=tipo_valor)
+        self._tamanho = 0
+        self._ultimo = None
+
+    @classmethod
+    def de_arrays(cls, tempos: np.ndarray, valores: np.ndarray, tipo_valor=np.float64) -> 'SerieTemporal':
+        """Cria a série a partir de arrays de (tempo, valor), mantendo só as mudanças"""
+        valores = np.asarray(valores, dtype=tipo_valor)
+        mudancas = np.ones(len(valores), dtype=bool)
+        mudancas[1:] = valores[1:] != valores[:-1]
+        serie = cls(tipo_valor, max(int(mudancas.sum()), 1))
+        serie._tamanho = int(mudancas.sum())
+        serie._tempos[:serie._tamanho] = np.asarray(tempos, dtype=np.float64)[mudancas]
+        serie._valores[:serie._tamanho] = valores[mudancas]
+        if serie._tamanho:
+            serie._ultimo = serie._valores[serie._tamanho - 1].item()
+        return serie
+
+    def registar(self, tempo: float, valor):
+        """Regista o valor no instante dado, se tiver mudado (O(1) amortizado)"""
+        if valor == self._ultimo:
+            return
+        if self._tamanho == len(self._tempos):
+            capacidade = 2 * len(self._tempos)
+            self._tempos = np.resize(self._tempos, capacidade)
+            self._valores = np.resize(self._valores, capacidade)
+        self._tempos[self._tamanho] = tempo
+        self._valores[self._tamanho] = valor
+        self._tamanho += 1
+        self._ultimo = valor
+
+    @property
+    def tempos(self) -> np.ndarray:
+        """Vista dos instantes registados"""
+        return self._tempos[:self._tamanho]
+
+    @property
+    def valores(self) -> np.ndarray:
+        """Vista dos valores registados"""
+        return self._valores[:self._tamanho]
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __iter__(self) -> Iterator[Tuple[float, Any]]:
+        return zip(self.tempos.tolist(), self.valores.tolist())
+
+
+class Doente:
+    """
+    Registo de um doente durante a simulação
+
+    Usa __slots__ em vez de um dicionário: cada doente ocupa um objeto de
+    tamanho fixo, sem tabela de chaves. Os dados da pessoa (dataset) não
+    são copiados; guarda-se apenas a referência.
+    """
+
+    __slots__ = ('id', 'pessoa', 'prioridade', 'tempo_chegada', 'variavel_consulta',
+                 'tempo_espera', 'tempo_inicio_consulta', 'tempo_consulta', 'na_fila')
+
+    def __init__(self, doente_id: int, prioridade: int, tempo_chegada: float,
+                 variavel_consulta: float, pessoa: Optional[Dict] = None):
+        """
+        Args:
+            doente_id: Número do doente (ordem de chegada)
+            prioridade: Nível de prioridade (1 = mais urgente)
+            tempo_chegada: Instante de chegada
+            variavel_consulta: Variável aleatória da consulta (tirada à chegada)
+            pessoa: Entrada do dataset de pessoas, se usado
+        """
+        self.id = doente_id
+        self.pessoa = pessoa
+        self.prioridade = prioridade
+        self.tempo_chegada = tempo_chegada
+        self.variavel_consulta = variavel_consulta
+        self.tempo_espera = 0.0
+        self.tempo_inicio_consulta = 0.0
+        self.tempo_consulta = 0.0
+        self.na_fila = False
+
+
+class Medico:
+    """Registo de um médico (estado e totais), com __slots__"""
+
+    __slots__ = ('id', 'indice', 'ocupado', 'doente_atual', 'tempo_ocupado', 'inicio_consulta',
+                 'doentes_atendidos', 'em_pausa', 'pausa_pendente', 'fim_pausa', 'ultimo_inicio_pausa')
+
+    def __init__(self, indice: int):
+        """
+        Args:
+            indice: Índice do médico (o identificador é f'm{indice}')
+        """
+        self.id = f'm{indice}'
+        self.indice = indice
+        self.ocupado = False
+        self.doente_atual = None
+        self.tempo_ocupado = 0.0
+        self.inicio_consulta = 0.0
+        self.doentes_atendidos = 0
+        self.em_pausa = False
+        self.pausa_pendente = False
+        self.fim_pausa = 0.0
+        self.ultimo_inicio_pausa = 0.0
+
+    def descartar_totais(self, tempo: float):
+        """
+        Recomeça os totais em 'tempo' (fim do aquecimento): a consulta em
+        curso só conta a parte depois desse instante
+        """
+        self.tempo_ocupado = -(tempo - self.inicio_consulta) if self.ocupado else 0.0
+        self.doentes_atendidos = 0
+
+
+class SalaEspera:
+    """Sala de espera com uma fila FIFO (deque) por nível de prioridade"""
+
+    def __init__(self, num_niveis: int = 5):
+        """
+        Inicializa a sala de espera
+
+        Args:
+            num_niveis: Número de níveis de prioridade (1 = mais urgente)
+        """
+        self._filas = [deque() for _ in range(num_niveis + 1)]  # Índice 0 não usado
+        self._tamanho = 0
+
+    def entrar(self, doente: Doente):
+        """Coloca o doente no fim da fila do seu nível de prioridade em O(1)"""
+        doente.na_fila = True
+        self._filas[doente.prioridade].append(doente)
+        self._tamanho += 1
+
+    def proximo(self) -> Doente:
+        """Remove e devolve o doente mais prioritário (o mais antigo do nível) em O(1)"""
+        for fila in self._filas:
+            while fila:
+                doente = fila.popleft()
+                if doente.na_fila:
+                    doente.na_fila = False
+                    self._tamanho -= 1
+                    return doente
+        raise IndexError('sala de espera vazia')
+
+    def remover(self, doente: Doente):
+        """
+        Remove um doente da sala (ex.: abandono) sem percorrer a fila
+
+        A entrada só é marcada; as entradas marcadas à cabeça da fila do
+        nível são descartadas de imediato. Como os abandonos acontecem por
+        ordem de chegada, o doente que abandona é normalmente a cabeça.
+        """
+        if not doente.na_fila:
+            return
+        doente.na_fila = False
+        self._tamanho -= 1
+        fila = self._filas[doente.prioridade]
+        while fila and not fila[0].na_fila:
+            fila.popleft()
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __bool__(self) -> bool:
+        return self._tamanho > 0
+
+
+class GestorMedicos:
+    """Conjunto de médicos com índice de médicos livres e mapa doente -> médico"""
+
+    # Tipos de evento de calendário tratados pelo gestor
+    MUDANCA_TURNO = 'MUDANCA_TURNO'
+    INICIO_PAUSA = 'INICIO_PAUSA'
+    FIM_PAUSA = 'FIM_PAUSA'
+    EVENTOS = (MUDANCA_TURNO, INICIO_PAUSA, FIM_PAUSA)
+
+    def __init__(self, num_medicos: int, calendario: CalendarioEventos, tempo_simulacao: float,
+                 usar_turnos: bool = False, duracao_turno: float = 240,
+                 usar_pausas: bool = False, duracao_pausa: float = 30, intervalo_pausa: float = 180):
+        """
+        Inicializa os médicos, todos livres no instante 0
+
+        Os médicos disponíveis ficam num heap de índices por turno, para
+        que a procura devolva sempre o de menor índice. As mudanças de
+        turno e as pausas são eventos no calendário da simulação, pelo que
+        a disponibilidade só muda quando o estado muda (não há verificação
+        a cada procura). Só se agendam transições antes do fim da simulação.
+        """
+        self.calendario = calendario
+        self.tempo_simulacao = tempo_simulacao
+        self.usar_turnos = usar_turnos
+        self.duracao_turno = duracao_turno
+        self.usar_pausas = usar_pausas
+        self.duracao_pausa = duracao_pausa
+        self.intervalo_pausa = intervalo_pausa
+
+        self.medicos = [Medico(i) for i in range(num_medicos)]
+
+        # Médicos pares turno 0, ímpares turno 1 (sem turnos todos no 0)
+        self.turno_atual = 0
+        self._livres = [[], []]
+        for i in range(num_medicos):
+            self._livres[self._turno_medico(i)].append(i)
+        # Remoção preguiçosa: índices que ficaram nos heaps de livres mas
+        # cujo médico entrou em pausa (descartados ao chegar ao topo)
+        self._removidos = set()
+        self._medico_do_doente = {}
+        self.num_ocupados = 0
+
+        if self.usar_turnos:
+            self._agendar(self.duracao_turno, self.MUDANCA_TURNO)
+        if self.usar_pausas:
+            for i in range(num_medicos):
+                self._agendar(self.intervalo_pausa, self.INICIO_PAUSA, i)
+
+    def _agendar(self, tempo: float, tipo: str, indice: int = None):
+        """Agenda uma transição, se ainda estiver dentro da simulação"""
+        if tempo < self.tempo_simulacao:
+            self.calendario.agendar(tempo, tipo, indice)
+
+    def _turno_medico(self, indice: int) -> int:
+        """Turno (0 ou 1) a que o médico pertence"""
+        return indice % 2 if self.usar_turnos else 0
+
+    def processar_evento(self, tipo: str, indice: Optional[int], tempo_atual: float):
+        """Aplica uma transição de turno ou de pausa"""
+        if tipo == self.MUDANCA_TURNO:
+            self.turno_atual = 1 - self.turno_atual
+            self._agendar(tempo_atual + self.duracao_turno, self.MUDANCA_TURNO)
+
+        elif tipo == self.INICIO_PAUSA:
+            medico = self.medicos[indice]
+            if medico.ocupado:
+                # Entra em pausa quando terminar a consulta atual
+                medico.pausa_pendente = True
+            else:
+                # Fica no heap marcado como removido (sem remove + heapify, O(n))
+                self._removidos.add(indice)
+                self._iniciar_pausa(medico, tempo_atual)
+
+        elif tipo == self.FIM_PAUSA:
+            medico = self.medicos[indice]
+            medico.em_pausa = False
+            self.disponibilizar(medico)
+            self._agendar(max(medico.ultimo_inicio_pausa + self.intervalo_pausa, tempo_atual),
+                          self.INICIO_PAUSA, indice)
+
+    def _iniciar_pausa(self, medico: Medico, tempo_atual: float):
+        """Coloca um médico livre em pausa e agenda o fim da pausa"""
+        medico.em_pausa = True
+        medico.pausa_pendente = False
+        medico.fim_pausa = tempo_atual + self.duracao_pausa
+        medico.ultimo_inicio_pausa = tempo_atual
+        self.calendario.agendar(medico.fim_pausa, self.FIM_PAUSA, medico.indice)
+
+    def procurar_livre(self) -> Optional[Medico]:
+        """
+        Reserva o médico disponível de menor índice no turno atual
+
+        Returns:
+            O médico reservado (já fora do índice de livres) ou None
+        """
+        livres = self._livres[self.turno_atual]
+        while livres and livres[0] in self._removidos:
+            self._removidos.discard(heapq.heappop(livres))
+        if livres:
+            return self.medicos[heapq.heappop(livres)]
+        return None
+
+    def iniciar_consulta(self, medico: Medico, doente_id: Any, tempo_atual: float):
+        """Atribui o doente a um médico reservado"""
+        medico.ocupado = True
+        medico.doente_atual = doente_id
+        medico.inicio_consulta = tempo_atual
+        self._medico_do_doente[doente_id] = medico
+        self.num_ocupados += 1
+
+    def terminar_consulta(self, doente_id: Any, tempo_atual: float) -> Optional[Medico]:
+        """
+        Termina a consulta do doente e devolve o seu médico
+
+        O médico volta ao índice de livres, ou entra em pausa se tinha uma
+        pausa pendente.
+        """
+        medico = self._medico_do_doente.pop(doente_id, None)
+        if medico is None:
+            return None
+
+        medico.tempo_ocupado += tempo_atual - medico.inicio_consulta
+        medico.doentes_atendidos += 1
+        medico.ocupado = False
+        medico.doente_atual = None
+        self.num_ocupados -= 1
+
+        if medico.pausa_pendente:
+            self._iniciar_pausa(medico, tempo_atual)
+        else:
+            self.disponibilizar(medico)
+        return medico
+
+    def disponibilizar(self, medico: Medico):
+        """
+        Devolve um médico livre ao índice de livres
+
+        Se a entrada antiga ainda está no heap (pausa sem nenhuma procura
+        pelo meio), basta desmarcá-la.
+        """
+        indice = medico.indice
+        if indice in self._removidos:
+            self._removidos.discard(indice)
+        else:
+            heapq.heappush(self._livres[self._turno_medico(indice)], indice)
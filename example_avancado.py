@@ -8,6 +8,7 @@
 
 from sim_module_avancado import Simulacao
 from analysis_avancado import AnalisadorResultados, analise_comparativa_taxa_chegada, plot_analise_comparativa
+from replicacao_avancado import executar_replicacoes, replicacoes_sequenciais, ESTIMADORES
 
 
 def exemplo_basico():
@@ -264,6 +265,55 @@ def exemplo_analise_comparativa():
     plot_analise_comparativa(resultados_comp)
 
 
+def exemplo_replicacoes():
+    """Exemplo 8: Réplicas com intervalos de confiança"""
+    print("\n" + "="*70)
+    print("EXEMPLO 8: Replicas Independentes com Intervalos de Confianca")
+    print("="*70)
+    
+    config = {
+        'num_medicos': 4,
+        'taxa_chegada': 15 / 60.0,
+        'tempo_medio_consulta': 15,
+        'tempo_simulacao': 1440,
+        'distribuicao': 'uniform',
+        'usar_pessoas_reais': False,
+        'usar_triagem': True,
+        'tempo_max_espera': 90,
+        'usar_turnos': False,
+        'usar_pausas': False,
+        'chegadas_nao_homogeneas': True
+    }
+    
+    print("Executando 50 replicas em paralelo...")
+    replicas = executar_replicacoes(config, 50, seed=2025)
+    
+    print(f"\n{'Metrica':<32} | {'Media':>9} | {'Desvio':>8} | {'IC 95%':>21}")
+    print("-" * 80)
+    for nome, resumo in replicas['resumo'].items():
+        ic_min, ic_max = resumo['ic']
+        print(f"{nome:<32} | {resumo['media']:>9.2f} | {resumo['desvio_padrao']:>8.2f} | [{ic_min:>8.2f}, {ic_max:>8.2f}]")
+    
+    print("\nMesmas 50 simulacoes com estimadores de reducao de variancia:")
+    print(f"\n{'Estimador':<20} | {'Metrica':<20} | {'Media':>9} | {'+-':>7} | {'Reducao':>8}")
+    print("-" * 76)
+    for estimador in ESTIMADORES:
+        replicas = executar_replicacoes(config, 50, seed=2025, estimador=estimador,
+                                        metricas=['tempo_medio_espera', 'taxa_abandono'])
+        for nome, resumo in replicas['resumo'].items():
+            reducao = resumo.get('reducao_variancia', 1.0)
+            print(f"{estimador:<20} | {nome:<20} | {resumo['media']:>9.2f} | {resumo['semi_amplitude']:>7.2f} | {reducao:>7.2f}x")
+    
+    print("\nReplicas ate +-5% em todas as metricas (maximo 500 replicas)...")
+    sequenciais = replicacoes_sequenciais(config, ['tempo_medio_espera', 'taxa_abandono', 'tempo_medio_por_prioridade.3'],
+                                          precisao_relativa=0.05, seed=2025, max_replicacoes=500)
+    lotes = ', '.join(str(lote['num_replicacoes']) for lote in sequenciais['lotes'])
+    print(f"Paragem: {sequenciais['motivo']} apos {sequenciais['num_replicacoes']} replicas (lotes: {lotes})")
+    for nome, resumo in sequenciais['resumo'].items():
+        estado = "ok" if sequenciais['atingidas'][nome] else "por atingir"
+        print(f"{nome:<32} | {resumo['media']:>9.2f} +- {resumo['semi_amplitude']:>6.2f} (alvo {sequenciais['alvos'][nome]:.2f}, {estado})")
+
+
 def menu_principal():
     """Menu interativo"""
     print("\n" + "="*70)
@@ -277,12 +327,13 @@ def menu_principal():
     print("5. Simulacao COMPLETA (Tudo ativado)")
     print("6. Gerar Todos os Graficos Premium")
     print("7. Analise Comparativa")
-    print("8. Executar TODOS os Exemplos")
+    print("8. Replicas com Intervalos de Confianca")
+    print("9. Executar TODOS os Exemplos")
     print("0. Sair")
     
     running = True
     while running:
-        escolha = input("\nEscolha (0-8): ").strip()
+        escolha = input("\nEscolha (0-9): ").strip()
         
         if escolha == '1':
             exemplo_basico()
@@ -299,6 +350,8 @@ def menu_principal():
         elif escolha == '7':
             exemplo_analise_comparativa()
         elif escolha == '8':
+            exemplo_replicacoes()
+        elif escolha == '9':
             exemplo_basico()
             exemplo_triagem()
             exemplo_turnos_pausas()
@@ -306,6 +359,7 @@ def menu_principal():
             exemplo_completo()
             exemplo_graficos_completo()
             exemplo_analise_comparativa()
+            exemplo_replicacoes()
         elif escolha == '0':
             print("\nAte breve!")
             running = False
@@ -6,9 +6,20 @@
 # - 2025-11-19 by Leticia, Maria, Matilde
 # -------
 
+import os
 import PySimpleGUI as sg
 from sim_module_avancado import Simulacao
 from analysis_avancado import AnalisadorResultados, analise_comparativa_taxa_chegada, plot_analise_comparativa
+from analysis_avancado import gerar_relatorio_comparacao
+from replicacao_avancado import comparar_cenarios
+
+# Replicas emparelhadas (base e cenario) de cada analise What-If
+REPLICAS_WHATIF = 10
+
+
+def trabalhadores_whatif():
+    """Processos das analises What-If: todos os nucleos menos um, livre para a janela"""
+    return max(1, (os.cpu_count() or 1) - 1)
 
 
 class InterfaceClinica:
@@ -20,6 +31,7 @@ class InterfaceClinica:
         self.resultados = None
         self.window = None
         self.config_base = None
+        self.whatif_em_curso = False
     
     def criar_layout(self):
         """Cria o layout da interface com todas as funcionalidades"""
@@ -203,9 +215,14 @@ class InterfaceClinica:
         if not self.config_base:
             sg.popup('Execute uma simulacao primeiro!', title='Aviso')
             return
+        if self.whatif_em_curso:
+            sg.popup('Ja ha uma analise What-If em curso!', title='Aviso')
+            return
         
         config = self.config_base.copy()
         
+        # Cada cenario e comparado com o base em replicas emparelhadas (os
+        # mesmos doentes nos dois), para que a diferenca nao seja so ruido
         if tipo == 'medico+1':
             config['num_medicos'] += 1
             titulo = f"WHAT-IF: +1 Medico ({config['num_medicos']} medicos)"
@@ -227,16 +244,27 @@ class InterfaceClinica:
         
         self.atualizar_output(f"\n{'='*60}\n{titulo}\n{'='*60}\n\n")
         
+        # As replicas correm numa thread (com o seu pool de processos), para
+        # que a janela continue a responder; o progresso e o fim chegam ao
+        # ciclo principal como eventos
         def callback_progresso(p):
-            self.atualizar_progresso(p)
-            self.window.refresh()
-        
-        sim = Simulacao(config)
-        resultados = sim.simular(callback_progresso=callback_progresso)
+            self.window.write_event_value('-WHATIF-PROGRESSO-', p)
         
-        analisador = AnalisadorResultados(resultados)
-        relatorio = analisador.gerar_relatorio_texto()
-        self.adicionar_output(relatorio)
+        alteracoes = {chave: valor for chave, valor in config.items() if self.config_base.get(chave) != valor}
+        config_base = self.config_base.copy()
+        self.whatif_em_curso = True
+        self.atualizar_progresso(0)
+        self.window.perform_long_operation(
+            lambda: comparar_cenarios(config_base, {titulo: alteracoes}, REPLICAS_WHATIF,
+                                      max_workers=trabalhadores_whatif(),
+                                      callback_progresso=callback_progresso),
+            '-WHATIF-FIM-')
+    
+    def concluir_whatif(self, comparacao):
+        """Mostra o relatorio de uma comparacao What-If terminada"""
+        self.whatif_em_curso = False
+        self.adicionar_output(gerar_relatorio_comparacao(comparacao))
+        self.atualizar_progresso(100)
     
     def executar(self):
         """Executa o loop principal da interface"""
@@ -271,6 +299,12 @@ class InterfaceClinica:
             elif event == 'E se taxa de chegada -50%?':
                 self.executar_whatif('taxa-50', values)
             
+            elif event == '-WHATIF-PROGRESSO-':
+                self.atualizar_progresso(values[event])
+            
+            elif event == '-WHATIF-FIM-':
+                self.concluir_whatif(values[event])
+            
             elif event == 'Evolucao da Fila':
                 if self.resultados:
                     analisador = AnalisadorResultados(self.resultados)
@@ -0,0 +1,496 @@
+# -------
+# - Motor rápido FIFO - VERSÃO AVANÇADA
+# - Recursão de Kiefer-Wolfowitz para filas G/G/c sem triagem, turnos nem pausas
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import heapq
+import numpy as np
+from typing import Dict, List, Tuple, Union
+from aleatorio_avancado import FonteAleatoria, FonteAleatoriaLote
+from estruturas_avancado import SerieTemporal, Medico
+from estatisticas_avancado import HistogramaLog, MediasLotes, MediasLotesTempo
+
+# Fontes das réplicas do motor em lote: uma FonteAleatoria por réplica, ou
+# um bloco com os fluxos de todas
+Fontes = Union[List[FonteAleatoria], FonteAleatoriaLote]
+
+
+def _tempo_ocupado_janela(inicios: np.ndarray, saidas: np.ndarray, inicio_janela: float) -> np.ndarray:
+    """Parte de cada consulta (inicio, saida) depois do aquecimento"""
+    return np.maximum(saidas - np.maximum(inicios, inicio_janela), 0.0)
+
+
+def _contar_por_linha(instantes: np.ndarray, marcas: List[Tuple[np.ndarray, np.ndarray, int, bool]]) -> np.ndarray:
+    """
+    Soma dos pesos das marcas da mesma réplica até cada instante
+
+    instantes e os valores das marcas são arrays (R, n) preenchidos com
+    infinito, com os instantes ordenados em cada linha; cada marca é
+    (mascara, valores, peso, inclusiva). As inclusivas contam no próprio
+    instante (searchsorted side='right') e as outras só depois
+    (side='left'), com uma ordenação estável por linha (marcas inclusivas,
+    instantes, marcas estritas) para todas de uma vez. Como os instantes já
+    estão ordenados, ficam pela mesma ordem depois de juntar e basta
+    escolher as suas posições.
+    """
+    inclusivas = [m for m in marcas if m[3]]
+    estritas = [m for m in marcas if not m[3]]
+    colunas = ([np.where(mascara, valores, np.inf) for mascara, valores, _, _ in inclusivas] + [instantes]
+               + [np.where(mascara, valores, np.inf) for mascara, valores, _, _ in estritas])
+    pesos = ([np.where(mascara, peso, 0) for mascara, _, peso, _ in inclusivas] + [np.zeros(instantes.shape, dtype=int)]
+             + [np.where(mascara, peso, 0) for mascara, _, peso, _ in estritas])
+    ordem = np.argsort(np.concatenate(colunas, axis=1), axis=1, kind='stable')
+    acumulado = np.cumsum(np.take_along_axis(np.concatenate(pesos, axis=1), ordem, axis=1), axis=1)
+    inicio = sum(m[1].shape[1] for m in inclusivas)
+    dos_instantes = (ordem >= inicio) & (ordem < inicio + instantes.shape[1])
+    return acumulado[dos_instantes].reshape(instantes.shape)
+
+
+def _medias_temporais_lote(instantes: np.ndarray, valores_depois: np.ndarray, duracoes: np.ndarray,
+                           inicio: float = 0.0) -> np.ndarray:
+    """
+    _media_temporal de cada réplica, com os instantes (R, n) ordenados em
+    cada linha e preenchidos com infinito
+    """
+    finitos = np.isfinite(instantes)
+    tempos = np.where(finitos, np.maximum(instantes, inicio), duracoes[:, None])
+    seguintes = np.concatenate((tempos[:, 1:], duracoes[:, None]), axis=1)
+    area = np.where(finitos, valores_depois * (seguintes - tempos), 0.0).sum(axis=1)
+    return area / (duracoes - inicio)
+
+
+def _amostras_lote(fontes: Fontes, tempo_simulacao: float, tempo_medio_consulta: float) -> Dict[str, np.ndarray]:
+    """
+    Chegadas e tempos de consulta das réplicas em arrays (R, max. chegadas)
+
+    As réplicas com menos chegadas são preenchidas com chegadas em infinito
+    (e consultas nulas). Com uma FonteAleatoriaLote os fluxos de todas as
+    réplicas saem de um só bloco, sem ciclo por réplica; com uma lista de
+    FonteAleatoria cada réplica tira os seus, pela ordem de simular_fifo.
+    """
+    if isinstance(fontes, FonteAleatoriaLote):
+        chegadas, num_chegadas = fontes.tempos_chegada(tempo_simulacao)
+        validas = np.isfinite(chegadas)
+        variaveis = np.where(validas, fontes.variaveis_consulta(chegadas.shape[1]), 0.0)
+        consultas = np.where(validas, fontes.tempos_consulta(tempo_medio_consulta, variaveis), 0.0)
+        media_variavel_consulta = variaveis.sum(axis=1) / np.maximum(num_chegadas, 1)
+    else:
+        listas_chegadas = [fonte.tempos_chegada(tempo_simulacao) for fonte in fontes]
+        num_chegadas = np.array([len(lista) for lista in listas_chegadas], dtype=int)
+        maximo = int(num_chegadas.max(initial=0))
+        chegadas = np.full((len(fontes), maximo), np.inf)
+        consultas = np.zeros((len(fontes), maximo))
+        for r, fonte in enumerate(fontes):
+            n = num_chegadas[r]
+            chegadas[r, :n] = listas_chegadas[r]
+            consultas[r, :n] = fonte.tempos_consulta(tempo_medio_consulta, fonte.variaveis_consulta(n))
+        media_variavel_consulta = np.array([fonte.media_variaveis_consulta() for fonte in fontes])
+    return {
+        'chegadas': chegadas,
+        'consultas': consultas,
+        'num_chegadas': num_chegadas,
+        'media_variavel_consulta': media_variavel_consulta
+    }
+
+
+def simular_fifo(aleatorio: FonteAleatoria, num_medicos: int, tempo_simulacao: float,
+                 tempo_medio_consulta: float, tempo_max_espera: float,
+                 guardar_historico: bool = True, periodo_aquecimento: float = 0.0,
+                 medias_lotes: bool = False) -> Tuple[Dict, List[Medico]]:
+    """
+    Simula a clínica como uma fila FIFO com num_medicos servidores
+
+    Sem triagem, turnos nem pausas o modelo é uma fila G/G/c, e os inícios
+    de consulta seguem a recursão de Kiefer-Wolfowitz sobre os tempos em
+    que cada médico fica livre, sem calendário de eventos. Consome os
+    mesmos fluxos aleatórios pela mesma ordem que o motor de eventos e
+    aplica a mesma regra de abandono (o doente desiste se o médico só
+    ficaria livre mais de tempo_max_espera depois da chegada), pelo que
+    reproduz os mesmos resultados. Os resultados saem dos arrays por
+    doente pelas mesmas funções vetorizadas que o motor em lote (uma
+    réplica): históricos da fila e da ocupação (só se guardar_historico),
+    estatísticas sem o aquecimento como no motor de eventos e, com
+    medias_lotes, os lotes construídos no fim a partir dos arrays.
+
+    A recursão é sequencial (o início de cada consulta depende dos
+    instantes em que os médicos ficam livres depois do doente anterior),
+    pelo que numa só simulação continua a ser um ciclo Python sobre as
+    chegadas, com heaps; o numpy só a vetoriza ao longo das réplicas
+    (motor em lote). Numa só simulação o ganho fica por isso abaixo dos
+    10-100x pretendidos: medido com benchmark_motor_rapido, 5-8x com 10
+    médicos (1 a 16 dias) e 6x com 30 médicos em 20 000 min (0,59 s
+    contra 0,10 s; 7x sem histórico). Os ganhos maiores, em réplicas e
+    varrimentos, vêm do motor em lote.
+
+    Returns:
+        Resultados no esquema de Simulacao (só os campos preenchidos pelo
+        ciclo de eventos) e a lista de médicos com tempo_ocupado e
+        doentes_atendidos
+    """
+    amostras = _amostras_lote([aleatorio], tempo_simulacao, tempo_medio_consulta)
+    n = int(amostras['num_chegadas'][0])
+    lista_consultas = amostras['consultas'][0].tolist()
+
+    # Kiefer-Wolfowitz: heap dos instantes em que cada médico ocupado fica
+    # livre, e heap de índices dos livres (escolhe-se o de menor índice)
+    heappush, heappop = heapq.heappush, heapq.heappop
+    livres = list(range(num_medicos))
+    ocupados = []
+    inicios = [0.0] * n
+    saidas = [0.0] * n
+    medico_atribuido = [-1] * n  # -1 = abandonou
+    esperou = [False] * n
+    for i, chegada in enumerate(amostras['chegadas'][0].tolist()):
+        while ocupados and ocupados[0][0] <= chegada:
+            heappush(livres, heappop(ocupados)[1])
+
+        if livres:
+            indice = heappop(livres)
+            inicio = chegada
+        else:
+            esperou[i] = True
+            if ocupados[0][0] - chegada > tempo_max_espera:
+                # Abandona antes de haver médico livre
+                continue
+            inicio, indice = heappop(ocupados)
+
+        saida = inicio + lista_consultas[i]
+        heappush(ocupados, (saida, indice))
+        inicios[i] = inicio
+        saidas[i] = saida
+        medico_atribuido[i] = indice
+
+    lote = dict(amostras, inicios=np.array([inicios], dtype=float), saidas=np.array([saidas], dtype=float),
+                medico_atribuido=np.array([medico_atribuido], dtype=int), esperou=np.array([esperou], dtype=bool))
+    return _resultados_lote(lote, num_medicos, tempo_simulacao, tempo_max_espera, guardar_historico,
+                            periodo_aquecimento, medias_lotes)[0]
+
+
+def _recursao_fifo_lote(amostras: Dict[str, np.ndarray], num_medicos: int,
+                        tempo_max_espera: float) -> Dict[str, np.ndarray]:
+    """
+    Recursão de Kiefer-Wolfowitz de várias réplicas em simultâneo
+
+    O estado de todas as réplicas (instante em que cada médico fica livre)
+    é um array (R, num_medicos) e cada passo avança a k-ésima chegada de
+    todas as réplicas de uma vez, pelo que o custo em Python depende do
+    número de chegadas por réplica e não do número de réplicas.
+
+    Args:
+        amostras: Chegadas e consultas das réplicas (ver _amostras_lote)
+
+    Returns:
+        As amostras e os arrays (R, max. chegadas) por doente pela ordem de
+        chegada: inicios, saidas, medico_atribuido (-1 = abandonou) e esperou
+    """
+    chegadas, consultas, num_chegadas = amostras['chegadas'], amostras['consultas'], amostras['num_chegadas']
+    num_replicas, maximo = chegadas.shape
+
+    livre_ate = np.zeros((num_replicas, num_medicos))
+    inicios = np.zeros((num_replicas, maximo))
+    saidas = np.zeros((num_replicas, maximo))
+    medico_atribuido = np.full((num_replicas, maximo), -1)
+    esperou = np.zeros((num_replicas, maximo), dtype=bool)
+    linhas = np.arange(num_replicas)
+    for k in range(maximo):
+        chegada = chegadas[:, k]
+        ativa = k < num_chegadas
+
+        # Médico livre de menor índice, ou o primeiro a ficar livre
+        livres = livre_ate <= chegada[:, None]
+        tem_livre = livres.any(axis=1)
+        primeiro_livre = livre_ate.argmin(axis=1)
+        indice = np.where(tem_livre, livres.argmax(axis=1), primeiro_livre)
+        inicio = np.where(tem_livre, chegada, livre_ate[linhas, primeiro_livre])
+
+        with np.errstate(invalid='ignore'):  # réplicas já sem chegadas (inf - inf)
+            abandona = ~tem_livre & (inicio - chegada > tempo_max_espera)
+        atendida = ativa & ~abandona
+        saida = inicio + consultas[:, k]
+        livre_ate[linhas[atendida], indice[atendida]] = saida[atendida]
+
+        inicios[:, k] = inicio
+        saidas[:, k] = saida
+        medico_atribuido[:, k] = np.where(atendida, indice, -1)
+        esperou[:, k] = ativa & ~tem_livre
+
+    return dict(amostras, inicios=inicios, saidas=saidas, medico_atribuido=medico_atribuido, esperou=esperou)
+
+
+def _estatisticas_lote(lote: Dict[str, np.ndarray], num_medicos: int, tempo_simulacao: float,
+                       tempo_max_espera: float, periodo_aquecimento: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Estatísticas de todas as réplicas a partir dos arrays (R, n) por doente
+
+    Comuns a metricas_fifo_lote e _resultados_lote: contagens, totais por
+    médico, eventos ordenados em cada linha, fila e ocupação depois de
+    cada evento e as respetivas médias, tudo sobre o eixo das réplicas.
+    Só os doentes chegados depois do aquecimento contam nas estatísticas
+    por doente.
+    """
+    chegadas, inicios, saidas = lote['chegadas'], lote['inicios'], lote['saidas']
+    num_replicas = chegadas.shape[0]
+    atendido = lote['medico_atribuido'] >= 0
+    esperou = lote['esperou']
+    abandonou = esperou & ~atendido
+    medido = chegadas >= periodo_aquecimento
+    atendido_medido = atendido & medido
+
+    # Totais por médico depois do aquecimento: bincount sobre (réplica,
+    # médico) soma pela ordem das consultas de cada um
+    posicoes = (np.arange(num_replicas)[:, None] * num_medicos + lote['medico_atribuido'])[atendido]
+    forma = (num_replicas, num_medicos)
+    tempo_ocupado = np.bincount(posicoes, weights=_tempo_ocupado_janela(inicios[atendido], saidas[atendido],
+                                                                        periodo_aquecimento),
+                                minlength=num_replicas * num_medicos).reshape(forma)
+    atendidos_medico = np.bincount(posicoes[saidas[atendido] >= periodo_aquecimento],
+                                   minlength=num_replicas * num_medicos).reshape(forma)
+
+    # Fila e ocupação ao longo do tempo: instantes dos eventos (chegadas e
+    # saídas) ordenados em cada linha
+    prazos = chegadas + tempo_max_espera
+    eventos = np.sort(np.concatenate((chegadas, np.where(atendido, saidas, np.inf)), axis=1), axis=1)
+    finitos = np.isfinite(eventos)
+    duracoes = np.maximum(np.max(np.where(finitos, eventos, 0.0), axis=1, initial=0.0), tempo_simulacao)
+
+    fila_depois = _contar_por_linha(eventos, [(esperou, chegadas, 1, True),
+                                              (esperou & atendido, inicios, -1, True),
+                                              (abandonou, prazos, -1, False)])
+    ocupados_depois = _contar_por_linha(eventos, [(atendido, inicios, 1, True),
+                                                  (atendido, saidas, -1, True)])
+
+    # Estado antes de cada evento (intervalos (chegada, fim] na fila)
+    intervalos_fila = [(esperou, chegadas, 1, False),
+                       (esperou, np.where(atendido, inicios, prazos), -1, False)]
+    medidos = finitos & (eventos >= periodo_aquecimento)
+    num_medidos = medidos.sum(axis=1)
+    fila_antes = np.where(medidos, _contar_por_linha(eventos, intervalos_fila), 0).sum(axis=1)
+    # Entradas na fila depois do aquecimento (ordenadas, para _contar_por_linha)
+    chegadas_fila = np.sort(np.where(esperou & medido, chegadas, np.inf), axis=1)
+
+    return {
+        'atendido_medido': atendido_medido,
+        'num_atendidos': atendido_medido.sum(axis=1),
+        'num_abandonos': (abandonou & medido).sum(axis=1),
+        'tempo_ocupado': tempo_ocupado,
+        'atendidos_medico': atendidos_medico,
+        'eventos': eventos,
+        'num_eventos': finitos.sum(axis=1),
+        'duracoes': duracoes,
+        'fila_depois': fila_depois,
+        'ocupados_depois': ocupados_depois,
+        'tamanho_medio_fila': _medias_temporais_lote(eventos, fila_depois, duracoes, periodo_aquecimento),
+        'ocupacao_media_tempo': (_medias_temporais_lote(eventos, ocupados_depois, duracoes, periodo_aquecimento)
+                                 / num_medicos * 100),
+        'tamanho_medio_fila_eventos': np.where(num_medidos > 0, fila_antes / np.maximum(num_medidos, 1), 0.0),
+        'max_fila': np.max(np.where(np.isfinite(chegadas_fila), _contar_por_linha(chegadas_fila, intervalos_fila) + 1, 0),
+                           axis=1, initial=0)
+    }
+
+
+def simular_fifo_lote(fontes: Fontes, num_medicos: int, tempo_simulacao: float,
+                      tempo_medio_consulta: float, tempo_max_espera: float,
+                      guardar_historico: bool = True, periodo_aquecimento: float = 0.0,
+                      medias_lotes: bool = False) -> List[Tuple[Dict, List[Medico]]]:
+    """
+    Simula várias réplicas FIFO em simultâneo, ao longo de um eixo numpy
+
+    Com uma lista de FonteAleatoria cada réplica dá o mesmo que
+    simular_fifo com a sua fonte; com uma FonteAleatoriaLote as amostras
+    de todas as réplicas saem de um só bloco.
+
+    Args:
+        fontes: Uma fonte aleatória por réplica, ou o bloco de todas
+
+    Returns:
+        Para cada réplica, o mesmo que simular_fifo
+    """
+    lote = _recursao_fifo_lote(_amostras_lote(fontes, tempo_simulacao, tempo_medio_consulta),
+                               num_medicos, tempo_max_espera)
+    return _resultados_lote(lote, num_medicos, tempo_simulacao, tempo_max_espera, guardar_historico,
+                            periodo_aquecimento, medias_lotes)
+
+
+def metricas_fifo_lote(fontes: Fontes, num_medicos: int, tempo_simulacao: float,
+                       tempo_medio_consulta: float, tempo_max_espera: float,
+                       periodo_aquecimento: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Métricas agregadas de várias réplicas FIFO, empilhadas em arrays (R,)
+
+    Não constrói os históricos nem as listas por doente: as médias saem
+    diretamente dos arrays do lote. Coincidem com as de simular_fifo a
+    menos de arredondamentos (as somas são feitas por outra ordem).
+
+    Com uma FonteAleatoriaLote não há nenhum ciclo Python sobre as
+    réplicas: as amostras saem de um bloco (R, n) e a recursão e as
+    estatísticas correm sobre o eixo das réplicas. O custo continua a
+    crescer com R, mas só nas operações numpy (sobretudo as ordenações por
+    linha de _contar_por_linha): medido com benchmark_motor_lote, cerca de
+    0,33 ms por réplica de 480 min com 10 médicos, contra 0,51 ms com uma
+    FonteAleatoria por réplica e 1,7 ms a simular uma a uma.
+
+    Returns:
+        Dicionário com os nomes das métricas (os de extrair_metrica) e um
+        array com o valor de cada réplica
+    """
+    lote = _recursao_fifo_lote(_amostras_lote(fontes, tempo_simulacao, tempo_medio_consulta),
+                               num_medicos, tempo_max_espera)
+    estatisticas = _estatisticas_lote(lote, num_medicos, tempo_simulacao, tempo_max_espera, periodo_aquecimento)
+    chegadas = lote['chegadas']
+    atendido_medido = estatisticas['atendido_medido']
+    num_atendidos = estatisticas['num_atendidos']
+    num_abandonos = estatisticas['num_abandonos']
+
+    divisor = np.maximum(num_atendidos, 1)
+    with np.errstate(invalid='ignore'):
+        tempo_medio_espera = np.where(atendido_medido, lote['inicios'] - chegadas, 0.0).sum(axis=1) / divisor
+        tempo_medio_clinica = np.where(atendido_medido, lote['saidas'] - chegadas, 0.0).sum(axis=1) / divisor
+    tempo_medio_consulta_real = np.where(atendido_medido, lote['consultas'], 0.0).sum(axis=1) / divisor
+
+    total = num_atendidos + num_abandonos
+    taxa_abandono = np.where(total > 0, num_abandonos / np.maximum(total, 1) * 100, 0.0)
+
+    horizonte = tempo_simulacao - periodo_aquecimento
+    ocupacoes = np.minimum(np.minimum(estatisticas['tempo_ocupado'], horizonte) / horizonte * 100, 100.0)
+
+    metricas = {
+        'doentes_atendidos': num_atendidos.astype(float),
+        'doentes_abandonaram': num_abandonos.astype(float),
+        'tempo_medio_espera': tempo_medio_espera,
+        'tempo_medio_consulta': tempo_medio_consulta_real,
+        'tempo_medio_clinica': tempo_medio_clinica,
+        'taxa_abandono': taxa_abandono,
+        'max_fila': estatisticas['max_fila'].astype(float),
+        'tamanho_medio_fila': estatisticas['tamanho_medio_fila'],
+        'tamanho_medio_fila_eventos': estatisticas['tamanho_medio_fila_eventos'],
+        'ocupacao_media_medicos': ocupacoes.mean(axis=1),
+        'ocupacao_media_tempo': estatisticas['ocupacao_media_tempo'],
+        # Variáveis de controlo (ver estimador_controlo)
+        'num_chegadas': lote['num_chegadas'].astype(float),
+        'media_variavel_consulta': lote['media_variavel_consulta']
+    }
+    # Sem triagem todos os doentes são Verde (prioridade 4)
+    for prioridade in range(1, 6):
+        metricas[f'tempo_medio_por_prioridade.{prioridade}'] = (
+            tempo_medio_espera if prioridade == 4 else np.zeros(len(chegadas)))
+    return metricas
+
+
+def _resultados_lote(lote: Dict[str, np.ndarray], num_medicos: int, tempo_simulacao: float,
+                     tempo_max_espera: float, guardar_historico: bool = True,
+                     periodo_aquecimento: float = 0.0, medias_lotes: bool = False) -> List[Tuple[Dict, List[Medico]]]:
+    """
+    Resultados de cada réplica FIFO a partir dos arrays (R, n) por doente
+
+    Os arrays seguem a ordem de chegada; medico_atribuido é -1 para quem
+    abandonou, e inicios/saidas só contam para os atendidos. As contas
+    (ordem das saídas, somas, contagens dos histogramas, séries) são feitas
+    para todas as réplicas de uma vez; o ciclo final só corta as linhas e
+    cria os objetos de cada réplica (listas, séries, histogramas, médicos).
+    """
+    estatisticas = _estatisticas_lote(lote, num_medicos, tempo_simulacao, tempo_max_espera, periodo_aquecimento)
+    chegadas = lote['chegadas']
+    num_replicas, maximo = chegadas.shape
+    atendido_medido = estatisticas['atendido_medido']
+    num_atendidos = estatisticas['num_atendidos']
+
+    # Tempos por doente pela ordem das saídas (a ordem do motor de
+    # eventos), com os restantes no fim de cada linha
+    ordem = np.argsort(np.where(atendido_medido, lote['saidas'], np.inf), axis=1, kind='stable')
+    validos = np.arange(maximo) < num_atendidos[:, None]
+    with np.errstate(invalid='ignore'):
+        tempos = {
+            'espera': lote['inicios'] - chegadas,
+            'consulta': lote['consultas'],
+            'clinica': lote['saidas'] - chegadas
+        }
+    tempos = {nome: np.take_along_axis(np.where(atendido_medido, valores, 0.0), ordem, axis=1)
+              for nome, valores in tempos.items()}
+    # Somas sequenciais (cumsum), pela mesma ordem que somar as listas
+    totais = {nome: np.cumsum(valores, axis=1)[:, -1] if maximo else np.zeros(num_replicas)
+              for nome, valores in tempos.items()}
+
+    # Contagens dos histogramas de todas as réplicas num só bincount
+    modelo = HistogramaLog()
+    deslocamentos = np.arange(num_replicas)[:, None] * modelo.num_classes
+    histogramas = {}
+    for nome, valores in tempos.items():
+        contagens = np.bincount((deslocamentos + modelo.indices(valores))[validos],
+                                minlength=num_replicas * modelo.num_classes)
+        histogramas[nome] = (contagens.reshape(num_replicas, modelo.num_classes),
+                             np.where(validos, valores, np.inf).min(axis=1, initial=np.inf).tolist(),
+                             np.where(validos, valores, -np.inf).max(axis=1, initial=-np.inf).tolist())
+
+    # Séries em escada a partir de (0, 0)
+    eventos = estatisticas['eventos']
+    fila_depois = estatisticas['fila_depois']
+    if guardar_historico:
+        zeros = np.zeros((num_replicas, 1))
+        tempos_series = np.concatenate((zeros, eventos), axis=1)
+        valores_fila = np.concatenate((zeros, fila_depois), axis=1)
+        valores_ocupacao = np.concatenate((zeros, (estatisticas['ocupados_depois'] / num_medicos) * 100), axis=1)
+
+    tempo_ocupado = estatisticas['tempo_ocupado'].tolist()
+    atendidos_medico = estatisticas['atendidos_medico'].tolist()
+    escalares = {nome: estatisticas[nome].tolist()
+                           for nome in ('num_atendidos', 'num_abandonos', 'num_eventos', 'max_fila',
+                                        'tamanho_medio_fila', 'tamanho_medio_fila_eventos',
+                                        'ocupacao_media_tempo', 'duracoes')}
+    num_chegadas = lote['num_chegadas'].tolist()
+    media_variavel_consulta = lote['media_variavel_consulta'].tolist()
+    totais = {nome: valores.tolist() for nome, valores in totais.items()}
+
+    resultados = []
+    for r in range(num_replicas):
+        k = escalares['num_atendidos'][r]
+        e = escalares['num_eventos'][r]
+        medicos = [Medico(i) for i in range(num_medicos)]
+        for medico in medicos:
+            medico.tempo_ocupado = tempo_ocupado[r][medico.indice]
+            medico.doentes_atendidos = atendidos_medico[r][medico.indice]
+
+        if guardar_historico:
+            historico_fila = SerieTemporal.de_arrays(tempos_series[r, :e + 1], valores_fila[r, :e + 1], np.int32)
+            historico_ocupacao = SerieTemporal.de_arrays(tempos_series[r, :e + 1], valores_ocupacao[r, :e + 1])
+        else:
+            historico_fila = SerieTemporal(np.int32)
+            historico_ocupacao = SerieTemporal(np.float64)
+
+        distribuicoes = {nome: HistogramaLog.de_contagens(contagens[r], totais[nome][r], minimos[r], maximos[r])
+                         for nome, (contagens, minimos, maximos) in histogramas.items()}
+        individuais = {nome: valores[r, :k].tolist() if guardar_historico else []
+                       for nome, valores in tempos.items()}
+
+        parciais = {
+            'doentes_atendidos': k,
+            'doentes_abandonaram': escalares['num_abandonos'][r],
+            'tempo_total_espera': totais['espera'][r],
+            'tempo_total_consulta': totais['consulta'][r],
+            'tempo_total_clinica': totais['clinica'][r],
+            'max_fila': escalares['max_fila'][r],
+            'historico_fila': historico_fila,
+            'historico_ocupacao': historico_ocupacao,
+            'tamanho_medio_fila': escalares['tamanho_medio_fila'][r],
+            'tamanho_medio_fila_eventos': escalares['tamanho_medio_fila_eventos'][r],
+            'ocupacao_media_tempo': escalares['ocupacao_media_tempo'][r],
+            'tempos_espera_individuais': individuais['espera'],
+            'tempos_consulta_individuais': individuais['consulta'],
+            'tempos_clinica_individuais': individuais['clinica'],
+            'distribuicoes': distribuicoes,
+            'num_chegadas': num_chegadas[r],
+            'eventos_processados': e,
+            'media_variavel_consulta': media_variavel_consulta[r]
+        }
+        if medias_lotes:
+            # O mesmo estado que os lotes em fluxo do motor de eventos
+            parciais['lotes'] = {
+                'espera': MediasLotes.de_valores(tempos['espera'][r, :k]),
+                'clinica': MediasLotes.de_valores(tempos['clinica'][r, :k]),
+                'fila': MediasLotesTempo.de_serie(eventos[r, :e], fila_depois[r, :e],
+                                                  escalares['duracoes'][r], periodo_aquecimento)
+            }
+        resultados.append((parciais, medicos))
+    return resultados
@@ -0,0 +1,814 @@
+# -------
+# - Módulo de Réplicas - VERSÃO AVANÇADA
+# - Execução de réplicas independentes em paralelo
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import os
+import copy
+import time
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple, Union
+from sim_module_avancado import Simulacao
+from motor_rapido_avancado import Fontes, simular_fifo_lote, metricas_fifo_lote
+from aleatorio_avancado import Semente, FonteAleatoria, FonteAleatoriaLote, configs_com_sementes, criar_semente
+from dados_avancado import preparar_pessoas
+from estatisticas_avancado import intervalo_confianca, quantil_t, combinar_distribuicoes, quantis_resultados
+from estatisticas_avancado import estimador_antitetico, estimador_controlo, medias_intervalos, mser
+
+# Métricas agregadas por omissão (as por prioridade usam 'chave.prioridade')
+METRICAS_PADRAO = [
+    'tempo_medio_espera',
+    'taxa_abandono',
+    'ocupacao_media_medicos',
+    'max_fila',
+    'tempo_medio_por_prioridade.1',
+    'tempo_medio_por_prioridade.2',
+    'tempo_medio_por_prioridade.3',
+    'tempo_medio_por_prioridade.4',
+    'tempo_medio_por_prioridade.5'
+]
+
+# Estimadores de executar_replicacoes: média simples, pares antitéticos,
+# variáveis de controlo, ou ambos (controlo sobre as médias dos pares)
+ESTIMADORES = ('simples', 'antitetico', 'controlo', 'antitetico_controlo')
+
+# Variáveis de controlo (valores esperados em Simulacao.controlos_esperados)
+CONTROLOS = ['num_chegadas', 'media_variavel_consulta']
+
+# Métricas por omissão dos varrimentos (as da análise comparativa)
+METRICAS_VARRIMENTO = [
+    'tempo_medio_espera',
+    'tamanho_medio_fila',
+    'max_fila',
+    'ocupacao_media_medicos',
+    'taxa_abandono'
+]
+
+# Métricas que o motor em lote calcula sem construir os resultados completos
+METRICAS_LOTE = [
+    'doentes_atendidos',
+    'doentes_abandonaram',
+    'tempo_medio_espera',
+    'tempo_medio_consulta',
+    'tempo_medio_clinica',
+    'taxa_abandono',
+    'max_fila',
+    'tamanho_medio_fila',
+    'tamanho_medio_fila_eventos',
+    'ocupacao_media_medicos',
+    'ocupacao_media_tempo'
+] + [f'tempo_medio_por_prioridade.{p}' for p in range(1, 6)] + CONTROLOS
+
+
+def extrair_metrica(resultados: Dict, nome: str) -> float:
+    """
+    Lê uma métrica dos resultados de uma simulação
+
+    Nomes com pontos descem nos dicionários; as partes numéricas são
+    chaves inteiras (ex.: 'tempo_medio_por_prioridade.1').
+    """
+    valor = resultados
+    for parte in nome.split('.'):
+        if parte.isdigit() and int(parte) in valor:
+            valor = valor[int(parte)]
+        else:
+            valor = valor[parte]
+    return float(valor)
+
+
+def simular_metricas(argumentos) -> Dict[str, float]:
+    """
+    Executa uma réplica (num processo trabalhador) e devolve só as métricas
+
+    As métricas e os histogramas não precisam do histórico, pelo que a
+    réplica corre sem ele, salvo se a configuração pedir guardar_historico.
+    """
+    config, metricas = argumentos
+    resultados = Simulacao(dict({'guardar_historico': False}, **config)).simular()
+    return {nome: extrair_metrica(resultados, nome) for nome in metricas}
+
+
+def simular_distribuicoes(argumentos) -> Tuple[Dict[str, float], Dict]:
+    """Como simular_metricas, mas devolve também os histogramas da réplica"""
+    config, metricas = argumentos
+    resultados = Simulacao(dict({'guardar_historico': False}, **config)).simular()
+    return {nome: extrair_metrica(resultados, nome) for nome in metricas}, resultados['distribuicoes']
+
+
+def simular_medias_intervalos(argumentos) -> Tuple[np.ndarray, np.ndarray]:
+    """Executa uma réplica piloto e devolve as médias da fila e da ocupação em intervalos iguais"""
+    config, num_intervalos = argumentos
+    simulacao = Simulacao(config)
+    resultados = simulacao.simular()
+    fila = resultados['historico_fila']
+    ocupacao = resultados['historico_ocupacao']
+    return (medias_intervalos(fila.tempos, fila.valores, simulacao.tempo_simulacao, num_intervalos),
+            medias_intervalos(ocupacao.tempos, ocupacao.valores, simulacao.tempo_simulacao, num_intervalos))
+
+
+def numero_trabalhadores(max_workers: Optional[int] = None) -> int:
+    """Número de processos a usar (por omissão, todos os núcleos)"""
+    if max_workers is None:
+        return os.cpu_count() or 1
+    return max(1, max_workers)
+
+
+def _executar_lote(funcao, lote: List) -> List:
+    """Aplica a função a um lote de tarefas (num processo trabalhador)"""
+    return [funcao(tarefa) for tarefa in lote]
+
+
+def executar_em_paralelo(funcao, tarefas: List, max_workers: Optional[int] = None,
+                         callback_progresso=None) -> List:
+    """
+    Aplica funcao a cada tarefa num ProcessPoolExecutor, mantendo a ordem
+
+    Com um só trabalhador corre no próprio processo (sem custo de arranque).
+    As tarefas são enviadas em lotes para diluir o custo de comunicação, e
+    o progresso é reportado à medida que cada lote termina (em qualquer
+    ordem); as saídas são devolvidas pela ordem das tarefas.
+    """
+    trabalhadores = min(numero_trabalhadores(max_workers), max(len(tarefas), 1))
+    total = len(tarefas)
+
+    if trabalhadores == 1:
+        saidas = []
+        for i, tarefa in enumerate(tarefas):
+            saidas.append(funcao(tarefa))
+            if callback_progresso:
+                callback_progresso(int(((i + 1) / total) * 100))
+        return saidas
+
+    tamanho_lote = max(1, total // (trabalhadores * 4))
+    saidas = [None] * total
+    concluidas = 0
+    with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        futuros = {}
+        for inicio in range(0, total, tamanho_lote):
+            lote = tarefas[inicio:inicio + tamanho_lote]
+            futuros[executor.submit(_executar_lote, funcao, lote)] = inicio
+
+        for futuro in as_completed(futuros):
+            inicio = futuros[futuro]
+            lote_saidas = futuro.result()
+            saidas[inicio:inicio + len(lote_saidas)] = lote_saidas
+            concluidas += len(lote_saidas)
+            if callback_progresso:
+                callback_progresso(int((concluidas / total) * 100))
+
+    return saidas
+
+
+def simular_lote(config: Dict, num_replicacoes: int, seed: Semente = None,
+                 antiteticas: bool = False) -> List[Dict]:
+    """
+    Executa N réplicas FIFO em simultâneo no próprio processo (motor em lote)
+
+    Os fluxos aleatórios de todas as réplicas saem de um só bloco
+    (FonteAleatoriaLote), reprodutível a partir de (seed, num_replicacoes):
+    as réplicas têm a mesma distribuição que as de executar_replicacoes,
+    mas não as mesmas amostras (executar_replicacoes com em_lote usa as
+    sementes filhas e dá o mesmo que o pool de processos).
+
+    Raises:
+        ValueError: Se a configuração não for FIFO simples (ver
+                    Simulacao.usa_motor_rapido)
+
+    Returns:
+        Lista com os resultados completos de cada réplica
+    """
+    base = _simulacao_base_lote(config)
+    return _simular_fontes_lote(base, _bloco_replicas(base, num_replicacoes, seed, antiteticas))
+
+
+def metricas_lote(config: Dict, num_replicacoes: int, seed: Semente = None,
+                  antiteticas: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Como simular_lote, mas devolve só as métricas agregadas, empilhadas
+    num array (num_replicacoes,) por métrica, sem históricos por réplica
+
+    Sem nenhum ciclo Python sobre as réplicas: o custo cresce com R só
+    nas operações numpy.
+
+    Raises:
+        ValueError: Se a configuração não for FIFO simples
+    """
+    base = _simulacao_base_lote(config)
+    return _metricas_fontes_lote(base, _bloco_replicas(base, num_replicacoes, seed, antiteticas))
+
+
+def _simular_configs_lote(config: Dict, configs: List[Dict]) -> List[Dict]:
+    """Resultados completos das réplicas (configurações já com sementes) no motor em lote"""
+    base = _simulacao_base_lote(configs[0] if configs else config)
+    return _simular_fontes_lote(base, _fontes_replicas(base, configs))
+
+
+def _metricas_configs_lote(config: Dict, configs: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Métricas empilhadas das réplicas (configurações já com sementes) no
+    motor em lote
+    """
+    base = _simulacao_base_lote(configs[0] if configs else config)
+    return _metricas_fontes_lote(base, _fontes_replicas(base, configs))
+
+
+def _simulacao_base_lote(config: Dict) -> Simulacao:
+    """
+    Simulação com os parâmetros comuns às réplicas do motor em lote
+
+    As réplicas só diferem nos fluxos aleatórios, pelo que se cria uma só
+    Simulacao e cada réplica tem apenas a sua fonte.
+    """
+    base = Simulacao(config)
+    if not base.usa_motor_rapido():
+        raise ValueError("O motor em lote só suporta configurações FIFO (sem triagem, turnos, pausas nem pessoas reais)")
+    return base
+
+
+def _fontes_replicas(base: Simulacao, configs: List[Dict]) -> List[FonteAleatoria]:
+    """Uma FonteAleatoria por réplica, com a semente (e antitetica) da sua configuração"""
+    return [base.aleatorio.replica(c.get('seed'), c.get('antitetica')) for c in configs]
+
+
+def _bloco_replicas(base: Simulacao, num_replicacoes: int, seed: Semente,
+                    antiteticas: bool) -> FonteAleatoriaLote:
+    """Fluxos aleatórios de todas as réplicas num só bloco"""
+    aleatorio = base.aleatorio
+    return FonteAleatoriaLote(num_replicacoes, aleatorio.distribuicao, seed, aleatorio.taxa_chegada,
+                              aleatorio.perfil, antiteticas)
+
+
+def _simular_fontes_lote(base: Simulacao, fontes: Fontes) -> List[Dict]:
+    """
+    Resultados completos das réplicas no motor em lote
+
+    Cada réplica é concluída numa cópia superficial de base com os
+    resultados vazios (evita criar uma Simulacao por réplica).
+    """
+    saidas = simular_fifo_lote(fontes, base.num_medicos, base.tempo_simulacao, base.tempo_medio_consulta,
+                               base.tempo_max_espera, base.guardar_historico, base.periodo_aquecimento,
+                               base.medias_lotes)
+    resultados = []
+    for parciais, medicos in saidas:
+        simulacao = copy.copy(base)
+        simulacao.resultados = simulacao._resultados_vazios()
+        resultados.append(simulacao.concluir_fifo(parciais, medicos))
+    return resultados
+
+
+def _metricas_fontes_lote(base: Simulacao, fontes: Fontes) -> Dict[str, np.ndarray]:
+    """Métricas empilhadas das réplicas no motor em lote"""
+    return metricas_fifo_lote(fontes, base.num_medicos, base.tempo_simulacao, base.tempo_medio_consulta,
+                              base.tempo_max_espera, base.periodo_aquecimento)
+
+
+def configs_replicas(config: Dict, num_replicacoes: int, seed: Semente = None,
+                     antiteticas: bool = False, inicio: int = 0) -> List[Dict]:
+    """
+    Configurações das réplicas: uma semente filha por réplica, ou com
+    antiteticas uma por par, seguidas (original, antitética); inicio é o
+    número de réplicas já feitas, para continuar o mesmo conjunto
+    """
+    if not antiteticas:
+        return configs_com_sementes(config, num_replicacoes, seed, inicio)
+    if num_replicacoes % 2 or inicio % 2:
+        raise ValueError("Com variáveis antitéticas o número de réplicas tem de ser par")
+    return [dict(c, antitetica=antitetica)
+            for c in configs_com_sementes(config, num_replicacoes // 2, seed, inicio // 2)
+            for antitetica in (False, True)]
+
+
+def empilhar_metricas(lista_resultados: List[Dict], metricas: List[str]) -> Dict[str, np.ndarray]:
+    """Junta as métricas de vários resultados num array por métrica"""
+    return {nome: np.array([extrair_metrica(r, nome) for r in lista_resultados]) for nome in metricas}
+
+
+def agregar_replicas(amostras: Dict[str, np.ndarray], nivel: float = 0.95) -> Dict[str, Dict]:
+    """Média, desvio padrão e IC de cada métrica"""
+    return {nome: intervalo_confianca(valores, nivel) for nome, valores in amostras.items()}
+
+
+def agregar_com_estimador(amostras: Dict[str, np.ndarray], controlos: Dict[str, np.ndarray],
+                          esperados: Dict[str, float], estimador: str, nivel: float = 0.95) -> Dict[str, Dict]:
+    """
+    Resumo de cada métrica com o estimador escolhido (ver ESTIMADORES)
+
+    Os resumos dos estimadores de redução de variância incluem
+    'reducao_variancia': a variância da média simples com o mesmo número
+    de simulações independentes a dividir pela do estimador.
+    """
+    if estimador == 'simples':
+        return agregar_replicas(amostras, nivel)
+    if estimador == 'antitetico':
+        return {nome: estimador_antitetico(valores, nivel) for nome, valores in amostras.items()}
+
+    matriz = np.column_stack([controlos[nome] for nome in CONTROLOS])
+    medias = [esperados[nome] for nome in CONTROLOS]
+    resumo = {}
+    for nome, valores in amostras.items():
+        if estimador == 'controlo':
+            resumo[nome] = estimador_controlo(valores, matriz, medias, nivel)
+        else:
+            # Controlo sobre as médias dos pares; referência: 2n independentes
+            variancia_simples = float(np.var(valores, ddof=1)) / len(valores)
+            pares = valores.reshape(-1, 2).mean(axis=1)
+            resumo[nome] = estimador_controlo(pares, matriz.reshape(-1, 2, len(CONTROLOS)).mean(axis=1),
+                                              medias, nivel, variancia_simples)
+    return resumo
+
+
+def executar_replicacoes(config: Dict, num_replicacoes: int, seed: Semente = None,
+                         max_workers: Optional[int] = None, metricas: List[str] = None,
+                         nivel: float = 0.95, callback_progresso=None, em_lote: bool = False,
+                         com_distribuicoes: bool = False, estimador: str = 'simples') -> Dict:
+    """
+    Executa N réplicas independentes da configuração em paralelo
+
+    Cada réplica recebe uma semente filha de seed (sementes_independentes), pelo
+    que o conjunto é reprodutível e as réplicas são independentes. Com
+    em_lote, as configurações FIFO correm todas no motor em lote (no
+    próprio processo), com os mesmos resultados; as outras usam o pool.
+
+    Args:
+        config: Configuração base da simulação
+        num_replicacoes: Número de réplicas
+        seed: Semente raiz
+        max_workers: Processos a usar (None = todos os núcleos)
+        metricas: Métricas a agregar (por omissão METRICAS_PADRAO)
+        nivel: Nível de confiança dos intervalos
+        callback_progresso: Função para reportar progresso
+        em_lote: Usar o motor em lote quando a configuração o permitir
+        com_distribuicoes: Juntar também os histogramas de todas as réplicas
+        estimador: 'simples', 'antitetico' (num_replicacoes/2 pares com
+            variáveis antitéticas), 'controlo' (variáveis de controlo: número
+            de chegadas e média das variáveis de consulta, de valor esperado
+            conhecido) ou 'antitetico_controlo'
+
+    Returns:
+        Dicionário com as amostras por métrica (arrays) e o resumo
+        (media, desvio_padrao, semi_amplitude, ic) de cada métrica; com
+        com_distribuicoes, também 'distribuicoes' (histogramas juntos) e
+        'quantis' (p50, p90, p95, p99 do conjunto das réplicas); com um
+        estimador de redução de variância, também 'reducao_variancia' por
+        métrica e as amostras dos 'controlos'
+    """
+    if metricas is None:
+        metricas = METRICAS_PADRAO
+    if estimador not in ESTIMADORES:
+        raise ValueError(f"Estimador desconhecido: {estimador} (opções: {', '.join(ESTIMADORES)})")
+    antiteticas = estimador.startswith('antitetico')
+    com_controlo = estimador.endswith('controlo')
+    simuladas = list(metricas)
+    if com_controlo:
+        simuladas += [nome for nome in CONTROLOS if nome not in simuladas]
+    configs = configs_replicas(config, num_replicacoes, seed, antiteticas)
+
+    distribuicoes = None
+    simulacao = Simulacao(config)
+    if em_lote and simulacao.usa_motor_rapido():
+        if all(nome in METRICAS_LOTE for nome in simuladas) and not com_distribuicoes:
+            # As mesmas configurações (e sementes) que o pool usaria
+            empilhadas = _metricas_configs_lote(config, configs)
+            amostras = {nome: empilhadas[nome] for nome in simuladas}
+        else:
+            lista_resultados = _simular_configs_lote(config, configs)
+            amostras = empilhar_metricas(lista_resultados, simuladas)
+            distribuicoes = [r['distribuicoes'] for r in lista_resultados]
+        if callback_progresso:
+            callback_progresso(100)
+    else:
+        tarefas = [(c, simuladas) for c in configs]
+        preparar_pessoas([config])
+        if com_distribuicoes:
+            saidas = executar_em_paralelo(simular_distribuicoes, tarefas, max_workers, callback_progresso)
+            distribuicoes = [d for _, d in saidas]
+            saidas = [m for m, _ in saidas]
+        else:
+            saidas = executar_em_paralelo(simular_metricas, tarefas, max_workers, callback_progresso)
+        amostras = {nome: np.array([saida[nome] for saida in saidas]) for nome in simuladas}
+
+    controlos = {nome: amostras[nome] for nome in CONTROLOS if com_controlo}
+    amostras = {nome: amostras[nome] for nome in metricas}
+    resumo = agregar_com_estimador(amostras, controlos, simulacao.controlos_esperados(), estimador, nivel)
+    replicacoes = {
+        'num_replicacoes': num_replicacoes,
+        'nivel': nivel,
+        'estimador': estimador,
+        'amostras': amostras,
+        'resumo': resumo
+    }
+    if estimador != 'simples':
+        replicacoes['reducao_variancia'] = {nome: resumo[nome]['reducao_variancia'] for nome in metricas}
+        replicacoes['controlos'] = controlos
+    if com_distribuicoes and distribuicoes:
+        replicacoes['distribuicoes'] = combinar_distribuicoes(distribuicoes)
+        replicacoes['quantis'] = quantis_resultados(replicacoes['distribuicoes'])
+    return replicacoes
+
+
+def _metricas_configs(configs: List[Dict], metricas: List[str], max_workers: Optional[int] = None,
+                      em_lote: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Métricas de uma lista de configurações já com sementes, num array por
+    métrica; com em_lote, as FIFO correm no motor em lote
+    """
+    if em_lote and all(nome in METRICAS_LOTE for nome in metricas) and Simulacao(configs[0]).usa_motor_rapido():
+        empilhadas = _metricas_configs_lote(configs[0], configs)
+        return {nome: empilhadas[nome] for nome in metricas}
+    saidas = executar_em_paralelo(simular_metricas, [(c, metricas) for c in configs], max_workers)
+    return {nome: np.array([saida[nome] for saida in saidas]) for nome in metricas}
+
+
+def _alvos_precisao(metricas: List[str], precisao_relativa, precisao_absoluta) -> Dict[str, Tuple]:
+    """Alvo (relativo, absoluto) de cada métrica; valores únicos valem para todas"""
+    alvos = {}
+    for nome in metricas:
+        relativa = precisao_relativa.get(nome) if isinstance(precisao_relativa, dict) else precisao_relativa
+        absoluta = precisao_absoluta.get(nome) if isinstance(precisao_absoluta, dict) else precisao_absoluta
+        if relativa is None and absoluta is None:
+            raise ValueError(f"Métrica sem precisão pedida: {nome}")
+        alvos[nome] = (relativa, absoluta)
+    return alvos
+
+
+def _semi_amplitude_alvo(media: float, relativa: Optional[float], absoluta: Optional[float]) -> float:
+    """Maior semi-amplitude aceite: basta cumprir o alvo relativo ou o absoluto"""
+    alvo = 0.0
+    if relativa is not None:
+        alvo = max(alvo, relativa * abs(media))
+    if absoluta is not None:
+        alvo = max(alvo, absoluta)
+    return alvo
+
+
+def replicacoes_sequenciais(config: Dict, metricas: List[str] = None,
+                            precisao_relativa: Union[None, float, Dict[str, float]] = 0.05,
+                            precisao_absoluta: Union[None, float, Dict[str, float]] = None,
+                            seed: Semente = None, replicacoes_iniciais: int = 10,
+                            max_replicacoes: int = 1000, tempo_maximo: Optional[float] = None,
+                            max_workers: Optional[int] = None, nivel: float = 0.95,
+                            estimador: str = 'simples', em_lote: bool = False,
+                            callback_progresso=None) -> Dict:
+    """
+    Réplicas em lotes até todas as métricas terem a precisão pedida
+
+    Depois de cada lote (corrido em paralelo) recalcula os intervalos de
+    confiança; uma métrica está pronta quando a semi-amplitude não passa
+    de precisao_relativa * |média| ou de precisao_absoluta. O lote seguinte
+    tem as réplicas que faltam para a métrica mais atrasada (a
+    semi-amplitude cai com a raiz de n), no máximo o dobro das já feitas,
+    e pára-se também ao chegar a max_replicacoes ou a tempo_maximo.
+
+    As sementes continuam de lote para lote: as n réplicas feitas são as
+    mesmas de executar_replicacoes(config, n, seed) com seed inteiro.
+
+    Args:
+        config: Configuração base da simulação
+        metricas: Métricas a controlar (por omissão METRICAS_PADRAO)
+        precisao_relativa: Semi-amplitude máxima relativa à média (ex.:
+            0.05 = 5%), única ou por métrica
+        precisao_absoluta: Semi-amplitude máxima absoluta (nas unidades da
+            métrica), única ou por métrica
+        seed: Semente raiz
+        replicacoes_iniciais: Réplicas do primeiro lote
+        max_replicacoes: Orçamento de réplicas
+        tempo_maximo: Orçamento de tempo em segundos (None = sem limite)
+        max_workers: Processos a usar (None = todos os núcleos)
+        nivel: Nível de confiança dos intervalos
+        estimador: Um dos ESTIMADORES (ver executar_replicacoes)
+        em_lote: Usar o motor em lote quando a configuração o permitir
+        callback_progresso: Função para reportar progresso
+
+    Raises:
+        ValueError: Se uma métrica não tiver precisão pedida, o estimador
+                    for desconhecido ou o orçamento não der duas réplicas
+
+    Returns:
+        Dicionário como o de executar_replicacoes, com também 'alvos'
+        (semi-amplitude pedida por métrica), 'atingidas' (métrica -> bool),
+        'convergiu', 'motivo' ('precisao', 'max_replicacoes' ou 'tempo'),
+        'lotes' (réplicas acumuladas e semi-amplitudes após cada lote) e
+        'tempo_execucao'
+    """
+    if metricas is None:
+        metricas = METRICAS_PADRAO
+    if estimador not in ESTIMADORES:
+        raise ValueError(f"Estimador desconhecido: {estimador} (opções: {', '.join(ESTIMADORES)})")
+    alvos_pedidos = _alvos_precisao(metricas, precisao_relativa, precisao_absoluta)
+    antiteticas = estimador.startswith('antitetico')
+    # Com pares antitéticos os lotes têm de ter um número par de réplicas
+    passo = 2 if antiteticas else 1
+    if max_replicacoes < 2 * passo:
+        raise ValueError("O orçamento tem de permitir pelo menos duas réplicas (dois pares)")
+    com_controlo = estimador.endswith('controlo')
+    simuladas = list(metricas)
+    if com_controlo:
+        simuladas += [nome for nome in CONTROLOS if nome not in simuladas]
+    trabalhadores = 1 if em_lote else numero_trabalhadores(max_workers)
+
+    simulacao = Simulacao(config)
+    esperados = simulacao.controlos_esperados()
+    raiz = criar_semente(seed)
+    preparar_pessoas([config])
+
+    inicio = time.perf_counter()
+    acumuladas = {nome: np.empty(0) for nome in simuladas}
+    lotes = []
+    num_replicacoes = 0
+    proximo = max(replicacoes_iniciais, passo)
+    motivo = 'max_replicacoes'
+
+    while True:
+        proximo = min(proximo, max_replicacoes - num_replicacoes)
+        proximo -= proximo % passo
+        if proximo <= 0:
+            break
+        inicio_lote = time.perf_counter()
+        configs = configs_replicas(config, proximo, raiz, antiteticas, num_replicacoes)
+        novas = _metricas_configs(configs, simuladas, max_workers, em_lote)
+        duracao_lote = time.perf_counter() - inicio_lote
+        acumuladas = {nome: np.concatenate((acumuladas[nome], novas[nome])) for nome in simuladas}
+        num_replicacoes += proximo
+
+        controlos = {nome: acumuladas[nome] for nome in CONTROLOS if com_controlo}
+        amostras = {nome: acumuladas[nome] for nome in metricas}
+        resumo = agregar_com_estimador(amostras, controlos, esperados, estimador, nivel)
+        alvos = {nome: _semi_amplitude_alvo(resumo[nome]['media'], *alvos_pedidos[nome]) for nome in metricas}
+        atingidas = {nome: resumo[nome]['semi_amplitude'] <= alvos[nome] for nome in metricas}
+        lotes.append({
+            'num_replicacoes': num_replicacoes,
+            'semi_amplitude': {nome: resumo[nome]['semi_amplitude'] for nome in metricas}
+        })
+
+        # Fração do caminho feito: pela precisão da métrica mais atrasada
+        # ou pelos orçamentos, a que estiver mais perto do fim
+        decorrido = time.perf_counter() - inicio
+        if callback_progresso:
+            fracoes = [num_replicacoes / max_replicacoes]
+            if tempo_maximo:
+                fracoes.append(decorrido / tempo_maximo)
+            fracoes.append(min(1.0 if atingidas[nome] else (alvos[nome] / resumo[nome]['semi_amplitude']) ** 2
+                               for nome in metricas))
+            callback_progresso(int(min(1.0, max(fracoes)) * 100))
+
+        if all(atingidas.values()):
+            motivo = 'precisao'
+            break
+
+        # Réplicas que faltam para a métrica mais atrasada (h ~ 1/raiz(n))
+        em_falta = 0
+        for nome in metricas:
+            semi_amplitude = resumo[nome]['semi_amplitude']
+            if atingidas[nome]:
+                continue
+            if alvos[nome] <= 0 or not np.isfinite(semi_amplitude):
+                em_falta = num_replicacoes
+                break
+            necessarias = int(np.ceil(num_replicacoes * (semi_amplitude / alvos[nome]) ** 2))
+            em_falta = max(em_falta, necessarias - num_replicacoes)
+        proximo = min(max(em_falta, trabalhadores, passo), num_replicacoes)
+        proximo += proximo % passo
+
+        if tempo_maximo is not None:
+            restante = tempo_maximo - decorrido
+            tempo_por_replica = duracao_lote / len(configs)
+            cabem = int(restante / tempo_por_replica) if tempo_por_replica > 0 else proximo
+            if cabem < passo:
+                motivo = 'tempo'
+                break
+            proximo = min(proximo, cabem)
+
+    if callback_progresso:
+        callback_progresso(100)
+
+    replicacoes = {
+        'num_replicacoes': num_replicacoes,
+        'nivel': nivel,
+        'estimador': estimador,
+        'amostras': amostras,
+        'resumo': resumo,
+        'alvos': alvos,
+        'atingidas': atingidas,
+        'convergiu': motivo == 'precisao',
+        'motivo': motivo,
+        'lotes': lotes,
+        'tempo_execucao': time.perf_counter() - inicio
+    }
+    if estimador != 'simples':
+        replicacoes['reducao_variancia'] = {nome: resumo[nome]['reducao_variancia'] for nome in metricas}
+        replicacoes['controlos'] = controlos
+    return replicacoes
+
+
+def estimar_aquecimento(config: Dict, num_replicacoes: int = 5, seed: Semente = None,
+                        max_workers: Optional[int] = None, num_intervalos: int = 1000,
+                        tamanho_lote: int = 5) -> Dict:
+    """
+    Período de aquecimento a partir de réplicas piloto (MSER-5)
+
+    As séries da fila e da ocupação de cada réplica são reduzidas a médias
+    em num_intervalos intervalos iguais e a média entre réplicas (que
+    atenua o ruído, como no método de Welch) passa pelo MSER. O período
+    sugerido é o maior dos dois e pode ser usado como periodo_aquecimento.
+    Só faz sentido em regime estacionário (chegadas homogéneas).
+
+    Args:
+        config: Configuração da simulação (o aquecimento da configuração é ignorado)
+        num_replicacoes: Réplicas piloto
+        seed: Semente raiz
+        max_workers: Processos a usar (None = todos os núcleos)
+        num_intervalos: Intervalos em que se divide o horizonte
+        tamanho_lote: Observações por lote do MSER (5 = MSER-5)
+
+    Returns:
+        Dicionário com 'periodo_aquecimento' (min), 'fila' e 'ocupacao'
+        (aquecimento de cada série), 'fracao' (do horizonte) e 'fiavel'
+        (False se o mínimo do MSER ficou no limite: horizonte curto)
+    """
+    piloto = dict(config, guardar_historico=True, memoria_limitada=False, periodo_aquecimento=0.0)
+    tarefas = [(c, num_intervalos) for c in configs_com_sementes(piloto, num_replicacoes, seed)]
+    preparar_pessoas([piloto])
+    saidas = executar_em_paralelo(simular_medias_intervalos, tarefas, max_workers)
+
+    largura = Simulacao(piloto).tempo_simulacao / num_intervalos
+    truncadas_fila, fiavel_fila = mser(np.mean([fila for fila, _ in saidas], axis=0), tamanho_lote)
+    truncadas_ocupacao, fiavel_ocupacao = mser(np.mean([ocupacao for _, ocupacao in saidas], axis=0),
+                                               tamanho_lote)
+    periodo = max(truncadas_fila, truncadas_ocupacao) * largura
+    return {
+        'periodo_aquecimento': periodo,
+        'fila': truncadas_fila * largura,
+        'ocupacao': truncadas_ocupacao * largura,
+        'fracao': periodo / (largura * num_intervalos),
+        'fiavel': fiavel_fila and fiavel_ocupacao,
+        'num_replicacoes': num_replicacoes
+    }
+
+
+def comparar_cenarios(config_base: Dict, variantes: Dict[str, Dict], num_replicacoes: int = 10,
+                      seed: Semente = None, max_workers: Optional[int] = None,
+                      metricas: List[str] = None, nivel: float = 0.95,
+                      callback_progresso=None) -> Dict:
+    """
+    Compara variantes de uma configuração com números aleatórios comuns
+
+    A réplica r de todos os cenários usa a mesma semente. Como chegadas,
+    prioridades e consultas têm sub-fluxos próprios e cada doente tira a
+    sua variável de consulta à chegada, o doente k de cada réplica chega,
+    tem a mesma triagem e a mesma consulta padrão em todos os cenários (só
+    mudam os parâmetros). As diferenças são calculadas réplica a réplica e
+    o intervalo de confiança é o das diferenças emparelhadas, muito mais
+    estreito do que o de cenários com sementes independentes.
+
+    Args:
+        config_base: Configuração do cenário base
+        variantes: Nome -> alterações à configuração base (ex.:
+            {'+1 médico': {'num_medicos': 4}}); 'seed' e 'rng' são ignorados
+        num_replicacoes: Réplicas por cenário
+        seed: Semente raiz
+        max_workers: Processos a usar (None = todos os núcleos)
+        metricas: Métricas a comparar (por omissão METRICAS_PADRAO)
+        nivel: Nível de confiança dos intervalos
+        callback_progresso: Função para reportar progresso
+
+    Returns:
+        Dicionário com 'base' (amostras e resumo) e, por variante, as
+        amostras, o resumo, as diferenças (variante - base) com o seu
+        resumo, a semi-amplitude que teriam com sementes independentes e o
+        fator de redução da variância
+    """
+    if metricas is None:
+        metricas = METRICAS_PADRAO
+
+    sementes = configs_com_sementes(config_base, num_replicacoes, seed)
+    cenarios = [None] + list(variantes)
+    tarefas = []
+    for nome in cenarios:
+        for config_replica in sementes:
+            config = dict(config_replica)
+            if nome is not None:
+                config.update(variantes[nome])
+                config.pop('rng', None)
+                config['seed'] = config_replica['seed']
+            tarefas.append((config, metricas))
+
+    preparar_pessoas(config for config, _ in tarefas)
+    saidas = executar_em_paralelo(simular_metricas, tarefas, max_workers, callback_progresso)
+
+    amostras = {}
+    for i, nome in enumerate(cenarios):
+        bloco = saidas[i * num_replicacoes:(i + 1) * num_replicacoes]
+        amostras[nome] = {metrica: np.array([saida[metrica] for saida in bloco]) for metrica in metricas}
+
+    base = amostras[None]
+    comparacao = {
+        'num_replicacoes': num_replicacoes,
+        'nivel': nivel,
+        'base': {'amostras': base, 'resumo': agregar_replicas(base, nivel)},
+        'variantes': {}
+    }
+    # Referência: semi-amplitude da diferença com cenários independentes
+    t_independente = quantil_t(nivel, 2 * num_replicacoes - 2)
+    for nome in variantes:
+        variante = amostras[nome]
+        diferencas = {metrica: variante[metrica] - base[metrica] for metrica in metricas}
+        semi_amplitude_independente = {}
+        reducao_variancia = {}
+        for metrica in metricas:
+            variancia_separada = (np.var(base[metrica], ddof=1) + np.var(variante[metrica], ddof=1)
+                                  if num_replicacoes > 1 else float('inf'))
+            variancia_emparelhada = np.var(diferencas[metrica], ddof=1) if num_replicacoes > 1 else float('inf')
+            semi_amplitude_independente[metrica] = float(t_independente * np.sqrt(variancia_separada / num_replicacoes))
+            if variancia_emparelhada > 0:
+                reducao_variancia[metrica] = float(variancia_separada / variancia_emparelhada)
+            else:
+                reducao_variancia[metrica] = float('inf') if variancia_separada > 0 else 1.0
+        comparacao['variantes'][nome] = {
+            'alteracoes': dict(variantes[nome]),
+            'amostras': variante,
+            'resumo': agregar_replicas(variante, nivel),
+            'diferencas': diferencas,
+            'resumo_diferencas': agregar_replicas(diferencas, nivel),
+            'semi_amplitude_independente': semi_amplitude_independente,
+            'reducao_variancia': reducao_variancia
+        }
+    return comparacao
+
+
+def varrimento_parametros(config_base: Dict, grelha: Union[Dict[str, List], List[Dict]],
+                          replicacoes: int = 1, seed: Semente = None,
+                          max_workers: Optional[int] = None, metricas: List[str] = None,
+                          nivel: float = 0.95, callback_progresso=None) -> Dict:
+    """
+    Varrimento de parâmetros com réplicas, em paralelo
+
+    Todas as combinações (ponto, réplica) são tarefas independentes,
+    distribuídas pelos processos; cada uma recebe a sua semente filha.
+
+    Args:
+        config_base: Configuração base (os eixos sobrepõem-se a ela)
+        grelha: Dicionário {chave: valores} (produto cartesiano, ex.:
+                num_medicos x taxa_chegada x distribuicao) ou lista de
+                dicionários com pontos explícitos (um só eixo 'ponto')
+        replicacoes: Réplicas por ponto
+        seed: Semente raiz
+        max_workers: Processos a usar (None = todos os núcleos)
+        metricas: Métricas a recolher (por omissão METRICAS_VARRIMENTO)
+        nivel: Nível de confiança dos intervalos
+        callback_progresso: Função para reportar progresso
+
+    Returns:
+        Dicionário com 'eixos' (nomes), 'valores' (valores de cada eixo) e,
+        por métrica, arrays densos indexados pelos eixos: 'amostras'
+        (forma eixos + (replicacoes,)), 'media' e 'semi_amplitude'
+    """
+    if metricas is None:
+        metricas = METRICAS_VARRIMENTO
+
+    if isinstance(grelha, dict):
+        eixos = list(grelha.keys())
+        valores = {eixo: list(grelha[eixo]) for eixo in eixos}
+        pontos = [dict(zip(eixos, combinacao)) for combinacao in itertools.product(*valores.values())]
+    else:
+        eixos = ['ponto']
+        valores = {'ponto': list(grelha)}
+        pontos = [dict(ponto) for ponto in grelha]
+    forma = tuple(len(valores[eixo]) for eixo in eixos)
+
+    configs = configs_com_sementes(config_base, len(pontos) * replicacoes, seed)
+    tarefas = []
+    for i, ponto in enumerate(pontos):
+        for r in range(replicacoes):
+            config = configs[i * replicacoes + r]
+            config.update(ponto)
+            tarefas.append((config, metricas))
+
+    preparar_pessoas(config for config, _ in tarefas)
+    saidas = executar_em_paralelo(simular_metricas, tarefas, max_workers, callback_progresso)
+
+    amostras = {}
+    media = {}
+    semi_amplitude = {}
+    for nome in metricas:
+        amostras[nome] = np.array([saida[nome] for saida in saidas]).reshape(forma + (replicacoes,))
+        media[nome] = amostras[nome].mean(axis=-1)
+        if replicacoes > 1:
+            desvio = amostras[nome].std(axis=-1, ddof=1)
+            semi_amplitude[nome] = quantil_t(nivel, replicacoes - 1) * desvio / np.sqrt(replicacoes)
+        else:
+            semi_amplitude[nome] = np.full(forma, np.inf)
+
+    return {
+        'eixos': eixos,
+        'valores': valores,
+        'replicacoes': replicacoes,
+        'nivel': nivel,
+        'amostras': amostras,
+        'media': media,
+        'semi_amplitude': semi_amplitude
+    }
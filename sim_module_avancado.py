@@ -7,8 +7,14 @@
 # -------
 
 import numpy as np
-import json
+from collections import deque
 from typing import Dict, List, Tuple, Optional
+from estruturas_avancado import CalendarioEventos, SalaEspera, GestorMedicos, SerieTemporal, Doente, Medico
+from aleatorio_avancado import FonteAleatoria, PerfilChegadas, PERFIL_PADRAO, TAMANHO_BLOCO, TAMANHO_BLOCO_INICIAL
+from estatisticas_avancado import MediaTemporal, HistogramaLog, criar_distribuicoes, quantis_resultados
+from estatisticas_avancado import aquecimento_serie, MediasLotes, MediasLotesTempo
+from motor_rapido_avancado import simular_fifo
+from dados_avancado import carregar_pessoas, FICHEIRO_PESSOAS
 
 # Constantes para prioridades (Triagem)
 PRIORIDADE_VERMELHO = 1  # Emergência
@@ -39,8 +45,16 @@ class Simulacao:
         self.taxa_chegada = config.get('taxa_chegada', 10 / 60.0)
         self.tempo_medio_consulta = config.get('tempo_medio_consulta', 15)
         self.tempo_simulacao = config.get('tempo_simulacao', 480)
+        # Aquecimento: os doentes que chegam antes não entram nas estatísticas
+        # e as médias no tempo (fila, médicos) só contam a partir daí
+        self.periodo_aquecimento = config.get('periodo_aquecimento', 0.0)
+        if not 0 <= self.periodo_aquecimento < self.tempo_simulacao:
+            raise ValueError("periodo_aquecimento tem de estar entre 0 e tempo_simulacao")
         self.distribuicao = config.get('distribuicao', 'exponential')
         self.usar_pessoas_reais = config.get('usar_pessoas_reais', False)
+        self.ficheiro_pessoas = config.get('ficheiro_pessoas', FICHEIRO_PESSOAS)
+        # Ler o dataset de um ficheiro .npy com mmap em vez do JSON
+        self.pessoas_binario = config.get('pessoas_binario', False)
         
         # NOVAS FUNCIONALIDADES
         self.usar_triagem = config.get('usar_triagem', False)
@@ -50,7 +64,48 @@ class Simulacao:
         self.usar_pausas = config.get('usar_pausas', False)
         self.duracao_pausa = config.get('duracao_pausa', 30)  # 30 min de pausa
         self.intervalo_pausa = config.get('intervalo_pausa', 180)  # Pausa a cada 3h
-        self.chegadas_nao_homogeneas = config.get('chegadas_nao_homogeneas', False)
+        # Perfil diário: fatores sobre taxa_chegada em troços iguais de 24h
+        # (24 valores = um fator por hora); por omissão PERFIL_PADRAO
+        self.perfil_chegadas = config.get('perfil_chegadas', None)
+        self.chegadas_nao_homogeneas = (config.get('chegadas_nao_homogeneas', False)
+                                        or self.perfil_chegadas is not None)
+        
+        perfil = None
+        if self.chegadas_nao_homogeneas:
+            fatores = self.perfil_chegadas if self.perfil_chegadas is not None else PERFIL_PADRAO
+            perfil = PerfilChegadas.de_fatores(self.taxa_chegada, fatores)
+        
+        # Modo de memória limitada: sem histórico, sempre no motor de eventos
+        # (o motor rápido guarda arrays com todas as chegadas) e blocos de
+        # variáveis pequenos; a memória depende só de quantos doentes estão
+        # na clínica, não da duração. Os resultados são os mesmos.
+        self.memoria_limitada = config.get('memoria_limitada', False)
+        
+        # Gerador de números aleatórios próprio (variáveis tiradas em blocos)
+        # 'seed' torna a simulação reprodutível; 'rng' permite passar um Generator
+        self.seed = config.get('seed', None)
+        tamanho_bloco = TAMANHO_BLOCO_INICIAL if self.memoria_limitada else TAMANHO_BLOCO
+        # 'antitetica' (False/True) gera as variáveis por inversão de U ou
+        # 1 - U: duas simulações com a mesma semente formam um par antitético
+        self.antitetica = config.get('antitetica', None)
+        self.aleatorio = FonteAleatoria(self.distribuicao, self.seed, config.get('rng', None),
+                                        self.taxa_chegada, perfil, tamanho_bloco, self.antitetica)
+        
+        # Sem triagem, turnos nem pausas o modelo é uma fila FIFO G/G/c e pode
+        # correr no motor rápido (False força o motor de eventos)
+        self.motor_rapido = config.get('motor_rapido', True)
+        
+        # Sem histórico não se guardam séries nem listas por doente: todas as
+        # métricas de resumo saem de acumuladores (memória constante). Os
+        # histogramas de quantis existem sempre; com histórico, as listas
+        # tempos_*_individuais também ficam (são as que os gráficos usam),
+        # pelo que a memória só fica limitada com guardar_historico=False
+        # (ou memoria_limitada)
+        self.guardar_historico = config.get('guardar_historico', True) and not self.memoria_limitada
+        
+        # Médias por lotes (uma só simulação longa): espera e tempo na
+        # clínica por doente e fila no tempo, em fluxo e com memória constante
+        self.medias_lotes = config.get('medias_lotes', False)
         
         # Carregar dados de pessoas
         self.pessoas = []
@@ -58,15 +113,20 @@ class Simulacao:
             self.carregar_pessoas()
         
         # Estruturas de dados para resultados
-        self.resultados = {
+        self.resultados = self._resultados_vazios()
+    
+    def _resultados_vazios(self) -> Dict:
+        """Resultados antes de simular (totais a zero e estruturas vazias)"""
+        return {
             'doentes_atendidos': 0,
             'doentes_abandonaram': 0,
             'tempo_total_espera': 0.0,
             'tempo_total_consulta': 0.0,
             'tempo_total_clinica': 0.0,
             'max_fila': 0,
-            'historico_fila': [],
-            'historico_ocupacao': [],
+            # Séries em escada (só mudanças): tamanho da fila e ocupação (%)
+            'historico_fila': SerieTemporal(np.int32),
+            'historico_ocupacao': SerieTemporal(np.float64),
             'tempos_espera_individuais': [],
             'tempos_consulta_individuais': [],
             'tempos_clinica_individuais': [],
@@ -75,133 +135,87 @@ class Simulacao:
             'atendidos_por_prioridade': {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
             'abandonos_por_prioridade': {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
             'espera_por_prioridade': {1: [], 2: [], 3: [], 4: [], 5: []},
-            'taxa_abandono_vs_taxa_chegada': []
+            'tempo_total_espera_por_prioridade': {1: 0.0, 2: 0.0, 3: 0.0, 4: 0.0, 5: 0.0},
+            # Histogramas logarítmicos (quantis sem guardar as listas; juntam-se entre réplicas)
+            'distribuicoes': criar_distribuicoes(),
+            'taxa_abandono_vs_taxa_chegada': [],
+            # Variáveis de controlo: chegadas e média das variáveis de consulta
+            # (valores esperados conhecidos, ver controlos_esperados)
+            'num_chegadas': 0,
+            'media_variavel_consulta': 0.0
         }
-        
+    
     def carregar_pessoas(self):
-        """Carrega o dataset de pessoas do ficheiro JSON"""
-        ficheiro = open('pessoas.json', 'r', encoding='utf-8')
-        conteudo = ficheiro.read()
-        ficheiro.close()
+        """Carrega o dataset de pessoas (lido uma vez por processo, ver dados_avancado)"""
+        self.pessoas = carregar_pessoas(self.ficheiro_pessoas, self.pessoas_binario)
         
-        if conteudo:
-            self.pessoas = json.loads(conteudo)
-        else:
-            print("Aviso: ficheiro pessoas.json vazio. Usando IDs genéricos.")
+        if len(self.pessoas) == 0:
+            print(f"Aviso: ficheiro {self.ficheiro_pessoas} vazio. Usando IDs genéricos.")
             self.usar_pessoas_reais = False
     
     def gera_prioridade(self) -> int:
         """Gera prioridade aleatória com distribuição realista"""
-        # Distribuição realista de urgências
-        prob = np.random.random()
-        if prob < 0.05:  # 5% emergências
-            return PRIORIDADE_VERMELHO
-        elif prob < 0.15:  # 10% muito urgente
-            return PRIORIDADE_LARANJA
-        elif prob < 0.35:  # 20% urgente
-            return PRIORIDADE_AMARELO
-        elif prob < 0.70:  # 35% pouco urgente
-            return PRIORIDADE_VERDE
-        else:  # 30% não urgente
-            return PRIORIDADE_AZUL
+        # Distribuição realista de urgências: 5% emergências, 10% muito
+        # urgente, 20% urgente, 35% pouco urgente, 30% não urgente
+        return self.aleatorio.prioridade()
     
-    def gera_intervalo_chegada(self, tempo_atual: float) -> float:
-        """Gera intervalo entre chegadas (pode ser não homogênea)"""
-        if self.chegadas_nao_homogeneas:
-            # Taxa varia ao longo do dia
-            hora_do_dia = (tempo_atual % 1440) / 60  # Converter para horas (0-24)
-            
-            # Picos: 9h-11h e 14h-17h
-            if 9 <= hora_do_dia < 11 or 14 <= hora_do_dia < 17:
-                taxa = self.taxa_chegada * 1.5  # 50% mais doentes
-            elif 12 <= hora_do_dia < 14 or 20 <= hora_do_dia < 24:
-                taxa = self.taxa_chegada * 0.5  # 50% menos doentes
-            else:
-                taxa = self.taxa_chegada
-            
-            return np.random.exponential(1 / taxa)
-        else:
-            return np.random.exponential(1 / self.taxa_chegada)
+    def gera_tempo_chegada(self) -> float:
+        """
+        Gera o instante da próxima chegada (processo de Poisson)
+        
+        Com chegadas não homogêneas a intensidade segue o perfil diário;
+        os instantes são exatos (inversão da intensidade acumulada).
+        """
+        return self.aleatorio.proxima_chegada()
     
-    def gera_tempo_consulta(self, prioridade: int = None) -> float:
-        """Gera tempo de consulta (urgências tendem a ser mais rápidas)"""
+    def gera_tempo_consulta(self, prioridade: int = None, variavel: float = None) -> float:
+        """
+        Gera tempo de consulta (urgências tendem a ser mais rápidas)
+        
+        Args:
+            prioridade: Prioridade do doente
+            variavel: Variável padronizada já tirada para o doente (se None, tira uma nova)
+        """
         tempo_base = self.tempo_medio_consulta
         
         # Urgências são mais rápidas
         if prioridade and prioridade <= 2:
             tempo_base = tempo_base * 0.7
         
-        if self.distribuicao == "exponential":
-            return np.random.exponential(tempo_base)
-        elif self.distribuicao == "normal":
-            return max(5, np.random.normal(tempo_base, tempo_base * 0.3))
-        elif self.distribuicao == "uniform":
-            # Valores mais realistas: min=5min, max=30min
-            return np.random.uniform(max(5, tempo_base * 0.4), tempo_base * 1.6)
-        else:
-            return tempo_base
+        if variavel is None:
+            variavel = self.aleatorio.variavel_consulta()
+        return self.aleatorio.tempo_consulta(tempo_base, variavel)
     
-    def procura_medico_livre(self, medicos: List, tempo_atual: float) -> Optional[Dict]:
-        """Procura médico disponível (considerando turnos e pausas)"""
-        medico_encontrado = None
-        i = 0
-        
-        while i < len(medicos) and medico_encontrado is None:
-            medico = medicos[i]
-            
-            # Verificar se médico está no turno correto
-            if self.usar_turnos:
-                turno_atual = int(tempo_atual / self.duracao_turno) % 2
-                turno_medico = i % 2  # Médicos pares turno 0, ímpares turno 1
-                if turno_atual != turno_medico:
-                    i += 1
-                    continue  # Médico não está de turno
-            
-            # Verificar se está em pausa
-            if medico.get('em_pausa', False):
-                if tempo_atual >= medico.get('fim_pausa', 0):
-                    medico['em_pausa'] = False
-                else:
-                    i += 1
-                    continue  # Ainda em pausa
-            
-            # Verificar se precisa de pausa
-            if self.usar_pausas and not medico['ocupado']:
-                tempo_trabalho = tempo_atual - medico.get('ultimo_inicio_pausa', 0)
-                if tempo_trabalho >= self.intervalo_pausa:
-                    medico['em_pausa'] = True
-                    medico['fim_pausa'] = tempo_atual + self.duracao_pausa
-                    medico['ultimo_inicio_pausa'] = tempo_atual
-                    i += 1
-                    continue
-            
-            # Médico disponível
-            if not medico['ocupado']:
-                medico_encontrado = medico
-            
-            i += 1
-        
-        return medico_encontrado
+    def procura_medico_livre(self, gestor: GestorMedicos) -> Optional[Medico]:
+        """Procura médico disponível (turnos e pausas já refletidos no gestor)"""
+        return gestor.procurar_livre()
+    
+    def inserir_na_fila_por_prioridade(self, fila: SalaEspera, doente: Doente):
+        """Insere doente na fila mantendo ordem de prioridade (O(1))"""
+        # Sem triagem todos os doentes têm a mesma prioridade: fila FIFO simples
+        fila.entrar(doente)
+    
+    def usa_motor_rapido(self) -> bool:
+        """Indica se a configuração é uma fila FIFO simples (motor rápido)"""
+        return (self.motor_rapido and not self.memoria_limitada and not self.usar_triagem
+                and not self.usar_turnos and not self.usar_pausas and not self.usar_pessoas_reais)
     
-    def inserir_na_fila_por_prioridade(self, fila: List, doente_info: Dict):
-        """Insere doente na fila mantendo ordem de prioridade"""
-        if not self.usar_triagem:
-            fila.append(doente_info)
-            return
-        
-        # Inserir mantendo ordem de prioridade
-        prioridade_nova = doente_info['prioridade']
-        i = 0
-        inserido = False
-        
-        while i < len(fila) and not inserido:
-            if fila[i]['prioridade'] > prioridade_nova:
-                fila.insert(i, doente_info)
-                inserido = True
-            i += 1
-        
-        if not inserido:
-            fila.append(doente_info)
+    def controlos_esperados(self) -> Dict[str, float]:
+        """Valores esperados (exatos) das variáveis de controlo dos resultados"""
+        return {
+            'num_chegadas': self.aleatorio.chegadas_esperadas(self.tempo_simulacao),
+            'media_variavel_consulta': self.aleatorio.media_variavel_consulta_esperada()
+        }
+    
+    def _inicializar_stats_medicos(self):
+        """Cria as estatísticas vazias de cada médico"""
+        for i in range(self.num_medicos):
+            self.resultados['medicos_stats'][f'm{i}'] = {
+                'tempo_ocupado': 0.0,
+                'doentes_atendidos': 0,
+                'ocupacao_percentual': 0.0,
+                'turno': 'Dia' if i % 2 == 0 else 'Noite'
+            }
     
     def simular(self, callback_progresso=None) -> Dict:
         """
@@ -213,184 +227,290 @@ class Simulacao:
         Returns:
             Dicionário com todos os resultados
         """
+        if self.usa_motor_rapido():
+            return self._simular_fifo(callback_progresso)
+        
         tempo_atual = 0.0
         contador_doentes = 0
-        queue_eventos = []
-        fila_espera = []
+        calendario = CalendarioEventos()
+        fila_espera = SalaEspera()
+        
+        # Prazos de abandono: por ordem de chegada, que é também a ordem
+        # dos prazos (tempo_chegada + tempo_max_espera)
+        prazos_abandono = deque()
         
         # Inicializar médicos
-        medicos = []
-        for i in range(self.num_medicos):
-            medicos.append({
-                'id': f'm{i}',
-                'ocupado': False,
-                'doente_atual': None,
-                'tempo_ocupado': 0.0,
-                'inicio_consulta': 0.0,
-                'doentes_atendidos': 0,
-                'em_pausa': False,
-                'fim_pausa': 0.0,
-                'ultimo_inicio_pausa': 0.0
-            })
-            self.resultados['medicos_stats'][f'm{i}'] = {
-                'tempo_ocupado': 0.0,
-                'doentes_atendidos': 0,
-                'ocupacao_percentual': 0.0,
-                'turno': 'Dia' if i % 2 == 0 else 'Noite'
-            }
+        gestor = GestorMedicos(self.num_medicos, calendario, self.tempo_simulacao,
+                               self.usar_turnos, self.duracao_turno,
+                               self.usar_pausas, self.duracao_pausa, self.intervalo_pausa)
+        self._inicializar_stats_medicos()
         
-        # Dicionário de informações dos doentes
+        # Registos dos doentes presentes na clínica, pelo número do doente
+        # (ordem de chegada); o calendário guarda só esse número. Cada
+        # registo sai daqui quando o doente sai ou abandona, depois de
+        # somado aos acumuladores
         info_doentes = {}
         
-        # Gerar chegadas de doentes
-        tempo_chegada = self.gera_intervalo_chegada(0)
-        while tempo_chegada < self.tempo_simulacao:
-            if self.usar_pessoas_reais and self.pessoas:
-                pessoa = self.pessoas[contador_doentes % len(self.pessoas)]
-                doente_id = pessoa['id']
-                info_doentes[doente_id] = pessoa.copy()
-            else:
-                doente_id = f'd{contador_doentes}'
-                info_doentes[doente_id] = {'id': doente_id}
-            
-            # Atribuir prioridade
-            if self.usar_triagem:
-                info_doentes[doente_id]['prioridade'] = self.gera_prioridade()
-            else:
-                info_doentes[doente_id]['prioridade'] = PRIORIDADE_VERDE
-            
-            contador_doentes += 1
-            queue_eventos.append((tempo_chegada, 'CHEGADA', doente_id))
-            tempo_chegada += self.gera_intervalo_chegada(tempo_chegada)
+        def atender_fila(tempo_atual):
+            """Atende doentes em espera enquanto houver médicos disponíveis"""
+            while fila_espera:
+                medico = self.procura_medico_livre(gestor)
+                if medico is None:
+                    return
+                
+                proximo = fila_espera.proximo()
+                
+                gestor.iniciar_consulta(medico, proximo.id, tempo_atual)
+                
+                tempo_consulta = self.gera_tempo_consulta(proximo.prioridade, proximo.variavel_consulta)
+                
+                proximo.tempo_espera = tempo_atual - proximo.tempo_chegada
+                proximo.tempo_inicio_consulta = tempo_atual
+                proximo.tempo_consulta = tempo_consulta
+                
+                calendario.agendar(tempo_atual + tempo_consulta, 'SAIDA', proximo.id)
         
-        # Ordenar eventos
-        queue_eventos.sort(key=lambda x: x[0])
+        # Chegadas geradas a pedido: só a próxima chegada está no calendário
+        tempo_chegada = self.gera_tempo_chegada()
+        if tempo_chegada < self.tempo_simulacao:
+            calendario.agendar(tempo_chegada, 'CHEGADA')
         
-        total_eventos = len(queue_eventos)
         eventos_processados = 0
+        guardar_historico = self.guardar_historico
+        historico_fila = self.resultados['historico_fila']
+        historico_ocupacao = self.resultados['historico_ocupacao']
+        if guardar_historico:
+            historico_fila.registar(0.0, 0)
+            historico_ocupacao.registar(0.0, 0.0)
+        # Acumuladores: fila e médicos ocupados ponderados pelo tempo, e soma
+        # dos tamanhos da fila vistos em cada evento
+        media_fila = MediaTemporal()
+        media_ocupados = MediaTemporal()
+        soma_tamanhos_fila = 0
+        eventos_medidos = 0
+        distribuicoes = self.resultados['distribuicoes']
+        lotes = None
+        if self.medias_lotes:
+            lotes = {'espera': MediasLotes(), 'clinica': MediasLotes(), 'fila': MediasLotesTempo()}
+        
+        # Fim do aquecimento: recomeçar as médias no tempo e os totais dos
+        # médicos (o estado atual mantém-se até ao evento seguinte)
+        periodo_aquecimento = self.periodo_aquecimento
+        aquecido = periodo_aquecimento <= 0
+        
+        def terminar_aquecimento():
+            media_fila.reiniciar(periodo_aquecimento)
+            media_ocupados.reiniciar(periodo_aquecimento)
+            for medico in gestor.medicos:
+                medico.descartar_totais(periodo_aquecimento)
+            if lotes is not None:
+                lotes['fila'].reiniciar(periodo_aquecimento)
         
         # Processar eventos
-        while queue_eventos:
-            evento = queue_eventos.pop(0)
-            tempo_atual, tipo_evento, doente_id = evento
+        while calendario:
+            tempo_atual, tipo_evento, doente_id = calendario.proximo()
             eventos_processados += 1
             
             if callback_progresso and eventos_processados % 10 == 0:
-                progresso = int((eventos_processados / max(total_eventos, 1)) * 100)
+                progresso = int(min(tempo_atual / self.tempo_simulacao, 1.0) * 100)
                 callback_progresso(progresso)
             
-            # Verificar abandonos
-            fila_atualizada = []
-            for doente_info in fila_espera:
-                tempo_espera = tempo_atual - doente_info['tempo_chegada']
-                if tempo_espera > self.tempo_max_espera:
+            if not aquecido and tempo_atual >= periodo_aquecimento:
+                terminar_aquecimento()
+                aquecido = True
+            
+            # Verificar abandonos (só os doentes cujo prazo já expirou)
+            while prazos_abandono and tempo_atual - prazos_abandono[0].tempo_chegada > self.tempo_max_espera:
+                doente = prazos_abandono.popleft()
+                if doente.na_fila:
                     # Doente abandona
-                    self.resultados['doentes_abandonaram'] += 1
-                    prioridade = doente_info['prioridade']
-                    self.resultados['abandonos_por_prioridade'][prioridade] += 1
-                else:
-                    fila_atualizada.append(doente_info)
-            fila_espera = fila_atualizada
+                    fila_espera.remover(doente)
+                    del info_doentes[doente.id]
+                    if doente.tempo_chegada >= periodo_aquecimento:
+                        self.resultados['doentes_abandonaram'] += 1
+                        self.resultados['abandonos_por_prioridade'][doente.prioridade] += 1
             
-            # Registrar histórico
-            self.resultados['historico_fila'].append((tempo_atual, len(fila_espera)))
-            medicos_ocupados = sum(1 for m in medicos if m['ocupado'])
-            ocupacao = (medicos_ocupados / self.num_medicos) * 100
-            self.resultados['historico_ocupacao'].append((tempo_atual, ocupacao))
+            if aquecido:
+                soma_tamanhos_fila += len(fila_espera)
+                eventos_medidos += 1
             
             if tipo_evento == 'CHEGADA':
-                info_doentes[doente_id]['tempo_chegada'] = tempo_atual
-                medico_livre = self.procura_medico_livre(medicos, tempo_atual)
+                # Criar o doente só quando chega (a pessoa do dataset é
+                # referenciada, não copiada)
+                pessoa = None
+                if self.usar_pessoas_reais:
+                    pessoa = self.pessoas[contador_doentes % len(self.pessoas)]
+                
+                # Atribuir prioridade
+                if self.usar_triagem:
+                    prioridade = self.gera_prioridade()
+                else:
+                    prioridade = PRIORIDADE_VERDE
+                
+                # A variável da consulta é tirada à chegada, para que cada
+                # doente use sempre a mesma posição do fluxo de consultas
+                doente_id = contador_doentes
+                doente = Doente(doente_id, prioridade, tempo_atual, self.aleatorio.variavel_consulta(), pessoa)
+                info_doentes[doente_id] = doente
+                contador_doentes += 1
+                
+                # Agendar a chegada seguinte
+                tempo_chegada = self.gera_tempo_chegada()
+                if tempo_chegada < self.tempo_simulacao:
+                    calendario.agendar(tempo_chegada, 'CHEGADA')
+                
+                medico_livre = self.procura_medico_livre(gestor)
                 
                 if medico_livre:
                     # Atendimento imediato
-                    medico_livre['ocupado'] = True
-                    medico_livre['doente_atual'] = doente_id
-                    medico_livre['inicio_consulta'] = tempo_atual
+                    gestor.iniciar_consulta(medico_livre, doente_id, tempo_atual)
                     
-                    prioridade = info_doentes[doente_id]['prioridade']
-                    tempo_consulta = self.gera_tempo_consulta(prioridade)
+                    tempo_consulta = self.gera_tempo_consulta(prioridade, doente.variavel_consulta)
                     
-                    info_doentes[doente_id]['tempo_espera'] = 0.0
-                    info_doentes[doente_id]['tempo_inicio_consulta'] = tempo_atual
-                    info_doentes[doente_id]['tempo_consulta'] = tempo_consulta
+                    doente.tempo_inicio_consulta = tempo_atual
+                    doente.tempo_consulta = tempo_consulta
                     
-                    queue_eventos.append((tempo_atual + tempo_consulta, 'SAIDA', doente_id))
-                    queue_eventos.sort(key=lambda x: x[0])
+                    calendario.agendar(tempo_atual + tempo_consulta, 'SAIDA', doente_id)
                 else:
-                    # Entra na fila por prioridade
-                    doente_info = {
-                        'id': doente_id,
-                        'tempo_chegada': tempo_atual,
-                        'prioridade': info_doentes[doente_id]['prioridade']
-                    }
-                    self.inserir_na_fila_por_prioridade(fila_espera, doente_info)
-                    self.resultados['max_fila'] = max(self.resultados['max_fila'], len(fila_espera))
+                    # Entra na fila por prioridade (o próprio registo é a
+                    # entrada da fila e da lista de prazos)
+                    self.inserir_na_fila_por_prioridade(fila_espera, doente)
+                    prazos_abandono.append(doente)
+                    if aquecido:
+                        self.resultados['max_fila'] = max(self.resultados['max_fila'], len(fila_espera))
             
             elif tipo_evento == 'SAIDA':
-                # Encontrar médico
-                medico = None
-                i = 0
-                while i < len(medicos) and medico is None:
-                    if medicos[i]['doente_atual'] == doente_id:
-                        medico = medicos[i]
-                    i += 1
+                # Encontrar médico (mapa doente -> médico)
+                medico = gestor.terminar_consulta(doente_id, tempo_atual)
                 
                 if medico:
-                    tempo_consulta_real = tempo_atual - medico['inicio_consulta']
-                    medico['tempo_ocupado'] += tempo_consulta_real
-                    medico['doentes_atendidos'] += 1
-                    medico['ocupado'] = False
-                    medico['doente_atual'] = None
-                    
-                    # Registrar estatísticas
-                    tempo_chegada = info_doentes[doente_id]['tempo_chegada']
-                    tempo_espera = info_doentes[doente_id].get('tempo_espera', 0.0)
-                    tempo_consulta = info_doentes[doente_id]['tempo_consulta']
-                    tempo_total = tempo_atual - tempo_chegada
-                    prioridade = info_doentes[doente_id]['prioridade']
-                    
-                    self.resultados['doentes_atendidos'] += 1
-                    self.resultados['tempo_total_espera'] += tempo_espera
-                    self.resultados['tempo_total_consulta'] += tempo_consulta
-                    self.resultados['tempo_total_clinica'] += tempo_total
-                    
-                    self.resultados['tempos_espera_individuais'].append(tempo_espera)
-                    self.resultados['tempos_consulta_individuais'].append(tempo_consulta)
-                    self.resultados['tempos_clinica_individuais'].append(tempo_total)
-                    
-                    self.resultados['atendidos_por_prioridade'][prioridade] += 1
-                    self.resultados['espera_por_prioridade'][prioridade].append(tempo_espera)
-                    
-                    # Atender próximo da fila
-                    if fila_espera:
-                        proximo_info = fila_espera.pop(0)
-                        proximo_doente = proximo_info['id']
+                    doente = info_doentes.pop(doente_id)
+                    # Registrar estatísticas (só de quem chegou depois do aquecimento)
+                    if doente.tempo_chegada >= periodo_aquecimento:
+                        tempo_espera = doente.tempo_espera
+                        tempo_consulta = doente.tempo_consulta
+                        tempo_total = tempo_atual - doente.tempo_chegada
+                        prioridade = doente.prioridade
+                        
+                        self.resultados['doentes_atendidos'] += 1
+                        self.resultados['tempo_total_espera'] += tempo_espera
+                        self.resultados['tempo_total_consulta'] += tempo_consulta
+                        self.resultados['tempo_total_clinica'] += tempo_total
                         
-                        medico['ocupado'] = True
-                        medico['doente_atual'] = proximo_doente
-                        medico['inicio_consulta'] = tempo_atual
+                        self.resultados['atendidos_por_prioridade'][prioridade] += 1
+                        self.resultados['tempo_total_espera_por_prioridade'][prioridade] += tempo_espera
                         
-                        prioridade_prox = info_doentes[proximo_doente]['prioridade']
-                        tempo_consulta = self.gera_tempo_consulta(prioridade_prox)
-                        tempo_espera = tempo_atual - info_doentes[proximo_doente]['tempo_chegada']
+                        distribuicoes['espera'].adicionar(tempo_espera)
+                        distribuicoes['consulta'].adicionar(tempo_consulta)
+                        distribuicoes['clinica'].adicionar(tempo_total)
+                        distribuicoes['espera_por_prioridade'][prioridade].adicionar(tempo_espera)
                         
-                        info_doentes[proximo_doente]['tempo_espera'] = tempo_espera
-                        info_doentes[proximo_doente]['tempo_inicio_consulta'] = tempo_atual
-                        info_doentes[proximo_doente]['tempo_consulta'] = tempo_consulta
+                        if guardar_historico:
+                            self.resultados['tempos_espera_individuais'].append(tempo_espera)
+                            self.resultados['tempos_consulta_individuais'].append(tempo_consulta)
+                            self.resultados['tempos_clinica_individuais'].append(tempo_total)
+                            self.resultados['espera_por_prioridade'][prioridade].append(tempo_espera)
                         
-                        queue_eventos.append((tempo_atual + tempo_consulta, 'SAIDA', proximo_doente))
-                        queue_eventos.sort(key=lambda x: x[0])
+                        if lotes is not None:
+                            lotes['espera'].adicionar(tempo_espera)
+                            lotes['clinica'].adicionar(tempo_total)
+                    
+                    # Atender próximo da fila
+                    atender_fila(tempo_atual)
+            
+            elif tipo_evento in GestorMedicos.EVENTOS:
+                # Mudança de turno ou pausa: pode libertar médicos para a fila
+                # (nestes eventos os dados são o índice do médico)
+                gestor.processar_evento(tipo_evento, doente_id, tempo_atual)
+                atender_fila(tempo_atual)
+            
+            # Estado depois do evento (vale até ao evento seguinte)
+            media_fila.atualizar(tempo_atual, len(fila_espera))
+            media_ocupados.atualizar(tempo_atual, gestor.num_ocupados)
+            if lotes is not None:
+                lotes['fila'].atualizar(tempo_atual, len(fila_espera))
+            if guardar_historico:
+                # A série ignora valores repetidos
+                historico_fila.registar(tempo_atual, len(fila_espera))
+                historico_ocupacao.registar(tempo_atual, (gestor.num_ocupados / self.num_medicos) * 100)
         
-        self._calcular_estatisticas_finais(medicos)
+        self.resultados['eventos_processados'] = eventos_processados
+        self.resultados['num_chegadas'] = contador_doentes
+        self.resultados['media_variavel_consulta'] = self.aleatorio.media_variaveis_consulta()
+        if not aquecido:
+            # Nenhum evento depois do aquecimento
+            terminar_aquecimento()
+        
+        # Médias ponderadas pelo tempo até ao fim da simulação (ou até à
+        # última saída, se os doentes ainda em consulta saírem depois)
+        duracao = max(tempo_atual, self.tempo_simulacao)
+        self.resultados['tamanho_medio_fila'] = media_fila.media(duracao)
+        self.resultados['ocupacao_media_tempo'] = (media_ocupados.media(duracao) / self.num_medicos) * 100
+        if lotes is not None:
+            lotes['fila'].fechar(duracao)
+            self.resultados['lotes'] = lotes
+        if eventos_medidos > 0:
+            self.resultados['tamanho_medio_fila_eventos'] = soma_tamanhos_fila / eventos_medidos
+        else:
+            self.resultados['tamanho_medio_fila_eventos'] = 0.0
+        
+        self._calcular_estatisticas_finais(gestor.medicos)
         
         if callback_progresso:
             callback_progresso(100)
         
         return self.resultados
     
-    def _calcular_estatisticas_finais(self, medicos: List):
-        """Calcula estatísticas finais"""
+    def _simular_fifo(self, callback_progresso=None) -> Dict:
+        """
+        Executa a simulação no motor rápido FIFO (sem calendário de eventos)
+        
+        Dá os mesmos resultados que o motor de eventos para esta configuração.
+        """
+        parciais, medicos = simular_fifo(self.aleatorio, self.num_medicos, self.tempo_simulacao,
+                                         self.tempo_medio_consulta, self.tempo_max_espera,
+                                         self.guardar_historico, self.periodo_aquecimento, self.medias_lotes)
+        self.concluir_fifo(parciais, medicos)
+        
+        if callback_progresso:
+            callback_progresso(100)
+        
+        return self.resultados
+    
+    def concluir_fifo(self, parciais: Dict, medicos: List[Medico]) -> Dict:
+        """
+        Completa os resultados a partir da saída de um motor FIFO
+        
+        Usado por _simular_fifo e pelo motor em lote (simular_fifo_lote).
+        """
+        self._inicializar_stats_medicos()
+        distribuicoes = parciais.pop('distribuicoes')
+        self.resultados.update(parciais)
+        self.resultados['distribuicoes'].update(distribuicoes)
+        
+        # Sem triagem todos os doentes são Verde: todos os campos por
+        # prioridade são preenchidos, e os das outras ficam vazios (como no
+        # motor de eventos)
+        for prioridade in NOMES_PRIORIDADE:
+            verde = prioridade == PRIORIDADE_VERDE
+            self.resultados['atendidos_por_prioridade'][prioridade] = parciais['doentes_atendidos'] if verde else 0
+            self.resultados['abandonos_por_prioridade'][prioridade] = parciais['doentes_abandonaram'] if verde else 0
+            self.resultados['tempo_total_espera_por_prioridade'][prioridade] = \
+                parciais['tempo_total_espera'] if verde else 0.0
+            self.resultados['espera_por_prioridade'][prioridade] = \
+                list(parciais['tempos_espera_individuais']) if verde else []
+            self.resultados['distribuicoes']['espera_por_prioridade'][prioridade] = \
+                HistogramaLog.combinar([distribuicoes['espera']]) if verde else HistogramaLog()
+        
+        self._calcular_estatisticas_finais(medicos)
+        return self.resultados
+    
+    def _calcular_estatisticas_finais(self, medicos: List[Medico]):
+        """
+        Calcula estatísticas finais a partir dos totais acumulados
+        
+        As médias da fila e a ocupação ponderada pelo tempo já vêm do motor.
+        """
         n = self.resultados['doentes_atendidos']
         
         if n > 0:
@@ -409,21 +529,16 @@ class Simulacao:
         else:
             self.resultados['taxa_abandono'] = 0.0
         
-        # Estatísticas da fila
-        if self.resultados['historico_fila']:
-            tamanhos = [tam for _, tam in self.resultados['historico_fila']]
-            self.resultados['tamanho_medio_fila'] = np.mean(tamanhos)
-        else:
-            self.resultados['tamanho_medio_fila'] = 0.0
-        
-        # Estatísticas dos médicos
+        # Estatísticas dos médicos (no horizonte depois do aquecimento)
+        horizonte = self.tempo_simulacao - self.periodo_aquecimento
         for medico in medicos:
-            tempo_ocupado_real = min(medico['tempo_ocupado'], self.tempo_simulacao)
-            ocupacao_percentual = (tempo_ocupado_real / self.tempo_simulacao) * 100
+            tempo_ocupado_real = min(medico.tempo_ocupado, horizonte)
+            ocupacao_percentual = (tempo_ocupado_real / horizonte) * 100
             
-            self.resultados['medicos_stats'][medico['id']]['tempo_ocupado'] = tempo_ocupado_real
-            self.resultados['medicos_stats'][medico['id']]['doentes_atendidos'] = medico['doentes_atendidos']
-            self.resultados['medicos_stats'][medico['id']]['ocupacao_percentual'] = min(ocupacao_percentual, 100.0)
+            stats = self.resultados['medicos_stats'][medico.id]
+            stats['tempo_ocupado'] = tempo_ocupado_real
+            stats['doentes_atendidos'] = medico.doentes_atendidos
+            stats['ocupacao_percentual'] = min(ocupacao_percentual, 100.0)
         
         # Ocupação média
         ocupacoes = [stats['ocupacao_percentual'] for stats in self.resultados['medicos_stats'].values()]
@@ -432,8 +547,53 @@ class Simulacao:
         # Tempos médios por prioridade
         self.resultados['tempo_medio_por_prioridade'] = {}
         for prioridade in range(1, 6):
-            tempos = self.resultados['espera_por_prioridade'][prioridade]
-            if tempos:
-                self.resultados['tempo_medio_por_prioridade'][prioridade] = np.mean(tempos)
+            atendidos = self.resultados['atendidos_por_prioridade'][prioridade]
+            if atendidos > 0:
+                total = self.resultados['tempo_total_espera_por_prioridade'][prioridade]
+                self.resultados['tempo_medio_por_prioridade'][prioridade] = total / atendidos
             else:
-                self.resultados['tempo_medio_por_prioridade'][prioridade] = 0.0
\ No newline at end of file
+                self.resultados['tempo_medio_por_prioridade'][prioridade] = 0.0
+        
+        # Quantis (p50, p90, p95, p99) de cada histograma
+        self.resultados['quantis'] = quantis_resultados(self.resultados['distribuicoes'])
+        
+        self.resultados['aquecimento'] = self._relatorio_aquecimento()
+        
+        # Médias por lotes com IC (a partir dos lotes guardados pelo motor)
+        if 'lotes' in self.resultados:
+            self.resultados['medias_lotes'] = {nome: lotes.resultado()
+                                               for nome, lotes in self.resultados['lotes'].items()}
+    
+    def _relatorio_aquecimento(self) -> Dict:
+        """
+        Horizonte descartado e, com histórico, o aquecimento detetado
+        (MSER-5) nas séries da fila e da ocupação
+        
+        A deteção supõe um regime estacionário: com chegadas não
+        homogéneas as séries são periódicas e o valor serve só de indicação.
+        """
+        relatorio = {
+            'periodo_aquecimento': self.periodo_aquecimento,
+            'fracao_descartada': self.periodo_aquecimento / self.tempo_simulacao,
+            'detetado': None,
+            'detetado_fila': None,
+            'detetado_ocupacao': None,
+            'fiavel': False,
+            'suficiente': None
+        }
+        historico_fila = self.resultados['historico_fila']
+        historico_ocupacao = self.resultados['historico_ocupacao']
+        if len(historico_fila) == 0 or len(historico_ocupacao) == 0:
+            return relatorio
+        
+        fila, fiavel_fila = aquecimento_serie(historico_fila.tempos, historico_fila.valores,
+                                              self.tempo_simulacao)
+        ocupacao, fiavel_ocupacao = aquecimento_serie(historico_ocupacao.tempos, historico_ocupacao.valores,
+                                                      self.tempo_simulacao)
+        relatorio['detetado_fila'] = fila
+        relatorio['detetado_ocupacao'] = ocupacao
+        relatorio['detetado'] = max(fila, ocupacao)
+        relatorio['fiavel'] = fiavel_fila and fiavel_ocupacao
+        relatorio['suficiente'] = self.periodo_aquecimento >= relatorio['detetado']
+        return relatorio
+
@@ -0,0 +1,12 @@
+# -------
+# - Configuração dos testes - VERSÃO AVANÇADA
+# - Os módulos do projeto estão na raiz do repositório
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,183 @@
+# -------
+# - Testes da geração de números aleatórios - VERSÃO AVANÇADA
+# - Blocos vetorizados, sementes e chegadas não homogêneas
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import numpy as np
+import pytest
+from aleatorio_avancado import _BlocoVariaveis, FonteAleatoria, FonteAleatoriaLote, TAMANHO_BLOCO_INICIAL
+from aleatorio_avancado import criar_semente, sementes_filhas, sementes_independentes, configs_com_sementes
+from aleatorio_avancado import PerfilChegadas, PERFIL_PADRAO
+
+
+def test_bloco_entrega_as_variaveis_pela_ordem_e_duplica_o_tamanho():
+    pedidos = []
+    proximo = [0]
+
+    def gerar(n):
+        pedidos.append(n)
+        valores = np.arange(proximo[0], proximo[0] + n)
+        proximo[0] += n
+        return valores
+
+    bloco = _BlocoVariaveis(gerar, tamanho_maximo=4 * TAMANHO_BLOCO_INICIAL)
+    total = 10 * TAMANHO_BLOCO_INICIAL
+    assert [bloco.proximo() for _ in range(total)] == list(range(total))
+    assert pedidos[:4] == [TAMANHO_BLOCO_INICIAL, 2 * TAMANHO_BLOCO_INICIAL,
+                           4 * TAMANHO_BLOCO_INICIAL, 4 * TAMANHO_BLOCO_INICIAL]
+
+
+def test_prioridades_seguem_a_distribuicao_de_urgencias():
+    fonte = FonteAleatoria(seed=1)
+    prioridades = np.array([fonte.prioridade() for _ in range(40000)])
+    frequencias = np.bincount(prioridades, minlength=6)[1:] / len(prioridades)
+    assert set(np.unique(prioridades)) <= {1, 2, 3, 4, 5}
+    assert np.allclose(frequencias, [0.05, 0.10, 0.20, 0.35, 0.30], atol=0.01)
+
+
+def test_tempos_de_consulta_por_distribuicao():
+    uniforme = FonteAleatoria('uniform', seed=2)
+    tempos = [uniforme.tempo_consulta(15, uniforme.variavel_consulta()) for _ in range(2000)]
+    assert 6 <= min(tempos) and max(tempos) <= 24
+
+    normal = FonteAleatoria('normal', seed=3)
+    assert min(normal.tempo_consulta(15, normal.variavel_consulta()) for _ in range(2000)) >= 5
+
+    exponencial = FonteAleatoria('exponential', seed=4)
+    media = np.mean([exponencial.tempo_consulta(15, exponencial.variavel_consulta()) for _ in range(20000)])
+    assert abs(media - 15) < 0.5
+
+
+def variaveis(fonte, n=50):
+    return [fonte.variavel_consulta() for _ in range(n)]
+
+
+def test_mesma_semente_reproduz_os_fluxos():
+    assert variaveis(FonteAleatoria(seed=11)) == variaveis(FonteAleatoria(seed=11))
+    assert variaveis(FonteAleatoria(seed=11)) != variaveis(FonteAleatoria(seed=12))
+
+
+def test_seedsequence_do_chamador_nao_e_alterada():
+    raiz = np.random.SeedSequence(5)
+    for _ in range(2):
+        assert [s.spawn_key for s in sementes_independentes(raiz, 4)] == [(i,) for i in range(4)]
+    assert raiz.n_children_spawned == 0
+    assert variaveis(FonteAleatoria(seed=raiz)) == variaveis(FonteAleatoria(seed=raiz))
+
+    # As filhas são as que spawn() daria a uma SeedSequence nova
+    chaves = [s.spawn_key for s in sementes_filhas(raiz, 3, inicio=2)]
+    assert chaves == [s.spawn_key for s in np.random.SeedSequence(5).spawn(5)[2:]]
+
+
+def test_rng_do_chamador_nao_avanca():
+    rng = np.random.default_rng(3)
+    copia = np.random.default_rng(3)
+    primeira, segunda = FonteAleatoria(rng=rng), FonteAleatoria(rng=rng)
+
+    assert rng.random(5).tolist() == copia.random(5).tolist()
+    assert variaveis(primeira) != variaveis(segunda)
+
+
+def test_configs_com_sementes_independentes_e_reprodutiveis():
+    config = {'num_medicos': 3, 'rng': np.random.default_rng(1)}
+    configs = configs_com_sementes(config, 4, seed=9)
+    assert all('rng' not in c and c['num_medicos'] == 3 for c in configs)
+    assert len({c['seed'].spawn_key for c in configs}) == 4
+    continuacao = configs_com_sementes(config, 2, seed=9, inicio=2)
+    assert [c['seed'].spawn_key for c in continuacao] == [c['seed'].spawn_key for c in configs[2:]]
+    assert criar_semente(9).entropy == configs[0]['seed'].entropy
+
+
+def test_inversao_da_intensidade_acumulada_e_exata():
+    perfil = PerfilChegadas.de_fatores(10 / 60.0, PERFIL_PADRAO)
+    tempos = np.random.default_rng(0).uniform(0, 5 * 1440, 1000)
+    assert np.allclose(perfil.inverter(perfil.intensidade_acumulada(tempos)), tempos)
+    assert perfil.intensidade_acumulada(1440) == pytest.approx(perfil.total_periodo)
+
+
+def test_chegadas_seguem_o_perfil_horario():
+    fatores = [0.5] * 12 + [2.0] * 12
+    perfil = PerfilChegadas.de_fatores(0.5, fatores)
+    dias = 60
+    fonte = FonteAleatoria(seed=6, taxa_chegada=0.5, perfil=perfil)
+    chegadas = fonte.tempos_chegada(dias * 1440)
+
+    por_hora = np.bincount((chegadas % 1440 // 60).astype(int), minlength=24) / dias
+    esperadas = 0.5 * 60 * np.array(fatores)
+    assert np.all(np.abs(por_hora - esperadas) < 4 * np.sqrt(esperadas / dias))
+    assert abs(len(chegadas) - fonte.chegadas_esperadas(dias * 1440)) < 4 * np.sqrt(len(chegadas))
+
+
+@pytest.mark.parametrize('taxas', [[], [1.0, -0.5], [0.0, 0.0]])
+def test_perfil_invalido(taxas):
+    with pytest.raises(ValueError):
+        PerfilChegadas(taxas)
+
+
+@pytest.mark.parametrize('distribuicao', ['exponential', 'uniform', 'normal'])
+def test_par_antitetico_usa_uniformes_complementares(distribuicao):
+    original = FonteAleatoria(distribuicao, seed=8, antitetica=False)
+    antitetica = FonteAleatoria(distribuicao, seed=8, antitetica=True)
+    # Entre chegadas: -log(1 - U) e -log(U), logo exp(-a) + exp(-b) = 1
+    a = np.diff(original.tempos_chegada(600.0)[:100], prepend=0.0) * original.taxa_chegada
+    b = np.diff(antitetica.tempos_chegada(600.0)[:100], prepend=0.0) * antitetica.taxa_chegada
+    n = min(len(a), len(b))
+    assert np.allclose(np.exp(-a[:n]) + np.exp(-b[:n]), 1.0)
+    x, y = original.variaveis_consulta(200), antitetica.variaveis_consulta(200)
+    if distribuicao == 'exponential':
+        assert np.allclose(np.exp(-x) + np.exp(-y), 1.0)
+    else:
+        # U e 1 - U (uniforme) ou Z e -Z (normal): a soma é o dobro da média
+        assert np.allclose(x + y, 2 * original.media_variavel_consulta_esperada())
+
+
+def test_media_das_variaveis_de_consulta_entregues():
+    fonte = FonteAleatoria('exponential', seed=2)
+    assert fonte.media_variaveis_consulta() == 0.0
+    variaveis = np.append(fonte.variaveis_consulta(300), fonte.variavel_consulta())
+    assert fonte.media_variaveis_consulta() == pytest.approx(variaveis.mean())
+    assert fonte.media_variavel_consulta_esperada() == 1.0
+
+
+def test_bloco_de_replicas_reprodutivel_e_de_poisson():
+    blocos = [FonteAleatoriaLote(2000, seed=4) for _ in range(2)]
+    (chegadas, num), (outras, outro_num) = [bloco.tempos_chegada(480.0) for bloco in blocos]
+    assert np.array_equal(chegadas, outras) and np.array_equal(num, outro_num)
+    assert np.array_equal(blocos[0].variaveis_consulta(50), blocos[1].variaveis_consulta(50))
+    # Cada linha: chegadas crescentes antes do horizonte e infinito depois
+    validas = np.arange(chegadas.shape[1]) < num[:, None]
+    assert np.array_equal(np.isfinite(chegadas), validas)
+    assert np.all(np.diff(np.where(validas, chegadas, 480.0), axis=1) >= 0)
+    assert np.all(chegadas[validas] < 480.0)
+    # Número de chegadas de Poisson com média (e variância) 80
+    assert abs(num.mean() - 80) < 4 * np.sqrt(80 / 2000)
+    assert abs(num.var() / 80 - 1) < 0.1
+
+
+def test_bloco_de_replicas_estende_as_linhas_curtas():
+    bloco = FonteAleatoriaLote(500, seed=5)
+    # Blocos de 16 chegadas: são precisos vários até todas passarem o horizonte
+    bloco.chegadas_esperadas = lambda horizonte: 0.0
+    chegadas, num = bloco.tempos_chegada(480.0)
+    assert num.min() > 16
+    assert abs(num.mean() - 80) < 4 * np.sqrt(80 / 500)
+    assert np.all(np.diff(chegadas[:, :num.min()], axis=1) > 0)
+
+
+@pytest.mark.parametrize('distribuicao', ['exponential', 'uniform', 'normal'])
+def test_bloco_antitetico_forma_pares_de_linhas(distribuicao):
+    bloco = FonteAleatoriaLote(6, distribuicao, seed=8, antiteticas=True)
+    chegadas, num = bloco.tempos_chegada(600.0)
+    n = num.min()
+    entre_chegadas = np.diff(chegadas[:, :n], axis=1, prepend=0.0) * bloco.taxa_chegada
+    assert np.allclose(np.exp(-entre_chegadas[0::2]) + np.exp(-entre_chegadas[1::2]), 1.0)
+    variaveis = bloco.variaveis_consulta(200)
+    if distribuicao == 'exponential':
+        assert np.allclose(np.exp(-variaveis[0::2]) + np.exp(-variaveis[1::2]), 1.0)
+    else:
+        assert np.allclose(variaveis[0::2] + variaveis[1::2], 2 * bloco.media_variavel_consulta_esperada())
+    with pytest.raises(ValueError):
+        FonteAleatoriaLote(5, distribuicao, seed=8, antiteticas=True)
@@ -0,0 +1,57 @@
+# -------
+# - Testes das análises - VERSÃO AVANÇADA
+# - Varrimento de taxas de chegada em paralelo
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import matplotlib
+matplotlib.use('Agg')
+
+import pytest
+from analysis_avancado import analise_comparativa_taxa_chegada, fatia_varrimento
+from replicacao_avancado import executar_em_paralelo, varrimento_parametros
+
+
+CONFIG_BASE = {
+    'num_medicos': 3,
+    'tempo_medio_consulta': 15,
+    'tempo_simulacao': 480,
+    'usar_triagem': True,
+    'seed': 11
+}
+
+TAXAS = [4, 8, 12, 16, 20]
+
+
+def _quadrado(x):
+    return x * x
+
+
+def test_executar_em_paralelo_mantem_a_ordem_das_tarefas():
+    progresso = []
+    saidas = executar_em_paralelo(_quadrado, list(range(23)), max_workers=3,
+                                  callback_progresso=progresso.append)
+    assert saidas == [x * x for x in range(23)]
+    assert progresso and progresso[-1] == 100
+    assert progresso == sorted(progresso)
+
+
+def test_varrimento_pela_ordem_das_taxas_e_independente_dos_processos():
+    sequencial = analise_comparativa_taxa_chegada(CONFIG_BASE, TAXAS, max_workers=1)
+    paralelo = analise_comparativa_taxa_chegada(CONFIG_BASE, TAXAS, max_workers=2)
+    assert sequencial['taxas'] == TAXAS
+    assert sequencial == paralelo
+    assert all(isinstance(v, int) for v in sequencial['tamanho_max_fila'])
+    # Com mais chegadas os médicos ficam mais ocupados
+    assert sequencial['ocupacao_medicos'][-1] > sequencial['ocupacao_medicos'][0]
+
+
+def test_fatia_de_um_varrimento_fixa_os_outros_eixos():
+    grelha = {'num_medicos': [2, 4], 'taxa_chegada': [6 / 60.0, 12 / 60.0, 18 / 60.0]}
+    varrimento = varrimento_parametros(CONFIG_BASE, grelha, replicacoes=2, max_workers=1)
+    fatia = fatia_varrimento(varrimento, 'taxa_chegada', {'num_medicos': 4})
+    assert fatia['eixo'] == 'taxa_chegada'
+    assert fatia['taxas'] == pytest.approx([6, 12, 18])
+    assert fatia['tempo_medio_espera'] == list(varrimento['media']['tempo_medio_espera'][1])
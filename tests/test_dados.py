@@ -0,0 +1,75 @@
+# -------
+# - Testes dos dados - VERSÃO AVANÇADA
+# - Cache do dataset de pessoas e ficheiro binário com mmap
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import json
+import os
+import numpy as np
+from dados_avancado import carregar_pessoas, caminho_binario, preparar_pessoas
+from sim_module_avancado import Simulacao
+
+
+PESSOAS = [
+    {'id': 'p0', 'nome': 'Ana', 'idade': 30, 'alergias': ['penicilina']},
+    {'id': 'p1', 'nome': 'Rui', 'idade': 71, 'alergias': []},
+    {'id': 'p2', 'nome': 'Eva', 'idade': 5}
+]
+
+
+def escrever(caminho, pessoas, mtime=None):
+    caminho.write_text(json.dumps(pessoas), encoding='utf-8')
+    if mtime is not None:
+        os.utime(caminho, (mtime, mtime))
+
+
+def test_dataset_lido_uma_vez_por_processo(tmp_path):
+    caminho = tmp_path / 'pessoas.json'
+    escrever(caminho, PESSOAS)
+    primeira = carregar_pessoas(str(caminho))
+    assert primeira == PESSOAS
+    assert carregar_pessoas(str(caminho)) is primeira
+
+
+def test_cache_invalida_quando_o_ficheiro_muda(tmp_path):
+    caminho = tmp_path / 'pessoas.json'
+    escrever(caminho, PESSOAS, mtime=1_000_000)
+    antigas = carregar_pessoas(str(caminho))
+
+    # O mesmo caminho com outra data de modificação volta a ser lido
+    escrever(caminho, PESSOAS[:1], mtime=1_000_100)
+    novas = carregar_pessoas(str(caminho))
+    assert novas is not antigas
+    assert [p['id'] for p in novas] == ['p0']
+
+
+def test_binario_com_mmap_tem_os_mesmos_campos(tmp_path):
+    caminho = tmp_path / 'pessoas.json'
+    escrever(caminho, PESSOAS, mtime=1_000_000)
+    pessoas = carregar_pessoas(str(caminho), binario=True)
+    assert isinstance(pessoas, np.memmap)
+    assert os.path.exists(caminho_binario(str(caminho)))
+    assert [str(p['id']) for p in pessoas] == ['p0', 'p1', 'p2']
+    assert int(pessoas[1]['idade']) == 71
+    assert json.loads(pessoas[0]['alergias']) == ['penicilina']
+
+    # JSON mais recente do que o .npy: o binário é recriado
+    escrever(caminho, PESSOAS[:2], mtime=os.path.getmtime(caminho_binario(str(caminho))) + 10)
+    assert len(carregar_pessoas(str(caminho), binario=True)) == 2
+
+
+def test_resultados_iguais_com_e_sem_binario(tmp_path):
+    caminho = tmp_path / 'pessoas.json'
+    escrever(caminho, PESSOAS)
+    config = {'num_medicos': 2, 'taxa_chegada': 15 / 60.0, 'tempo_simulacao': 600, 'usar_triagem': True,
+              'usar_pessoas_reais': True, 'ficheiro_pessoas': str(caminho), 'seed': 4}
+    preparar_pessoas([dict(config, pessoas_binario=True)])
+    assert os.path.exists(caminho_binario(str(caminho)))
+
+    json_simples = Simulacao(config).simular()
+    binario = Simulacao(dict(config, pessoas_binario=True)).simular()
+    for chave in ('doentes_atendidos', 'doentes_abandonaram', 'tempo_medio_espera', 'max_fila'):
+        assert binario[chave] == json_simples[chave]
@@ -0,0 +1,216 @@
+# -------
+# - Testes das estatísticas - VERSÃO AVANÇADA
+# - Acumuladores e estimadores usados pelas réplicas
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import numpy as np
+import pytest
+from estatisticas_avancado import MediaTemporal, HistogramaLog, estimador_antitetico, estimador_controlo
+from estatisticas_avancado import medias_intervalos, mser, aquecimento_serie
+from estatisticas_avancado import MediasLotes, MediasLotesTempo, autocorrelacao_lag1, MAX_LOTES
+
+
+def test_media_temporal_pondera_pelo_tempo():
+    media = MediaTemporal()
+    media.atualizar(2.0, 3)   # 0 em [0, 2)
+    media.atualizar(6.0, 1)   # 3 em [2, 6)
+    assert media.media() == pytest.approx(12 / 6)
+    # 1 em [6, 10)
+    assert media.media(10.0) == pytest.approx(16 / 10)
+
+
+def test_media_temporal_igual_ao_integral_da_escada():
+    rng = np.random.default_rng(3)
+    tempos = np.cumsum(rng.exponential(1.0, 200))
+    valores = rng.integers(0, 10, 200)
+    media = MediaTemporal()
+    for tempo, valor in zip(tempos, valores):
+        media.atualizar(tempo, valor)
+    fim = tempos[-1] + 5.0
+    integral = np.sum(valores[:-1] * np.diff(tempos)) + valores[-1] * 5.0
+    assert media.media(fim) == pytest.approx(integral / fim)
+
+
+@pytest.mark.parametrize('amostra', ['exponencial', 'lognormal', 'com_zeros'])
+def test_quantis_do_histograma_dentro_do_erro_das_classes(amostra):
+    rng = np.random.default_rng(8)
+    if amostra == 'exponencial':
+        valores = rng.exponential(15.0, 5000)
+    elif amostra == 'lognormal':
+        valores = rng.lognormal(1.0, 2.0, 5000)
+    else:
+        valores = np.where(rng.random(5000) < 0.4, 0.0, rng.exponential(30.0, 5000))
+    histograma = HistogramaLog()
+    histograma.adicionar_varios(valores)
+    for q in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 1.0):
+        exato = np.quantile(valores, q, method='inverted_cdf')
+        tolerancia = histograma.erro_relativo * exato + histograma.minimo
+        assert abs(histograma.quantil(q) - exato) <= tolerancia, q
+
+
+def test_quantis_altos_de_amostras_pequenas_usam_a_ordem_mais_proxima():
+    histograma = HistogramaLog()
+    for valor in (1.26, 11.83, 53.35):
+        histograma.adicionar(valor)
+    assert histograma.quantil(0.99) == 53.35
+    assert histograma.quantil(0.5) == pytest.approx(11.83, rel=0.01)
+    assert HistogramaLog().quantil(0.5) == 0.0
+
+
+def test_juntar_histogramas_e_igual_a_um_so():
+    valores = np.random.default_rng(9).exponential(10.0, 3000)
+    partes = []
+    for bloco in np.array_split(valores, 3):
+        parte = HistogramaLog()
+        parte.adicionar_varios(bloco)
+        partes.append(parte)
+    junto = HistogramaLog.combinar(partes)
+    unico = HistogramaLog()
+    for valor in valores:
+        unico.adicionar(valor)
+    assert np.array_equal(junto.contagens, unico.contagens)
+    assert junto.n == unico.n
+    assert junto.quantis() == unico.quantis()
+
+
+def test_estimador_antitetico_sobre_as_medias_dos_pares():
+    rng = np.random.default_rng(5)
+    u = rng.random(50)
+    # Pares (f(U), f(1 - U)) com f monótona: correlação negativa
+    amostras = np.column_stack((u ** 2, (1 - u) ** 2)).ravel()
+    resultado = estimador_antitetico(amostras)
+    assert resultado['n'] == 50
+    assert resultado['media'] == pytest.approx(amostras.mean())
+    pares = amostras.reshape(-1, 2).mean(axis=1)
+    assert resultado['variancia_estimador'] == pytest.approx(np.var(pares, ddof=1) / 50)
+    assert resultado['reducao_variancia'] > 1
+    with pytest.raises(ValueError):
+        estimador_antitetico(amostras[:-1])
+
+
+def test_estimador_controlo_recupera_os_coeficientes():
+    rng = np.random.default_rng(6)
+    controlos = rng.normal(5.0, 2.0, (200, 2))
+    amostras = 3.0 + controlos @ np.array([2.0, -1.0]) - 5.0 + rng.normal(0, 0.1, 200)
+    resultado = estimador_controlo(amostras, controlos, [5.0, 5.0])
+    assert resultado['coeficientes'] == pytest.approx([2.0, -1.0], abs=0.02)
+    # A média corrigida está perto de E[Y] = 3 e muito mais precisa que a simples
+    assert resultado['ic'][0] < 3.0 < resultado['ic'][1]
+    assert resultado['reducao_variancia'] > 100
+
+
+def test_estimador_controlo_sem_graus_de_liberdade_usa_a_media_simples():
+    resultado = estimador_controlo([1.0, 2.0, 4.0], np.zeros((3, 2)), [0.0, 0.0])
+    assert resultado['media'] == pytest.approx(7 / 3)
+    assert resultado['reducao_variancia'] == 1.0
+    assert np.all(resultado['coeficientes'] == 0)
+
+
+def test_medias_intervalos_de_uma_escada():
+    # 0 em [0, 3), 6 em [3, 10): intervalos de largura 2.5
+    medias = medias_intervalos([0.0, 3.0], [0.0, 6.0], 10.0, 4)
+    assert medias == pytest.approx([0.0, 6 * 2 / 2.5, 6.0, 6.0])
+    assert np.all(medias_intervalos([], [], 10.0, 3) == 0)
+
+
+def test_mser_corta_o_transiente_conhecido():
+    rng = np.random.default_rng(7)
+    # Transiente de 100 observações a descer de 20 até ao regime (média 5)
+    transiente = np.linspace(20.0, 5.0, 100)
+    serie = np.concatenate((transiente, np.full(900, 5.0))) + rng.normal(0, 1.0, 1000)
+    truncadas, fiavel = mser(serie)
+    assert fiavel
+    assert truncadas % 5 == 0
+    assert 80 <= truncadas <= 120
+    # Série estacionária: quase nada a descartar
+    truncadas, fiavel = mser(rng.normal(5.0, 1.0, 1000))
+    assert fiavel and truncadas < 100
+
+
+def test_mser_de_series_curtas_ou_so_transiente():
+    assert mser(np.arange(15.0)) == (0, False)
+    # Sempre a descer: o mínimo fica no limite da pesquisa e não é fiável
+    truncadas, fiavel = mser(np.linspace(100.0, 0.0, 200))
+    assert not fiavel and truncadas == 100
+
+
+def test_aquecimento_serie_em_minutos():
+    # Fila que sobe até 10 em 200 min e fica estável até 1000 min
+    tempos = np.arange(0.0, 1000.0, 1.0)
+    valores = np.minimum(tempos / 20.0, 10.0)
+    aquecimento, fiavel = aquecimento_serie(tempos, valores, 1000.0, num_intervalos=200)
+    assert fiavel
+    assert 175.0 <= aquecimento <= 225.0
+    assert aquecimento_serie(tempos, valores, 0.0) == (0.0, False)
+
+
+def estado_lotes(lotes):
+    return lotes.tamanho, lotes.n_atual, lotes.soma_atual, lotes.somas
+
+
+@pytest.mark.parametrize('n', [0, 7, 64, 1000, 4097])
+def test_medias_lotes_em_fluxo_iguais_as_calculadas_de_uma_vez(n):
+    valores = np.random.default_rng(n).exponential(1.0, n)
+    fluxo = MediasLotes()
+    for valor in valores:
+        fluxo.adicionar(valor)
+    de_uma_vez = MediasLotes.de_valores(valores)
+    assert fluxo.tamanho == de_uma_vez.tamanho and fluxo.n_atual == de_uma_vez.n_atual
+    assert fluxo.soma_atual == pytest.approx(de_uma_vez.soma_atual)
+    assert fluxo.somas == pytest.approx(de_uma_vez.somas)
+    # Memória constante: entre metade e MAX_LOTES lotes completos
+    if n >= MAX_LOTES:
+        assert MAX_LOTES // 2 <= len(fluxo.somas) < MAX_LOTES
+
+
+def test_medias_lotes_de_observacoes_independentes():
+    valores = np.random.default_rng(3).normal(10.0, 2.0, 20000)
+    resultado = MediasLotes.de_valores(valores).resultado()
+    assert resultado['independentes']
+    assert resultado['ic'][0] < 10.0 < resultado['ic'][1]
+    assert resultado['media'] == pytest.approx(valores[:resultado['n'] * resultado['tamanho_lote']].mean())
+
+
+def test_medias_lotes_juntam_lotes_correlacionados():
+    # AR(1) com phi = 0.99: as observações vizinhas quase não mudam
+    rng = np.random.default_rng(4)
+    valores = np.empty(20000)
+    valores[0] = 0.0
+    for i in range(1, len(valores)):
+        valores[i] = 0.99 * valores[i - 1] + rng.normal()
+    # Muitos lotes curtos (32 observações): as médias vizinhas estão correlacionadas
+    lotes = MediasLotes.de_valores(valores, max_lotes=1024)
+    resultado = lotes.resultado()
+    assert resultado['tamanho_lote'] > lotes.tamanho
+    # Muito mais largo que o IC ingénuo, que supõe observações independentes
+    ingenuo = 1.96 * np.std(valores, ddof=1) / np.sqrt(len(valores))
+    assert resultado['semi_amplitude'] > 3 * ingenuo
+
+
+def test_medias_lotes_no_tempo_em_fluxo_e_de_uma_vez():
+    rng = np.random.default_rng(5)
+    tempos = np.cumsum(rng.exponential(1.0, 3000))
+    valores = rng.integers(0, 10, 3000).astype(float)
+    fim = tempos[-1] + 2.0
+    fluxo = MediasLotesTempo(tempo_inicial=0.0)
+    for tempo, valor in zip(tempos, valores):
+        fluxo.atualizar(tempo, valor)
+    fluxo.fechar(fim)
+    de_uma_vez = MediasLotesTempo.de_serie(tempos, valores, fim)
+    assert fluxo.tamanho == de_uma_vez.tamanho
+    assert fluxo.somas == pytest.approx(de_uma_vez.somas)
+    assert fluxo.soma_atual == pytest.approx(de_uma_vez.soma_atual)
+    # As áreas dos lotes e do lote em curso somam o integral da escada
+    area = np.sum(valores * np.diff(np.append(tempos, fim)))
+    assert sum(fluxo.somas) + fluxo.soma_atual == pytest.approx(area)
+
+
+def test_lotes_e_autocorrelacao_em_casos_limite():
+    with pytest.raises(ValueError):
+        MediasLotes(max_lotes=5)
+    assert autocorrelacao_lag1([1.0, 2.0]) == 0.0
+    assert autocorrelacao_lag1(np.ones(10)) == 0.0
+    assert autocorrelacao_lag1(np.arange(100.0)) > 0.9
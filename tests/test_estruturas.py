@@ -0,0 +1,163 @@
+# -------
+# - Testes das estruturas de dados - VERSÃO AVANÇADA
+# - Calendário de eventos, sala de espera e gestor de médicos
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import numpy as np
+import pytest
+from benchmark_avancado import PESSOA_EXEMPLO, _bytes_por_doente, _doente_dicionario, _doente_registo
+from estruturas_avancado import CalendarioEventos, SalaEspera, GestorMedicos, SerieTemporal, Doente, Medico
+
+
+def test_calendario_devolve_eventos_por_ordem_de_tempo():
+    calendario = CalendarioEventos()
+    tempos = np.random.default_rng(1).uniform(0, 100, 200)
+    for i, tempo in enumerate(tempos):
+        calendario.agendar(float(tempo), 'CHEGADA', i)
+
+    saidas = []
+    while calendario:
+        saidas.append(calendario.proximo()[0])
+    assert saidas == sorted(tempos.tolist())
+
+
+def test_calendario_desempata_pela_ordem_de_agendamento():
+    calendario = CalendarioEventos()
+    calendario.agendar(5.0, 'SAIDA', 'a')
+    calendario.agendar(1.0, 'CHEGADA', 'b')
+    calendario.agendar(5.0, 'CHEGADA', 'c')
+    calendario.agendar(5.0, 'SAIDA', 'd')
+
+    assert calendario.tempo_proximo() == 1.0
+    assert len(calendario) == 4
+    assert [calendario.proximo() for _ in range(4)] == [
+        (1.0, 'CHEGADA', 'b'), (5.0, 'SAIDA', 'a'), (5.0, 'CHEGADA', 'c'), (5.0, 'SAIDA', 'd')]
+    assert not calendario
+
+
+def test_sala_espera_serve_por_prioridade_e_por_ordem_de_chegada():
+    sala = SalaEspera()
+    doentes = [Doente(i, p, float(i), 0.5) for i, p in enumerate([4, 2, 4, 1, 2, 5])]
+    for doente in doentes:
+        sala.entrar(doente)
+
+    assert len(sala) == 6
+    assert [sala.proximo().id for _ in range(6)] == [3, 1, 4, 0, 2, 5]
+    assert not sala
+
+
+def test_sala_espera_ignora_doentes_removidos():
+    sala = SalaEspera()
+    doentes = [Doente(i, 3, float(i), 0.5) for i in range(4)]
+    for doente in doentes:
+        sala.entrar(doente)
+    sala.remover(doentes[0])
+    sala.remover(doentes[2])
+    sala.remover(doentes[2])  # remover duas vezes não altera o tamanho
+
+    assert len(sala) == 2
+    assert [sala.proximo().id for _ in range(2)] == [1, 3]
+
+
+def processar_transicoes(gestor, calendario, ate):
+    """Aplica as transições de turno e de pausa agendadas até ao instante dado"""
+    while calendario and calendario.tempo_proximo() <= ate:
+        tempo, tipo, indice = calendario.proximo()
+        gestor.processar_evento(tipo, indice, tempo)
+
+
+def test_gestor_reserva_o_medico_livre_de_menor_indice():
+    gestor = GestorMedicos(3, CalendarioEventos(), 1000)
+    primeiro = gestor.procurar_livre()
+    gestor.iniciar_consulta(primeiro, 1, 0.0)
+    segundo = gestor.procurar_livre()
+    gestor.iniciar_consulta(segundo, 2, 1.0)
+
+    assert (primeiro.indice, segundo.indice) == (0, 1)
+    assert gestor.num_ocupados == 2
+
+    # O médico 0 volta ao índice de livres e é de novo o primeiro escolhido
+    medico = gestor.terminar_consulta(1, 10.0)
+    assert medico is primeiro and medico.tempo_ocupado == 10.0 and medico.doentes_atendidos == 1
+    assert gestor.procurar_livre().indice == 0
+
+
+def test_gestor_sem_medicos_livres_e_doente_desconhecido():
+    gestor = GestorMedicos(1, CalendarioEventos(), 1000)
+    gestor.iniciar_consulta(gestor.procurar_livre(), 1, 0.0)
+    assert gestor.procurar_livre() is None
+    assert gestor.terminar_consulta(7, 2.0) is None
+    assert gestor.num_ocupados == 1
+
+
+def test_pausa_retira_o_medico_livre_ate_ao_fim_da_pausa():
+    calendario = CalendarioEventos()
+    gestor = GestorMedicos(2, calendario, 1000, usar_pausas=True, duracao_pausa=30, intervalo_pausa=100)
+    processar_transicoes(gestor, calendario, 100)
+    assert all(medico.em_pausa for medico in gestor.medicos)
+    assert gestor.procurar_livre() is None
+
+    # Fim das pausas: voltam os dois, sem entradas duplicadas no índice
+    processar_transicoes(gestor, calendario, 130)
+    reservados = [gestor.procurar_livre() for _ in range(3)]
+    assert [m.indice for m in reservados[:2]] == [0, 1]
+    assert reservados[2] is None
+
+
+def test_pausa_durante_consulta_fica_pendente():
+    calendario = CalendarioEventos()
+    gestor = GestorMedicos(1, calendario, 1000, usar_pausas=True, duracao_pausa=30, intervalo_pausa=100)
+    medico = gestor.procurar_livre()
+    gestor.iniciar_consulta(medico, 1, 90.0)
+    processar_transicoes(gestor, calendario, 100)
+    assert medico.pausa_pendente and not medico.em_pausa
+
+    # Ao terminar a consulta entra em pausa em vez de voltar aos livres
+    gestor.terminar_consulta(1, 110.0)
+    assert medico.em_pausa and medico.fim_pausa == 140.0
+    assert gestor.procurar_livre() is None
+    processar_transicoes(gestor, calendario, 140)
+    assert gestor.procurar_livre() is medico
+
+
+def test_turnos_alternam_os_medicos_disponiveis():
+    calendario = CalendarioEventos()
+    gestor = GestorMedicos(4, calendario, 1000, usar_turnos=True, duracao_turno=240)
+    assert gestor.procurar_livre().indice == 0
+    processar_transicoes(gestor, calendario, 240)
+    assert [gestor.procurar_livre().indice for _ in range(2)] == [1, 3]
+    assert gestor.procurar_livre() is None
+
+
+def test_serie_temporal_guarda_so_mudancas_e_cresce():
+    serie = SerieTemporal(np.int32, capacidade=2)
+    pontos = [(0.0, 0), (1.0, 1), (1.5, 1), (2.0, 2), (3.0, 2), (4.0, 0), (5.0, 3)]
+    for tempo, valor in pontos:
+        serie.registar(tempo, valor)
+    assert list(serie) == [(0.0, 0), (1.0, 1), (2.0, 2), (4.0, 0), (5.0, 3)]
+    assert serie.valores.dtype == np.int32
+    assert len(serie) == 5
+
+    copia = SerieTemporal.de_arrays([t for t, _ in pontos], [v for _, v in pontos], np.int32)
+    assert np.array_equal(copia.tempos, serie.tempos)
+    assert np.array_equal(copia.valores, serie.valores)
+
+
+def test_registos_com_slots_nao_aceitam_atributos_novos():
+    doente = Doente(0, 4, 1.0, 0.3, pessoa={'id': 'p1'})
+    medico = Medico(2)
+    assert not hasattr(doente, '__dict__') and not hasattr(medico, '__dict__')
+    assert doente.pessoa == {'id': 'p1'} and medico.indice == 2 and not medico.ocupado
+    with pytest.raises(AttributeError):
+        doente.outro = 1
+
+
+def test_doente_com_slots_ocupa_menos_do_que_os_dicionarios_originais():
+    for pessoa in (None, PESSOA_EXEMPLO):
+        dicionarios = _bytes_por_doente(_doente_dicionario, 20000, pessoa)
+        slots = _bytes_por_doente(_doente_registo, 20000, pessoa)
+        assert slots < 200
+        assert dicionarios > 3 * slots
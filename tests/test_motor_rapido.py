@@ -0,0 +1,186 @@
+# -------
+# - Testes do motor rápido - VERSÃO AVANÇADA
+# - O motor FIFO (Kiefer-Wolfowitz) tem de dar os resultados do motor de eventos
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import numpy as np
+import pytest
+from typing import List
+from aleatorio_avancado import FonteAleatoriaLote, configs_com_sementes
+from motor_rapido_avancado import simular_fifo, simular_fifo_lote
+from replicacao_avancado import METRICAS_LOTE, _simular_configs_lote, empilhar_metricas, executar_replicacoes
+from replicacao_avancado import metricas_lote, simular_lote
+from sim_module_avancado import Simulacao
+
+
+# Tolerância relativa: os motores somam as mesmas parcelas por outra ordem
+TOLERANCIA = 1e-9
+
+# Configurações FIFO (sem triagem, turnos, pausas nem pessoas reais) com
+# cargas, prazos de abandono e perfis de chegada diferentes
+CENARIOS_FIFO = [
+    {'num_medicos': 3, 'taxa_chegada': 10 / 60.0, 'tempo_max_espera': 120},
+    {'num_medicos': 2, 'taxa_chegada': 14 / 60.0, 'tempo_max_espera': 30},
+    {'num_medicos': 1, 'taxa_chegada': 5 / 60.0, 'tempo_max_espera': 10, 'chegadas_nao_homogeneas': True},
+    {'num_medicos': 5, 'taxa_chegada': 40 / 60.0, 'tempo_max_espera': 5},
+    {'num_medicos': 4, 'taxa_chegada': 20 / 60.0, 'tempo_max_espera': 1000, 'chegadas_nao_homogeneas': True}
+]
+
+DISTRIBUICOES = ['exponential', 'normal', 'uniform']
+
+# Variantes da configuração que o motor rápido também tem de cobrir
+EXTRAS = [{}, {'periodo_aquecimento': 150.0}, {'medias_lotes': True},
+          {'periodo_aquecimento': 150.0, 'medias_lotes': True}]
+
+
+def diferencas(a, b, caminho: str = '') -> List[str]:
+    """
+    Caminhos em que dois resultados diferem
+
+    Percorre dicionários, listas e os atributos dos outros objetos; os
+    histogramas e as séries temporais comparam-se pelos arrays, e os
+    números reais a menos de TOLERANCIA.
+    """
+    if hasattr(a, 'contagens'):
+        iguais = np.array_equal(a.contagens, b.contagens) and a.n == b.n and _proximos(a.soma, b.soma)
+        return [] if iguais else [caminho]
+    if hasattr(a, 'tempos'):
+        iguais = np.array_equal(a.tempos, b.tempos) and np.array_equal(a.valores, b.valores)
+        return [] if iguais else [caminho]
+    if isinstance(a, dict):
+        if a.keys() != b.keys():
+            return [f"{caminho} (chaves: {sorted(set(a) ^ set(b))})"]
+        return [d for chave in a for d in diferencas(a[chave], b[chave], f"{caminho}.{chave}")]
+    if isinstance(a, (list, tuple)):
+        if len(a) != len(b):
+            return [f"{caminho} (tamanhos {len(a)} e {len(b)})"]
+        return [d for i, (x, y) in enumerate(zip(a, b)) for d in diferencas(x, y, f"{caminho}[{i}]")]
+    if isinstance(a, np.ndarray):
+        iguais = a.shape == b.shape and np.allclose(a, b, rtol=TOLERANCIA, atol=TOLERANCIA)
+        return [] if iguais else [caminho]
+    if hasattr(a, '__dict__'):
+        # Acumuladores: compara o estado interno
+        return diferencas(vars(a), vars(b), caminho)
+    return [] if _proximos(a, b) else [caminho]
+
+
+def _proximos(a, b) -> bool:
+    """Igualdade exata, ou a menos de TOLERANCIA para números reais"""
+    if isinstance(a, float) and isinstance(b, (int, float)):
+        return abs(a - b) <= TOLERANCIA * max(1.0, abs(a))
+    return a == b
+
+
+@pytest.mark.parametrize('extra', EXTRAS)
+@pytest.mark.parametrize('distribuicao', DISTRIBUICOES)
+@pytest.mark.parametrize('cenario', CENARIOS_FIFO)
+def test_motor_rapido_igual_ao_motor_de_eventos(cenario, distribuicao, extra):
+    for seed in (0, 1, 2):
+        config = dict(cenario, tempo_simulacao=600, distribuicao=distribuicao, seed=seed, **extra)
+        eventos = Simulacao(dict(config, motor_rapido=False)).simular()
+        rapido = Simulacao(config).simular()
+        assert diferencas(eventos, rapido) == []
+
+
+def test_motor_rapido_so_nas_configuracoes_fifo():
+    config = dict(CENARIOS_FIFO[0], tempo_simulacao=600, seed=0)
+    assert Simulacao(config).usa_motor_rapido()
+    assert not Simulacao(dict(config, usar_triagem=True)).usa_motor_rapido()
+    assert not Simulacao(dict(config, motor_rapido=False)).usa_motor_rapido()
+
+
+@pytest.mark.parametrize('extra', EXTRAS)
+@pytest.mark.parametrize('cenario', CENARIOS_FIFO)
+def test_motor_em_lote_igual_a_cada_replica(cenario, extra):
+    config = dict(cenario, tempo_simulacao=600, **extra)
+    configs = configs_com_sementes(config, 6, 9)
+    lote = _simular_configs_lote(config, configs)
+    individuais = [Simulacao(dict(c, motor_rapido=False)).simular() for c in configs]
+    for resultados_lote, resultados in zip(lote, individuais):
+        assert diferencas(resultados, resultados_lote) == []
+
+
+@pytest.mark.parametrize('extra', EXTRAS)
+@pytest.mark.parametrize('cenario', CENARIOS_FIFO)
+def test_metricas_em_lote_iguais_as_do_pool(cenario, extra):
+    config = dict(cenario, tempo_simulacao=600, **extra)
+    pool, lote = [executar_replicacoes(config, 8, seed=9, max_workers=2, metricas=METRICAS_LOTE,
+                                       em_lote=em_lote)
+                  for em_lote in (False, True)]
+    assert diferencas(pool, lote) == []
+
+
+class _LinhaDoBloco:
+    """Fonte que entrega a simular_fifo as amostras de uma linha de um bloco de réplicas"""
+
+    def __init__(self, bloco: FonteAleatoriaLote, chegadas: np.ndarray, variaveis: np.ndarray):
+        self.bloco = bloco
+        self.chegadas = chegadas
+        self.variaveis = variaveis
+
+    def tempos_chegada(self, horizonte: float) -> np.ndarray:
+        return self.chegadas
+
+    def variaveis_consulta(self, n: int) -> np.ndarray:
+        return self.variaveis[:n]
+
+    def tempos_consulta(self, tempo_base: float, variaveis: np.ndarray) -> np.ndarray:
+        return self.bloco.tempos_consulta(tempo_base, variaveis)
+
+    def media_variaveis_consulta(self) -> float:
+        return float(self.variaveis.mean()) if len(self.variaveis) else 0.0
+
+
+@pytest.mark.parametrize('extra', EXTRAS)
+@pytest.mark.parametrize('distribuicao', DISTRIBUICOES)
+def test_bloco_de_replicas_igual_a_simular_fifo_linha_a_linha(distribuicao, extra):
+    # Cenário com abandonos; as linhas têm números de chegadas diferentes
+    base = Simulacao(dict(CENARIOS_FIFO[1], tempo_simulacao=600, distribuicao=distribuicao, **extra))
+    parametros = (base.num_medicos, base.tempo_simulacao, base.tempo_medio_consulta, base.tempo_max_espera,
+                  True, base.periodo_aquecimento, base.medias_lotes)
+
+    def bloco():
+        return FonteAleatoriaLote(5, distribuicao, seed=2, taxa_chegada=base.taxa_chegada)
+
+    lote = simular_fifo_lote(bloco(), *parametros)
+    amostras = bloco()
+    chegadas, num = amostras.tempos_chegada(base.tempo_simulacao)
+    variaveis = amostras.variaveis_consulta(chegadas.shape[1])
+    assert len(set(num.tolist())) > 1
+    for r, (parciais, medicos) in enumerate(lote):
+        linha = _LinhaDoBloco(amostras, chegadas[r, :num[r]], variaveis[r, :num[r]])
+        parciais_linha, medicos_linha = simular_fifo(linha, *parametros)
+        assert diferencas(parciais_linha, parciais) == []
+        assert ([(m.tempo_ocupado, m.doentes_atendidos) for m in medicos_linha]
+                == [(m.tempo_ocupado, m.doentes_atendidos) for m in medicos])
+
+
+@pytest.mark.parametrize('extra', EXTRAS)
+@pytest.mark.parametrize('cenario', CENARIOS_FIFO)
+def test_metricas_lote_iguais_as_de_simular_lote(cenario, extra):
+    config = dict(cenario, tempo_simulacao=600, **extra)
+    metricas = metricas_lote(config, 8, seed=3)
+    completas = empilhar_metricas(simular_lote(config, 8, seed=3), METRICAS_LOTE)
+    assert diferencas({nome: metricas[nome] for nome in METRICAS_LOTE}, completas) == []
+    # O mesmo bloco com outra semente dá outras réplicas
+    assert not np.array_equal(metricas_lote(config, 8, seed=4)['num_chegadas'], metricas['num_chegadas'])
+
+
+def test_motor_em_lote_recusa_configuracoes_com_triagem():
+    with pytest.raises(ValueError):
+        metricas_lote(dict(CENARIOS_FIFO[0], usar_triagem=True), 2, seed=0)
+
+
+def test_motor_rapido_preenche_todas_as_prioridades():
+    config = dict(CENARIOS_FIFO[1], tempo_simulacao=600, seed=3)
+    resultados = Simulacao(config).simular()
+    por_prioridade = resultados['distribuicoes']['espera_por_prioridade']
+    assert por_prioridade[4].n == resultados['doentes_atendidos']
+    assert resultados['quantis']['espera_por_prioridade'][4] == resultados['quantis']['espera']
+    for prioridade in (1, 2, 3, 5):
+        assert por_prioridade[prioridade].n == 0
+        assert resultados['espera_por_prioridade'][prioridade] == []
+        assert resultados['abandonos_por_prioridade'][prioridade] == 0
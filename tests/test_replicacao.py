@@ -0,0 +1,182 @@
+# -------
+# - Testes das réplicas - VERSÃO AVANÇADA
+# - Intervalos de confiança e execução em paralelo
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import numpy as np
+import pytest
+from estatisticas_avancado import intervalo_confianca, quantil_t
+from aleatorio_avancado import configs_com_sementes
+from replicacao_avancado import comparar_cenarios, executar_replicacoes, varrimento_parametros
+from replicacao_avancado import replicacoes_sequenciais, estimar_aquecimento
+from sim_module_avancado import Simulacao
+
+
+CONFIG_BASE = {
+    'num_medicos': 3,
+    'taxa_chegada': 10 / 60.0,
+    'tempo_medio_consulta': 15,
+    'tempo_simulacao': 480,
+    'usar_triagem': True
+}
+
+METRICAS = ['tempo_medio_espera', 'taxa_abandono', 'tempo_medio_por_prioridade.4']
+
+
+@pytest.mark.parametrize('nivel, graus, esperado', [
+    (0.95, 1, 12.7062), (0.95, 4, 2.7764), (0.95, 30, 2.0423), (0.99, 10, 3.1693)
+])
+def test_quantil_t_coincide_com_tabela(nivel, graus, esperado):
+    assert quantil_t(nivel, graus) == pytest.approx(esperado, abs=1e-3)
+
+
+def test_intervalo_confianca_contem_a_media():
+    amostras = np.random.default_rng(2).normal(5.0, 1.0, 40)
+    ic = intervalo_confianca(amostras)
+    assert ic['n'] == 40
+    assert ic['ic'][0] < ic['media'] < ic['ic'][1]
+    assert ic['semi_amplitude'] == pytest.approx(quantil_t(0.95, 39) * np.std(amostras, ddof=1) / np.sqrt(40))
+
+
+def test_replicas_reprodutiveis_e_independentes_do_numero_de_processos():
+    sequencial = executar_replicacoes(CONFIG_BASE, 6, seed=3, max_workers=1, metricas=METRICAS)
+    paralelo = executar_replicacoes(CONFIG_BASE, 6, seed=3, max_workers=2, metricas=METRICAS)
+    for nome in METRICAS:
+        assert len(sequencial['amostras'][nome]) == 6
+        assert np.array_equal(sequencial['amostras'][nome], paralelo['amostras'][nome])
+    # Réplicas diferentes não repetem a mesma amostra
+    assert len(set(sequencial['amostras']['tempo_medio_espera'])) == 6
+    resumo = sequencial['resumo']['tempo_medio_espera']
+    assert resumo['ic'][0] <= resumo['media'] <= resumo['ic'][1]
+
+
+def test_varrimento_devolve_arrays_densos_pelos_eixos():
+    grelha = {'num_medicos': [2, 3, 4], 'taxa_chegada': [6 / 60.0, 12 / 60.0]}
+    varrimento = varrimento_parametros(CONFIG_BASE, grelha, replicacoes=3, seed=5,
+                                       max_workers=1, metricas=METRICAS[:2])
+    assert varrimento['eixos'] == ['num_medicos', 'taxa_chegada']
+    assert varrimento['amostras']['tempo_medio_espera'].shape == (3, 2, 3)
+    assert varrimento['media']['tempo_medio_espera'].shape == (3, 2)
+    assert np.allclose(varrimento['media']['taxa_abandono'],
+                       varrimento['amostras']['taxa_abandono'].mean(axis=-1))
+    assert np.all(np.isfinite(varrimento['semi_amplitude']['tempo_medio_espera']))
+
+    # Cada célula é a simulação do seu ponto, com a sua semente filha
+    config = configs_com_sementes(CONFIG_BASE, 18, 5)[3 * 3 + 1]
+    config.update({'num_medicos': 3, 'taxa_chegada': 12 / 60.0})
+    direto = Simulacao(config).simular()
+    assert varrimento['amostras']['tempo_medio_espera'][1, 1, 1] == direto['tempo_medio_espera']
+
+
+def test_varrimento_com_pontos_explicitos():
+    pontos = [{'num_medicos': 2}, {'num_medicos': 5}]
+    varrimento = varrimento_parametros(CONFIG_BASE, pontos, seed=5, max_workers=1,
+                                       metricas=['ocupacao_media_medicos'])
+    assert varrimento['eixos'] == ['ponto']
+    assert varrimento['media']['ocupacao_media_medicos'].shape == (2,)
+    assert np.all(np.isinf(varrimento['semi_amplitude']['ocupacao_media_medicos']))
+
+
+def test_variante_igual_a_base_da_diferenca_nula():
+    comparacao = comparar_cenarios(CONFIG_BASE, {'igual': {}}, 5, seed=4, max_workers=1, metricas=METRICAS)
+    variante = comparacao['variantes']['igual']
+    for nome in METRICAS:
+        assert np.all(variante['diferencas'][nome] == 0)
+        assert np.array_equal(variante['amostras'][nome], comparacao['base']['amostras'][nome])
+
+
+def test_numeros_aleatorios_comuns_estreitam_o_intervalo():
+    comparacao = comparar_cenarios(CONFIG_BASE, {'+1 medico': {'num_medicos': 4}}, 10, seed=4,
+                                   max_workers=2, metricas=['tempo_medio_espera', 'ocupacao_media_medicos'])
+    variante = comparacao['variantes']['+1 medico']
+    for nome in ('tempo_medio_espera', 'ocupacao_media_medicos'):
+        assert variante['reducao_variancia'][nome] > 1
+        assert variante['resumo_diferencas'][nome]['semi_amplitude'] < variante['semi_amplitude_independente'][nome]
+    # Mais médicos: menos espera e menor ocupação, em todas as réplicas
+    assert np.all(variante['diferencas']['tempo_medio_espera'] <= 0)
+    assert np.all(variante['diferencas']['ocupacao_media_medicos'] < 0)
+
+
+CONFIG_FIFO = dict(CONFIG_BASE, usar_triagem=False)
+METRICAS_FIFO = ['tempo_medio_espera', 'ocupacao_media_medicos']
+
+
+@pytest.mark.parametrize('estimador', ['antitetico', 'controlo', 'antitetico_controlo'])
+def test_estimadores_iguais_no_motor_em_lote_e_no_pool(estimador):
+    pool = executar_replicacoes(CONFIG_FIFO, 8, seed=9, max_workers=1, metricas=METRICAS_FIFO,
+                                estimador=estimador)
+    lote = executar_replicacoes(CONFIG_FIFO, 8, seed=9, metricas=METRICAS_FIFO, em_lote=True,
+                                estimador=estimador)
+    for nome in METRICAS_FIFO:
+        assert np.allclose(pool['amostras'][nome], lote['amostras'][nome])
+        assert pool['resumo'][nome]['media'] == pytest.approx(lote['resumo'][nome]['media'])
+    assert set(pool['reducao_variancia']) == set(METRICAS_FIFO)
+
+
+def test_pares_antiteticos_e_controlos_reduzem_a_variancia():
+    replicacoes = executar_replicacoes(CONFIG_FIFO, 40, seed=1, metricas=METRICAS_FIFO, em_lote=True,
+                                       estimador='antitetico_controlo')
+    # Com pares antitéticos n conta os pares
+    assert replicacoes['resumo']['tempo_medio_espera']['n'] == 20
+    for nome in METRICAS_FIFO:
+        assert replicacoes['reducao_variancia'][nome] > 1
+    # O número de chegadas conta doentes inteiros e tem média perto da esperada
+    chegadas = replicacoes['controlos']['num_chegadas']
+    assert np.all(chegadas == np.round(chegadas))
+    esperadas = Simulacao(CONFIG_FIFO).controlos_esperados()['num_chegadas']
+    assert abs(chegadas.mean() - esperadas) < 4 * np.sqrt(esperadas / 40)
+
+
+def test_estimador_invalido_ou_replicas_impares():
+    with pytest.raises(ValueError):
+        executar_replicacoes(CONFIG_FIFO, 4, seed=1, max_workers=1, estimador='outro')
+    with pytest.raises(ValueError):
+        executar_replicacoes(CONFIG_FIFO, 5, seed=1, max_workers=1, estimador='antitetico')
+
+
+@pytest.mark.parametrize('estimador', ['simples', 'antitetico'])
+def test_sequenciais_param_com_a_precisao_e_continuam_as_mesmas_sementes(estimador):
+    sequenciais = replicacoes_sequenciais(CONFIG_FIFO, METRICAS_FIFO, precisao_relativa=0.1, seed=7,
+                                          replicacoes_iniciais=4, em_lote=True, estimador=estimador)
+    assert sequenciais['convergiu'] and sequenciais['motivo'] == 'precisao'
+    n = sequenciais['num_replicacoes']
+    assert len(sequenciais['lotes']) > 1 and sequenciais['lotes'][-1]['num_replicacoes'] == n
+    for nome in METRICAS_FIFO:
+        resumo = sequenciais['resumo'][nome]
+        assert resumo['semi_amplitude'] <= 0.1 * abs(resumo['media'])
+    # Os lotes sucessivos são as réplicas 0..n-1 de um só conjunto
+    diretas = executar_replicacoes(CONFIG_FIFO, n, seed=7, metricas=METRICAS_FIFO, em_lote=True,
+                                   estimador=estimador)
+    assert len(set(sequenciais['amostras']['tempo_medio_espera'])) == n
+    for nome in METRICAS_FIFO:
+        assert np.allclose(sequenciais['amostras'][nome], diretas['amostras'][nome])
+
+
+def test_sequenciais_param_no_orcamento_de_replicas():
+    sequenciais = replicacoes_sequenciais(CONFIG_FIFO, ['tempo_medio_espera'], precisao_relativa=1e-4,
+                                          seed=2, replicacoes_iniciais=3, max_replicacoes=12,
+                                          max_workers=1)
+    assert not sequenciais['convergiu'] and sequenciais['motivo'] == 'max_replicacoes'
+    assert sequenciais['num_replicacoes'] == 12
+    assert not sequenciais['atingidas']['tempo_medio_espera']
+
+
+def test_sequenciais_exigem_precisao_e_orcamento():
+    with pytest.raises(ValueError):
+        replicacoes_sequenciais(CONFIG_FIFO, ['tempo_medio_espera'], precisao_relativa=None)
+    with pytest.raises(ValueError):
+        replicacoes_sequenciais(CONFIG_FIFO, ['tempo_medio_espera'], max_replicacoes=3, estimador='antitetico')
+
+
+def test_estimar_aquecimento_com_replicas_piloto():
+    config = dict(CONFIG_FIFO, tempo_simulacao=3000, tempo_max_espera=1000, periodo_aquecimento=500.0)
+    estimativa = estimar_aquecimento(config, 4, seed=1, max_workers=2, num_intervalos=300)
+    assert estimativa == estimar_aquecimento(config, 4, seed=1, max_workers=1, num_intervalos=300)
+    assert estimativa['periodo_aquecimento'] == max(estimativa['fila'], estimativa['ocupacao'])
+    assert estimativa['fracao'] == pytest.approx(estimativa['periodo_aquecimento'] / 3000)
+    # Múltiplo da largura dos intervalos (3000 / 300 = 10 min) e na primeira metade
+    assert estimativa['periodo_aquecimento'] % 10 == 0
+    assert estimativa['periodo_aquecimento'] <= 1500
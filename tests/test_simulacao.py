@@ -0,0 +1,205 @@
+# -------
+# - Testes do motor de eventos - VERSÃO AVANÇADA
+# - Invariantes dos resultados de Simulacao.simular()
+# - Projeto de Algoritmos e Técnicas de Programação
+# - Universidade do Minho - Engenharia Biomédica
+# - 2025-11-19 by Letícia, Maria, Matilde
+# -------
+
+import json
+import tracemalloc
+import numpy as np
+import pytest
+import sim_module_avancado
+from estruturas_avancado import CalendarioEventos
+from sim_module_avancado import Simulacao
+
+
+# Clínica sobrecarregada, com abandonos frequentes
+CONFIG_SOBRECARGA = {
+    'num_medicos': 2,
+    'taxa_chegada': 20 / 60.0,
+    'tempo_medio_consulta': 15,
+    'tempo_simulacao': 600,
+    'tempo_max_espera': 20,
+    'usar_triagem': True
+}
+
+
+def simular(config, seed=1):
+    return Simulacao(dict(config, seed=seed)).simular()
+
+
+def diferencas_numericas(a, b):
+    """Chaves numéricas de resultados (escalares e por prioridade) que diferem"""
+    diferentes = []
+    for chave, valor in a.items():
+        if isinstance(valor, (int, float)) and valor != pytest.approx(b[chave]):
+            diferentes.append(chave)
+        elif isinstance(valor, dict) and chave.endswith('por_prioridade') and chave != 'espera_por_prioridade':
+            if valor != pytest.approx(b[chave]):
+                diferentes.append(chave)
+    return diferentes
+
+
+def test_ninguem_atendido_espera_mais_do_que_o_prazo_de_abandono():
+    resultados = simular(CONFIG_SOBRECARGA)
+    assert resultados['doentes_abandonaram'] > 0
+    assert max(resultados['tempos_espera_individuais']) <= CONFIG_SOBRECARGA['tempo_max_espera']
+
+
+def test_abandonos_por_prioridade_somam_o_total():
+    resultados = simular(CONFIG_SOBRECARGA, seed=2)
+    assert sum(resultados['abandonos_por_prioridade'].values()) == resultados['doentes_abandonaram']
+    assert sum(resultados['atendidos_por_prioridade'].values()) == resultados['doentes_atendidos']
+    assert 0 < resultados['taxa_abandono'] < 100
+
+
+def test_sem_abandonos_com_prazo_muito_longo():
+    resultados = simular(dict(CONFIG_SOBRECARGA, tempo_max_espera=10 ** 6), seed=3)
+    assert resultados['doentes_abandonaram'] == 0
+    assert resultados['taxa_abandono'] == 0.0
+
+
+class CalendarioMedido(CalendarioEventos):
+    """Calendário que regista o maior número de eventos pendentes"""
+    maximo = 0
+
+    def agendar(self, tempo, tipo, dados=None):
+        super().agendar(tempo, tipo, dados)
+        CalendarioMedido.maximo = max(CalendarioMedido.maximo, len(self))
+
+
+def test_calendario_so_tem_a_proxima_chegada(monkeypatch):
+    monkeypatch.setattr(sim_module_avancado, 'CalendarioEventos', CalendarioMedido)
+    config = dict(CONFIG_SOBRECARGA, num_medicos=3, tempo_simulacao=5000)
+    CalendarioMedido.maximo = 0
+    resultados = simular(config)
+
+    # Uma chegada pendente e no máximo uma saída por médico
+    assert resultados['doentes_atendidos'] > 100
+    assert CalendarioMedido.maximo <= config['num_medicos'] + 1
+
+
+def test_progresso_pelo_tempo_simulado():
+    progresso = []
+    Simulacao(dict(CONFIG_SOBRECARGA, seed=4)).simular(callback_progresso=progresso.append)
+    assert progresso and progresso == sorted(progresso)
+    assert 0 <= progresso[0] and progresso[-1] <= 100
+
+
+def test_mesma_semente_reproduz_a_simulacao():
+    config = dict(CONFIG_SOBRECARGA, usar_pausas=True, usar_turnos=True)
+    primeira, segunda, outra = simular(config, 7), simular(config, 7), simular(config, 8)
+    assert primeira['tempos_espera_individuais'] == segunda['tempos_espera_individuais']
+    assert primeira['doentes_abandonaram'] == segunda['doentes_abandonaram']
+    assert primeira['tempos_espera_individuais'] != outra['tempos_espera_individuais']
+
+
+def test_historicos_sao_series_em_escada_coerentes():
+    resultados = simular(CONFIG_SOBRECARGA, seed=4)
+    fila = resultados['historico_fila']
+    ocupacao = resultados['historico_ocupacao']
+    assert list(fila)[0] == (0.0, 0)
+    assert np.all(np.diff(fila.tempos) >= 0)
+    # Só se guardam mudanças de valor
+    assert np.all(fila.valores[1:] != fila.valores[:-1])
+    assert fila.valores.max() == resultados['max_fila']
+    assert np.all((ocupacao.valores >= 0) & (ocupacao.valores <= 100))
+
+
+def test_sem_historico_as_metricas_sao_as_mesmas():
+    com = simular(CONFIG_SOBRECARGA, seed=5)
+    sem = simular(dict(CONFIG_SOBRECARGA, guardar_historico=False), seed=5)
+    for chave, valor in com.items():
+        if isinstance(valor, (int, float)):
+            assert sem[chave] == pytest.approx(valor), chave
+    assert sem['tempo_medio_por_prioridade'] == pytest.approx(com['tempo_medio_por_prioridade'])
+
+
+def test_fila_media_ponderada_pelo_tempo_coincide_com_a_serie():
+    resultados = simular(CONFIG_SOBRECARGA, seed=6)
+    fila = resultados['historico_fila']
+    # O último evento é uma saída, que muda sempre a ocupação
+    duracao = max(resultados['historico_ocupacao'].tempos[-1], CONFIG_SOBRECARGA['tempo_simulacao'])
+    fins = np.append(fila.tempos[1:], duracao)
+    esperado = np.sum(fila.valores * (fins - fila.tempos)) / duracao
+    assert resultados['tamanho_medio_fila'] == pytest.approx(esperado)
+
+
+def test_aquecimento_descarta_o_inicio_da_serie_da_fila():
+    aquecimento = 200.0
+    resultados = simular(dict(CONFIG_SOBRECARGA, periodo_aquecimento=aquecimento), seed=6)
+    fila = resultados['historico_fila']
+    duracao = max(resultados['historico_ocupacao'].tempos[-1], CONFIG_SOBRECARGA['tempo_simulacao'])
+    # Integral da série só a partir do fim do aquecimento
+    inicios = np.maximum(fila.tempos, aquecimento)
+    fins = np.maximum(np.append(fila.tempos[1:], duracao), aquecimento)
+    esperado = np.sum(fila.valores * (fins - inicios)) / (duracao - aquecimento)
+    assert resultados['tamanho_medio_fila'] == pytest.approx(esperado)
+    # Só contam os doentes chegados depois do aquecimento
+    completos = simular(CONFIG_SOBRECARGA, seed=6)
+    assert resultados['doentes_atendidos'] < completos['doentes_atendidos']
+    assert resultados['aquecimento']['fracao_descartada'] == pytest.approx(aquecimento / 600)
+
+
+@pytest.mark.parametrize('aquecimento', [-1.0, 600.0])
+def test_aquecimento_fora_do_horizonte(aquecimento):
+    with pytest.raises(ValueError):
+        Simulacao(dict(CONFIG_SOBRECARGA, periodo_aquecimento=aquecimento))
+
+
+def test_relatorio_de_aquecimento():
+    relatorio = simular(dict(CONFIG_SOBRECARGA, tempo_simulacao=3000, periodo_aquecimento=100.0))['aquecimento']
+    assert relatorio['detetado'] == max(relatorio['detetado_fila'], relatorio['detetado_ocupacao'])
+    assert relatorio['suficiente'] == (100.0 >= relatorio['detetado'])
+    # Sem histórico não há séries para detetar o aquecimento
+    sem = simular(dict(CONFIG_SOBRECARGA, guardar_historico=False))['aquecimento']
+    assert sem['detetado'] is None and sem['suficiente'] is None
+
+
+def test_medias_lotes_de_uma_simulacao_longa():
+    config = dict(CONFIG_SOBRECARGA, tempo_simulacao=20000, tempo_max_espera=1000,
+                  num_medicos=3, taxa_chegada=10 / 60.0, medias_lotes=True)
+    resultados = simular(config, seed=2)
+    medias_lotes = resultados['medias_lotes']
+    for chave, metrica in (('espera', 'tempo_medio_espera'), ('clinica', 'tempo_medio_clinica'),
+                           ('fila', 'tamanho_medio_fila')):
+        lote = medias_lotes[chave]
+        assert lote['n'] >= 10
+        # Os lotes cobrem quase toda a simulação: a média é a da simulação
+        assert lote['ic'][0] < resultados[metrica] < lote['ic'][1]
+        assert lote['media'] == pytest.approx(resultados[metrica], rel=0.05)
+    assert 'medias_lotes' not in simular(CONFIG_SOBRECARGA, seed=2)
+
+
+def test_dataset_menor_do_que_as_chegadas(tmp_path, monkeypatch):
+    pessoas = [{'id': f'p{i}', 'nome': f'Pessoa {i}'} for i in range(3)]
+    (tmp_path / 'pessoas.json').write_text(json.dumps(pessoas), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    resultados = simular(dict(CONFIG_SOBRECARGA, usar_pessoas_reais=True), seed=2)
+    genericos = simular(CONFIG_SOBRECARGA, seed=2)
+    # Os dados da pessoa não mudam o andamento da simulação
+    assert resultados['doentes_atendidos'] == genericos['doentes_atendidos'] > len(pessoas)
+    assert resultados['tempo_medio_espera'] == genericos['tempo_medio_espera']
+
+
+def test_memoria_limitada_da_os_mesmos_resultados_sem_historico():
+    config = dict(CONFIG_SOBRECARGA, tempo_simulacao=2000, usar_pausas=True)
+    sem_historico = simular(dict(config, guardar_historico=False), seed=8)
+    limitada = simular(dict(config, memoria_limitada=True), seed=8)
+    assert diferencas_numericas(sem_historico, limitada) == []
+    assert len(limitada['historico_fila']) == 0 and limitada['tempos_espera_individuais'] == []
+
+
+def test_memoria_limitada_nao_cresce_com_o_horizonte():
+    config = dict(CONFIG_SOBRECARGA, num_medicos=4, taxa_chegada=15 / 60.0, memoria_limitada=True)
+    picos = []
+    for horizonte in (1000, 8000):
+        simulacao = Simulacao(dict(config, tempo_simulacao=horizonte, seed=1))
+        tracemalloc.start()
+        simulacao.simular()
+        picos.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert picos[1] < 1.5 * picos[0]